@@ -1,6 +1,11 @@
 import argparse
-from src.gui import App
-from src.cli import run_cli
+import multiprocessing
+# Only light modules here: the GUI (tkinter, PIL) is imported in GUI mode, the CLI
+# and parsers in CLI mode, and openpyxl and the PDF libraries on first use
+import src.cache
+from src.extractors import DEFAULT_EXTRACTOR, EXTRACTORS
+from src.excel import DUPLICATE_POLICIES
+from src.sinks import SINK_FORMATS
 
 def main():
     parser = argparse.ArgumentParser(
@@ -34,6 +39,27 @@ def main():
         type=str,
         help="Path to the excel file to be created."
     )
+    parser.add_argument(
+        "--format", "-o",
+        dest="output_format",
+        choices=list(SINK_FORMATS),
+        help="Output format in CLI mode (default: from the extension of --excel-path, else xlsx). "
+             "parquet needs pyarrow."
+    )
+    parser.add_argument(
+        "--include",
+        dest="include",
+        nargs="+",
+        metavar="GLOB",
+        help="Only process PDFs whose name or path below --path matches one of these globs, e.g. '*_de.pdf'."
+    )
+    parser.add_argument(
+        "--exclude",
+        dest="exclude",
+        nargs="+",
+        metavar="GLOB",
+        help="Skip PDFs and folders whose name or path below --path matches one of these globs, e.g. 'Archiv'."
+    )
     parser.add_argument(
         "--insert-row", "-r",
         dest="insert_row",
@@ -64,33 +90,235 @@ def main():
         action="store_true",
         help="Use Lechler method for extracting sds fields."
     )
+    parser.add_argument(
+        "--auto", "-a",
+        dest="use_auto",
+        action="store_true",
+        help="Detect the vendor format of every PDF from its first page and use the matching method."
+    )
+    parser.add_argument(
+        "--incremental", "-i",
+        dest="incremental",
+        action="store_true",
+        help="Only parse new or changed PDFs since the last incremental run and update their rows in place."
+    )
+    parser.add_argument(
+        "--watch",
+        dest="watch",
+        action="store_true",
+        help="Keep running in CLI mode and add new or changed PDFs to the Excel file a few seconds after "
+             "they arrive (implies --incremental)."
+    )
+    parser.add_argument(
+        "--watch-interval",
+        dest="watch_interval",
+        type=float,
+        help="Seconds between two checks of the folder in --watch mode (default: 5)."
+    )
+    parser.add_argument(
+        "--watch-settle",
+        dest="watch_settle",
+        type=float,
+        help="Seconds a changed folder has to stay unchanged before it is processed in --watch mode "
+             "(default: --watch-interval)."
+    )
+    parser.add_argument(
+        "--serve",
+        dest="serve",
+        action="store_true",
+        help="Run a local HTTP service that parses PDFs sent to it in warm worker processes "
+             "(POST /parse, POST /batch, GET /stats)."
+    )
+    parser.add_argument(
+        "--host",
+        dest="host",
+        type=str,
+        help="Address the --serve service listens on (default: 127.0.0.1, local connections only)."
+    )
+    parser.add_argument(
+        "--port",
+        dest="port",
+        type=int,
+        help="Port of the --serve service (default: 8765)."
+    )
+    parser.add_argument(
+        "--manifest",
+        dest="manifest_path",
+        type=str,
+        help="Manifest file of incremental runs (default: <excel-path>.manifest.json)."
+    )
+    parser.add_argument(
+        "--mark-missing",
+        dest="mark_missing",
+        action="store_true",
+        help="In incremental runs, mark rows whose PDFs were removed in the 'Besonderheiten' column."
+    )
+    parser.add_argument(
+        "--no-dedup",
+        dest="dedup",
+        action="store_false",
+        help="Fully parse every PDF of a folder, not only those its rows are taken from "
+             "(reports missing fields of all PDFs)."
+    )
+    parser.add_argument(
+        "--duplicates",
+        dest="duplicates",
+        choices=DUPLICATE_POLICIES,
+        help="What to do with products (Handelsname, Hersteller, H-Sätze) already in the Excel file (default: skip)."
+    )
+    parser.add_argument(
+        "--profile",
+        dest="profile",
+        action="store_true",
+        help="Time the stages of the CLI run, print a summary with the slowest files and write it as JSON."
+    )
+    parser.add_argument(
+        "--profile-json",
+        dest="profile_path",
+        type=str,
+        help="JSON file of --profile (default: <excel-path>.profile.json)."
+    )
+    parser.add_argument(
+        "--workers", "-w",
+        dest="workers",
+        type=int,
+        help="Number of parallel processes for parsing PDFs (default: CPU count)."
+    )
+    parser.add_argument(
+        "--max-memory-mb",
+        dest="max_memory_mb",
+        type=int,
+        help="Memory budget of each parser process in MB in CLI mode; PDFs that do not fit are quarantined "
+             "(default: no limit)."
+    )
+    parser.add_argument(
+        "--timeout",
+        dest="timeout",
+        type=float,
+        help="Seconds one PDF may take in CLI mode; its worker is then killed and the PDF quarantined "
+             "(default: no limit)."
+    )
+    parser.add_argument(
+        "--quarantine",
+        dest="quarantine_path",
+        type=str,
+        help="List of PDFs that exceeded --timeout or --max-memory-mb or failed to parse, skipped until they change "
+             "(default: <excel-path>.quarantine.json)."
+    )
+    parser.add_argument(
+        "--flush-every",
+        dest="flush_every",
+        type=int,
+        help="Save the Excel file after every N written rows in CLI mode (default: only at the end)."
+    )
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        type=str,
+        help="Folder of the extraction cache (default: per-user cache folder)."
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help="Do not read or write the extraction cache."
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        dest="cache_max_mb",
+        type=int,
+        help=f"Size limit of the extraction cache in MB (default: {src.cache.DEFAULT_MAX_MB})."
+    )
+    parser.add_argument(
+        "--extractor", "-x",
+        dest="extractor",
+        choices=list(EXTRACTORS),
+        help=f"Text extraction backend (default: {DEFAULT_EXTRACTOR})."
+    )
 
     parser.set_defaults(cli=False, gui=False,
                         use_fallback=False, use_3mf=False,
-                        use_basf=False, use_lechler=False,
-                        insert_row=None)
+                        use_basf=False, use_lechler=False, use_auto=False,
+                        insert_row=None, workers=None, flush_every=None,
+                        cache_dir=None, use_cache=True, cache_max_mb=src.cache.DEFAULT_MAX_MB,
+                        extractor=DEFAULT_EXTRACTOR, incremental=False, manifest_path=None,
+                        mark_missing=False, duplicates="skip", output_format=None,
+                        profile=False, profile_path=None, include=None, exclude=None,
+                        max_memory_mb=None, timeout=None, quarantine_path=None, dedup=True,
+                        watch=False, watch_interval=None, watch_settle=None,
+                        serve=False, host=None, port=None)
 
     args = parser.parse_args()
 
-    if args.cli:
+    if args.serve:
+        from src.cli import select_parse_mode
+        from src.service import DEFAULT_HOST, DEFAULT_PORT, serve
+
+        serve(
+            host=args.host or DEFAULT_HOST,
+            port=args.port or DEFAULT_PORT,
+            mode=select_parse_mode(args.use_fallback, args.use_3mf, args.use_basf, args.use_lechler, args.use_auto),
+            extractor=args.extractor,
+            workers=args.workers,
+            cache_args=(args.cache_dir, args.use_cache, args.cache_max_mb),
+            timeout=args.timeout,
+            max_memory_mb=args.max_memory_mb,
+        )
+        return
+
+    if args.cli or args.watch:
         if not args.path or not args.excel_path:
             print("No path and/or excel file specified. Exiting.")
             return
 
-        run_cli(
-            args.path,
-            args.excel_path,
-            args.use_fallback,
-            args.use_3mf,
-            args.use_basf,
-            args.use_lechler,
+        kwargs = dict(
             insert_row=args.insert_row,
+            workers=args.workers,
+            flush_every=args.flush_every,
+            cache_dir=args.cache_dir,
+            use_cache=args.use_cache,
+            cache_max_mb=args.cache_max_mb,
+            extractor=args.extractor,
+            use_auto=args.use_auto,
+            incremental=args.incremental,
+            manifest_path=args.manifest_path,
+            mark_missing=args.mark_missing,
+            duplicates=args.duplicates,
+            output_format=args.output_format,
+            profile=args.profile,
+            profile_path=args.profile_path,
+            include=args.include,
+            exclude=args.exclude,
+            max_memory_mb=args.max_memory_mb,
+            timeout=args.timeout,
+            quarantine_path=args.quarantine_path,
+            dedup=args.dedup,
         )
+        flags = (args.use_fallback, args.use_3mf, args.use_basf, args.use_lechler)
+
+        if args.watch:
+            from src.watch import DEFAULT_INTERVAL, watch
+
+            del kwargs["incremental"]
+            watch(args.path, args.excel_path, *flags,
+                  interval=args.watch_interval or DEFAULT_INTERVAL, settle=args.watch_settle, **kwargs)
+        else:
+            from src.cli import run_cli
+
+            run_cli(args.path, args.excel_path, *flags, **kwargs)
     else:
+        from src.gui import App
+
+        src.cache.configure(args.cache_dir, args.use_cache, args.cache_max_mb)
+
         app = App(
             path=args.path,
             excel_path=args.excel_path,
             insert_row=args.insert_row,
+            extractor=args.extractor,
+            duplicates=args.duplicates,
+            workers=args.workers,
+            cache_args=(args.cache_dir, args.use_cache, args.cache_max_mb),
         )
 
         if args.use_fallback:
@@ -101,9 +329,13 @@ def main():
             app.parse_mode_var.set("BASF")
         elif args.use_lechler:
             app.parse_mode_var.set("Lechler")
+        elif args.use_auto:
+            app.parse_mode_var.set("Auto")
 
         app.mainloop()
 
 
 if __name__ == "__main__":
+    # Required for the process pool in the frozen PyInstaller build
+    multiprocessing.freeze_support()
     main()
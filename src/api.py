@@ -0,0 +1,157 @@
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass
+
+import src.cache
+import src.pdf
+from src.discovery import iter_pdf_folders
+from src.extractors import DEFAULT_EXTRACTOR
+from src.workers import create_executor, parse_one
+
+
+@dataclass(frozen=True, slots=True)
+class SDSRecord:
+    """
+    Fields of one parsed SDS PDF.
+
+    Immutable and without a per-instance __dict__; with its tuples a record takes about
+    half the memory of the equivalent dict with lists.
+
+    :param source: path of the PDF
+    :param parse_mode: parser that read it (the detected one in AUTO_MODE)
+    :param seconds: time spent extracting and parsing it, in the process that parsed it
+    :param detect_seconds: time of the vendor detection in AUTO_MODE, else None
+    """
+
+    handelsname: str | None
+    manufacturer: str | None
+    h_statements: tuple
+    un_number: str | None
+    pictograms: tuple
+    sds_date: str | None
+    source: str
+    parse_mode: str
+    seconds: float
+    detect_seconds: float | None = None
+
+    @classmethod
+    def from_result(cls, source: str, mode: str, sds: dict) -> "SDSRecord":
+        """Record of a result of src.workers.parse_one()."""
+        return cls(
+            handelsname=sds.get("handelsname"),
+            manufacturer=sds.get("manufacturer"),
+            h_statements=tuple(sds.get("h_statements") or ()),
+            un_number=sds.get("un_number"),
+            pictograms=tuple(sds.get("pictograms") or ()),
+            sds_date=sds.get("sds_date"),
+            source=source,
+            parse_mode=sds.get("parse_mode", mode),
+            seconds=sds["seconds"],
+            detect_seconds=sds.get("detect_seconds"),
+        )
+
+    def as_dict(self) -> dict:
+        """The six fields as parse_pdf() returns them, e.g. for src.excel.convert_data_to_list()."""
+        return {
+            "handelsname": self.handelsname,
+            "manufacturer": self.manufacturer,
+            "h_statements": list(self.h_statements),
+            "un_number": self.un_number,
+            "pictograms": list(self.pictograms),
+            "sds_date": self.sds_date,
+        }
+
+
+def _iter_paths(paths_or_root, include: list | None, exclude: list | None):
+    """PDF paths of a folder, a file or an iterable of both, in the order run_cli would parse them."""
+    if isinstance(paths_or_root, (str, os.PathLike)):
+        paths_or_root = [paths_or_root]
+    for path in paths_or_root:
+        path = os.fspath(path)
+        if os.path.isdir(path):
+            for _, entries in iter_pdf_folders(os.path.abspath(path), include, exclude):
+                for entry in entries:
+                    yield entry.path
+        else:
+            yield path
+
+
+def iter_sds(paths_or_root, mode: str = "Default", workers: int | None = None,
+             extractor: str = DEFAULT_EXTRACTOR, ordered: bool = False, errors: str = "raise",
+             include: list | None = None, exclude: list | None = None,
+             cache_args: tuple = (None, True, src.cache.DEFAULT_MAX_MB),
+             timeout: float | None = None, max_memory_mb: int | None = None):
+    """
+    Parse SDS PDFs and yield an SDSRecord for each as soon as it is parsed.
+
+    Paths are taken from paths_or_root only as the workers can take them, so it may be
+    a lazy iterable of any length; at most a few PDFs per worker are in flight. Stopping
+    the iteration early (break, close()) cancels the PDFs not started yet.
+
+        for record in iter_sds("/srv/sdb", mode="Auto"):
+            print(record.source, record.h_statements)
+
+    :param paths_or_root: a folder (searched like the CLI does), a PDF, or an iterable of both
+    :param mode: one of src.pdf.PARSE_MODES
+    :param workers: parser processes (default: CPU count, 1 parses in this process)
+    :param extractor: text extraction backend, see src.extractors
+    :param ordered: yield in input order instead of completion order
+    :param errors: "raise" re-raises the first PDF that fails, "skip" leaves failed PDFs out
+    :param include: see src.discovery.iter_pdf_folders, for folders only
+    :param exclude: see src.discovery.iter_pdf_folders, for folders only
+    :param cache_args: (cache_dir, use_cache, cache_max_mb) of the extraction cache
+    :param timeout: wall-clock budget of one PDF in seconds, see src.isolation
+    :param max_memory_mb: memory budget of a worker in MB, see src.isolation
+    """
+    if mode not in src.pdf.PARSE_MODES:
+        raise ValueError(f"Unknown mode '{mode}', expected one of: {', '.join(src.pdf.PARSE_MODES)}")
+    if errors not in ("raise", "skip"):
+        raise ValueError(f"errors must be 'raise' or 'skip', not '{errors}'")
+
+    paths = _iter_paths(paths_or_root, include, exclude)
+    workers = workers or os.cpu_count() or 1
+    executor = create_executor(workers, cache_args, timeout=timeout, max_memory_mb=max_memory_mb)
+
+    if executor is None:
+        src.cache.configure(*cache_args)
+        for path in paths:
+            try:
+                sds = parse_one(path, mode, extractor)
+            except Exception:
+                if errors == "raise":
+                    raise
+                continue
+            yield SDSRecord.from_result(path, mode, sds)
+        return
+
+    max_pending = workers * 4
+    pending = deque()
+    try:
+        while True:
+            while len(pending) < max_pending:
+                path = next(paths, None)
+                if path is None:
+                    break
+                pending.append((path, executor.submit(parse_one, path, mode, extractor)))
+            if not pending:
+                return
+
+            if ordered:
+                finished = [pending.popleft()]
+            else:
+                done, _ = wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+                finished = [job for job in pending if job[1] in done]
+                for job in finished:
+                    pending.remove(job)
+
+            for path, future in finished:
+                try:
+                    sds = future.result()
+                except Exception:
+                    if errors == "raise":
+                        raise
+                    continue
+                yield SDSRecord.from_result(path, mode, sds)
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -0,0 +1,485 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import src.cache
+from src.corpus import CORPUS_VENDORS, generate_corpus, load_corpus_index
+from src.discovery import iter_pdf_folders
+from src.document import SDSDocument, find_section_headers, find_subsection_headers
+from src.excel import ExcelWriter, convert_data_to_list
+from src.extractors import DEFAULT_EXTRACTOR, EXTRACTORS
+from src.isolation import DocumentTimeout, IsolatedPool
+from src.pdf import AUTO_MODE, PARSE_MODES, PROFILES, parse_document
+from src.sinks import XlsxStreamSink
+
+SDS_FIELDS = ["handelsname", "manufacturer", "h_statements", "un_number", "pictograms", "sds_date"]
+
+MAIN_SCRIPT = str(Path(__file__).resolve().parent.parent / "main.py")
+
+# Top-level packages a CLI invocation must not import before it opens a PDF or workbook
+STARTUP_FORBIDDEN = ["tkinter", "PIL", "openpyxl", "pdfplumber", "pdfminer", "pypdfium2", "fitz"]
+
+# (prefix, repeated unit) of texts that make unbounded or ambiguous patterns backtrack:
+# labels without the value that should follow them, lines that never reach the
+# pattern's end marker, long runs of one character class
+ADVERSARIAL_INPUTS = {
+    "labels": ("", "Lieferant: Gefahrenhinweise: Flam. Liq. 2 STOT SE 3 Eye Irrit. 2 Skin Irrit. 2 Einstufung "
+                   "Produktidentifikator Handelsname Version 3 Überarbeitet am UN-Nummer ABSCHNITT 14 "),
+    "lines": ("Lieferant: ", "Firma Musterstraße Musterstadt\n"),
+    "indented": ("Lieferant: ", " Text ohne Ende \n"),
+    "headers": ("", "ABSCHNITT 2: \n* ABSCHNITT 14:\n14 1\n"),
+    "letters": ("", "A"),
+    "digits": ("", "1"),
+    "spaces": ("", " \n\t"),
+}
+
+
+def _find_pdfs(path: str) -> list:
+    root = Path(path)
+    if root.is_file():
+        return [root]
+    return sorted(p for p in root.rglob("*") if p.is_file() and p.suffix.lower() == ".pdf")
+
+
+def benchmark_extractors(pdf_paths: list, extractors: list | None = None, mode: str = "Default") -> dict:
+    """
+    Extract and parse every PDF with each backend and compare the results with the
+    default backend (pdfplumber layout), which is what the parsers were written against.
+
+    :param pdf_paths: PDFs to run
+    :param extractors: backend names, defaults to all registered backends
+    :param mode: parser mode used for the field comparison
+    :return: {backend: {"files", "pages", "seconds", "pages_per_sec", "failures", "agreement": {field: ratio}}}
+    """
+    names = [DEFAULT_EXTRACTOR] + [n for n in (extractors or EXTRACTORS) if n != DEFAULT_EXTRACTOR]
+    reference = {}
+    results = {}
+
+    for name in names:
+        pages = 0
+        seconds = 0.0
+        failures = 0
+        agree = {field: 0 for field in SDS_FIELDS}
+        compared = 0
+
+        for pdf_path in pdf_paths:
+            try:
+                with SDSDocument(str(pdf_path), extractor=name) as doc:
+                    start = time.perf_counter()
+                    doc.text  # lay out every page so pages/sec is comparable between backends
+                    seconds += time.perf_counter() - start
+                    pages += doc.page_count
+                    sds = parse_document(doc, mode)
+            except Exception as e:
+                print(f"[WARN] {name} failed on {pdf_path}: {e}")
+                failures += 1
+                continue
+
+            if name == DEFAULT_EXTRACTOR:
+                reference[pdf_path] = sds
+            if pdf_path not in reference:
+                continue
+            compared += 1
+            for field in SDS_FIELDS:
+                if sds.get(field) == reference[pdf_path].get(field):
+                    agree[field] += 1
+
+        results[name] = {
+            "files": len(pdf_paths),
+            "pages": pages,
+            "seconds": round(seconds, 4),
+            "pages_per_sec": round(pages / seconds, 2) if seconds else None,
+            "failures": failures,
+            "agreement": {f: round(agree[f] / compared, 4) if compared else None for f in SDS_FIELDS},
+        }
+
+    return results
+
+
+def _print_extractor_table(results: dict):
+    header = f"{'extractor':<18} {'pages/s':>8} {'fail':>5} " + " ".join(f"{f[:12]:>12}" for f in SDS_FIELDS)
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        pps = f"{r['pages_per_sec']:.1f}" if r["pages_per_sec"] else "-"
+        cells = " ".join(
+            f"{r['agreement'][f] * 100:>11.1f}%" if r["agreement"][f] is not None else f"{'-':>12}"
+            for f in SDS_FIELDS
+        )
+        print(f"{name:<18} {pps:>8} {r['failures']:>5} {cells}")
+
+
+def _revision() -> str | None:
+    """Git commit of the working tree, so results can be matched to the code they measured."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _throughput(seconds: float, count: int) -> float | None:
+    return round(count / seconds, 2) if seconds else None
+
+
+def _scan(root: Path) -> list:
+    """PDFs of root in the order run_cli processes them."""
+    return [Path(e.path) for _, entries in iter_pdf_folders(str(root)) for e in entries]
+
+
+def benchmark_pipeline(root: str, mode: str = AUTO_MODE, extractor: str = DEFAULT_EXTRACTOR) -> dict:
+    """
+    Time the stages of a CLI run one after another on the PDFs below root.
+
+    Every stage runs in this process over all files before the next one starts, so
+    the numbers are per-stage throughput rather than the wall time of a parallel run:
+    directory scan, text extraction, parsing of the extracted pages, writing the rows
+    into a new workbook (ExcelWriter and the streaming XlsxStreamSink), and appending
+    them again to the now filled workbook. If root is a corpus from src.corpus, the
+    parsed fields are also compared with its ground truth.
+
+    :param root: folder with PDFs in product subfolders, as for run_cli
+    :param mode: parser mode, one of PARSE_MODES
+    :param extractor: text extraction backend
+    :return: {"files", "pages", "stages": {stage: {"seconds", ...per sec}}, "accuracy": {field: ratio} or None}
+    """
+    root = Path(root)
+    stages = {}
+
+    start = time.perf_counter()
+    pdfs = _scan(root)
+    seconds = time.perf_counter() - start
+    stages["scan"] = {"seconds": round(seconds, 4), "files_per_sec": _throughput(seconds, len(pdfs))}
+
+    extracted = []
+    pages = 0
+    seconds = 0.0
+    for pdf_path in pdfs:
+        with SDSDocument(str(pdf_path), extractor=extractor) as doc:
+            start = time.perf_counter()
+            texts = [doc.page(i) for i in range(doc.page_count)]
+            seconds += time.perf_counter() - start
+        pages += len(texts)
+        extracted.append((pdf_path, texts))
+    stages["extract"] = {
+        "seconds": round(seconds, 4),
+        "files_per_sec": _throughput(seconds, len(pdfs)),
+        "pages_per_sec": _throughput(seconds, pages),
+    }
+
+    parsed = []
+    start = time.perf_counter()
+    for pdf_path, texts in extracted:
+        parsed.append((pdf_path, parse_document(SDSDocument(pages=texts), mode)))
+    seconds = time.perf_counter() - start
+    stages["parse"] = {"seconds": round(seconds, 4), "files_per_sec": _throughput(seconds, len(parsed))}
+
+    rows = [convert_data_to_list(sds) for _, sds in parsed]
+    with tempfile.TemporaryDirectory() as tmp:
+        for stage, open_writer in (
+            ("excel_write", lambda path: ExcelWriter(path, duplicates="append")),
+            ("xlsx_stream", lambda path: XlsxStreamSink(path, duplicates="append")),
+            # Second run against the workbook written by excel_write
+            ("excel_append", lambda path: ExcelWriter(path, duplicates="append")),
+        ):
+            path = os.path.join(tmp, "stream.xlsx" if stage == "xlsx_stream" else "kataster.xlsx")
+            start = time.perf_counter()
+            with open_writer(path) as writer:
+                for row in rows:
+                    writer.write_row(row)
+            seconds = time.perf_counter() - start
+            stages[stage] = {"seconds": round(seconds, 4), "rows_per_sec": _throughput(seconds, len(rows))}
+
+    accuracy = None
+    index = load_corpus_index(str(root))
+    if index is not None:
+        correct = {field: 0 for field in SDS_FIELDS}
+        compared = 0
+        for pdf_path, sds in parsed:
+            truth = index["files"].get(pdf_path.relative_to(root).as_posix())
+            if truth is None:
+                continue
+            compared += 1
+            for field in SDS_FIELDS:
+                if sds.get(field) == truth["expected"][field]:
+                    correct[field] += 1
+        accuracy = {f: round(correct[f] / compared, 4) if compared else None for f in SDS_FIELDS}
+
+    return {"files": len(pdfs), "pages": pages, "stages": stages, "accuracy": accuracy}
+
+
+def _print_pipeline_table(results: list):
+    columns = [
+        ("scan", "files_per_sec", "scan f/s"),
+        ("extract", "pages_per_sec", "extract p/s"),
+        ("parse", "files_per_sec", "parse f/s"),
+        ("excel_write", "rows_per_sec", "write r/s"),
+        ("xlsx_stream", "rows_per_sec", "stream r/s"),
+        ("excel_append", "rows_per_sec", "append r/s"),
+    ]
+    header = f"{'files':>7} {'pages':>7} " + " ".join(f"{title:>12}" for _, _, title in columns) + f" {'accuracy':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        cells = " ".join(
+            f"{r['stages'][stage][key]:>12.1f}" if r["stages"][stage][key] else f"{'-':>12}"
+            for stage, key, _ in columns
+        )
+        if r["accuracy"]:
+            ratios = [v for v in r["accuracy"].values() if v is not None]
+            accuracy = f"{min(ratios) * 100:>8.1f}%" if ratios else f"{'-':>9}"
+        else:
+            accuracy = f"{'-':>9}"
+        print(f"{r['files']:>7} {r['pages']:>7} {cells} {accuracy}")
+
+
+def _imported_packages(args: list) -> set:
+    """Top-level packages imported by `python -X importtime main.py args`."""
+    result = subprocess.run([sys.executable, "-X", "importtime", MAIN_SCRIPT] + args,
+                            capture_output=True, text=True, timeout=120)
+    packages = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and line.count("|") == 2:
+            name = line.rsplit("|", 1)[1].strip()
+            packages.add(name.split(".")[0])
+    return packages
+
+
+def benchmark_startup(runs: int = 10, exe: str | None = None) -> dict:
+    """
+    Wall time of short invocations, as seen by scripts calling the tool: `--help`, and a
+    CLI run over an empty folder into a CSV file, which opens no PDF and no workbook.
+    With the Python entry point it also lists the STARTUP_FORBIDDEN packages each
+    invocation imported.
+
+    :param runs: invocations per scenario
+    :param exe: frozen executable to time instead of `python main.py` (no import check)
+    :return: {scenario: {"min_ms", "median_ms", "max_ms", "forbidden_imports"}}
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        empty = os.path.join(tmp, "empty")
+        os.mkdir(empty)
+        scenarios = {
+            "help": ["--help"],
+            "cli": ["-c", "-p", empty, "-e", os.path.join(tmp, "out.csv"), "--no-cache", "-w", "1"],
+        }
+        for name, args in scenarios.items():
+            command = ([exe] if exe else [sys.executable, MAIN_SCRIPT]) + args
+            times = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                subprocess.run(command, capture_output=True, timeout=120, check=True)
+                times.append((time.perf_counter() - start) * 1000)
+            forbidden = None if exe else sorted(_imported_packages(args) & set(STARTUP_FORBIDDEN))
+            results[name] = {
+                "min_ms": round(min(times), 1),
+                "median_ms": round(statistics.median(times), 1),
+                "max_ms": round(max(times), 1),
+                "forbidden_imports": forbidden,
+            }
+    return results
+
+
+def _adversarial_text(name: str, size: int) -> str:
+    prefix, unit = ADVERSARIAL_INPUTS[name]
+    return prefix + unit * max(1, size // len(unit))
+
+
+def _time_regex_target(target: tuple, name: str, size: int) -> float:
+    """Milliseconds target takes on one adversarial input; module-level for IsolatedPool."""
+    text = _adversarial_text(name, size)
+    start = time.perf_counter()
+    if target[0] == "pattern":
+        _, mode, scope, index = target
+        regex = PROFILES[mode][scope][index].regex
+        regex.search(text)
+        for _ in regex.finditer(text):
+            pass
+    elif target[0] == "index":
+        find_section_headers(text)
+        find_subsection_headers(text)
+    else:
+        parse_document(SDSDocument.from_text(text), target[1])
+    return (time.perf_counter() - start) * 1000
+
+
+def benchmark_regex(size: int = 100_000, timeout: float = 10.0) -> list:
+    """
+    Time every parser pattern, the section index and every parser on each
+    ADVERSARIAL_INPUTS text. Each run is a job of an IsolatedPool, so a pattern that
+    backtracks catastrophically is killed after timeout seconds instead of hanging.
+
+    :param size: characters per input text
+    :return: [{"target", "input", "ms"}], ms None for runs killed after timeout
+    """
+    targets = []
+    for mode, profile in PROFILES.items():
+        for scope, patterns in profile.items():
+            for index, pattern in enumerate(patterns):
+                targets.append((f"{mode}/{scope}/{pattern.field}#{index}", ("pattern", mode, scope, index)))
+    targets.append(("section index", ("index",)))
+    targets += [(f"parse:{mode}", ("parse", mode)) for mode in PARSE_MODES if mode != AUTO_MODE]
+
+    pool = IsolatedPool(1, timeout=timeout)
+    try:
+        jobs = [(label, name, pool.submit(_time_regex_target, target, name, size))
+                for label, target in targets for name in ADVERSARIAL_INPUTS]
+        results = []
+        for label, name, future in jobs:
+            try:
+                ms = round(future.result(), 2)
+            except DocumentTimeout:
+                ms = None
+            results.append({"target": label, "input": name, "ms": ms})
+    finally:
+        pool.shutdown(cancel_futures=True)
+    return results
+
+
+def main(argv: list | None = None):
+    parser = argparse.ArgumentParser(description="Performance benchmarks for SDSExtractor.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ext = sub.add_parser("extractors", help="Compare text extraction backends: pages/sec and field agreement.")
+    ext.add_argument("path", help="PDF file or folder with PDFs (searched recursively).")
+    ext.add_argument("--mode", "-m", choices=PARSE_MODES, default="Default", help="Parser used for the comparison.")
+    ext.add_argument("--extractors", "-x", nargs="+", choices=list(EXTRACTORS), help="Backends to run (default: all).")
+    ext.add_argument("--json", dest="json_path", help="Also write the results to this JSON file.")
+
+    gen = sub.add_parser("corpus", help="Write a synthetic corpus of German SDS PDFs with ground truth.")
+    gen.add_argument("path", help="Output folder.")
+    gen.add_argument("--files", "-n", type=int, default=100, help="Number of PDFs (default: 100).")
+    gen.add_argument("--pages", "-p", type=int, default=8, help="Pages per PDF (default: 8).")
+    gen.add_argument("--vendors", nargs="+", choices=CORPUS_VENDORS, help="Vendor layouts (default: all).")
+    gen.add_argument("--per-folder", dest="files_per_folder", type=int, default=1,
+                     help="PDFs per product folder (default: 1).")
+    gen.add_argument("--seed", type=int, default=0, help="Random seed (default: 0).")
+
+    pipe = sub.add_parser("pipeline", help="Per-stage throughput of scan, extraction, parsing and Excel writes.")
+    pipe.add_argument("path", nargs="?",
+                      help="Folder with PDFs to run. Without it, synthetic corpora of every --sizes size are generated.")
+    pipe.add_argument("--sizes", type=int, nargs="+", default=[10, 100],
+                      help="Corpus sizes in files for generated corpora (default: 10 100).")
+    pipe.add_argument("--pages", "-p", type=int, default=8, help="Pages per generated PDF (default: 8).")
+    pipe.add_argument("--vendors", nargs="+", choices=CORPUS_VENDORS, help="Vendor layouts of generated corpora.")
+    pipe.add_argument("--seed", type=int, default=0, help="Random seed of generated corpora (default: 0).")
+    pipe.add_argument("--mode", "-m", choices=PARSE_MODES, default=AUTO_MODE, help="Parser mode (default: Auto).")
+    pipe.add_argument("--extractor", "-x", choices=list(EXTRACTORS), default=DEFAULT_EXTRACTOR,
+                      help=f"Text extraction backend (default: {DEFAULT_EXTRACTOR}).")
+    pipe.add_argument("--json", dest="json_path", help="Also write the results to this JSON file.")
+
+    start_cmd = sub.add_parser("startup", help="Startup time of short CLI invocations and the modules they import.")
+    start_cmd.add_argument("--runs", type=int, default=10, help="Invocations per scenario (default: 10).")
+    start_cmd.add_argument("--exe", help="Time this frozen executable instead of python main.py.")
+    start_cmd.add_argument("--max-ms", dest="max_ms", type=float,
+                           help="Fail if a scenario's median startup time exceeds this many milliseconds.")
+    start_cmd.add_argument("--json", dest="json_path", help="Also write the results to this JSON file.")
+
+    regex_cmd = sub.add_parser("regex", help="Time the parser patterns on adversarial inputs that make regexes backtrack.")
+    regex_cmd.add_argument("--size", type=int, default=100_000, help="Characters per input (default: 100000).")
+    regex_cmd.add_argument("--timeout", type=float, default=10.0,
+                           help="Seconds after which a run is killed and counted as failed (default: 10).")
+    regex_cmd.add_argument("--max-ms", dest="max_ms", type=float,
+                           help="Fail if a run takes longer than this many milliseconds.")
+    regex_cmd.add_argument("--top", type=int, default=15, help="Slowest runs to print (default: 15).")
+    regex_cmd.add_argument("--json", dest="json_path", help="Also write the results to this JSON file.")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "regex":
+        results = benchmark_regex(args.size, args.timeout)
+        slowest = sorted(results, key=lambda r: float("inf") if r["ms"] is None else r["ms"], reverse=True)
+        for r in slowest[:args.top]:
+            ms = f"> {args.timeout * 1000:.0f}" if r["ms"] is None else f"{r['ms']:.1f}"
+            print(f"{r['target']:<36} {r['input']:<10} {ms:>10} ms")
+        failures = [f"{r['target']} on {r['input']}" for r in results
+                    if r["ms"] is None or (args.max_ms is not None and r["ms"] > args.max_ms)]
+        if args.json_path:
+            report = {"command": "regex", "revision": _revision(), "python": platform.python_version(),
+                      "size": args.size, "results": results}
+            with open(args.json_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        if failures:
+            print(f"[FAIL] {len(failures)} runs over the limit: " + "; ".join(failures))
+            sys.exit(1)
+        return
+
+    if args.command == "startup":
+        results = benchmark_startup(args.runs, args.exe)
+        failures = []
+        for name, r in results.items():
+            forbidden = ", ".join(r["forbidden_imports"]) if r["forbidden_imports"] else "-"
+            print(f"{name:<6} median {r['median_ms']:>7.1f} ms  min {r['min_ms']:>7.1f} ms  "
+                  f"max {r['max_ms']:>7.1f} ms  forbidden imports: {forbidden}")
+            if r["forbidden_imports"]:
+                failures.append(f"{name} imports {forbidden}")
+            if args.max_ms is not None and r["median_ms"] > args.max_ms:
+                failures.append(f"{name} takes {r['median_ms']:.1f} ms (limit {args.max_ms:.1f} ms)")
+        if args.json_path:
+            report = {"command": "startup", "revision": _revision(), "python": platform.python_version(),
+                      "platform": platform.platform(), "exe": args.exe, "results": results}
+            with open(args.json_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        if failures:
+            print("[FAIL] " + "; ".join(failures))
+            sys.exit(1)
+        return
+
+    if args.command == "corpus":
+        start = time.perf_counter()
+        index = generate_corpus(args.path, args.files, args.pages, args.vendors, args.files_per_folder, args.seed)
+        print(f"Wrote {len(index['files'])} PDFs with {args.pages} pages to {args.path} "
+              f"in {time.perf_counter() - start:.1f} s")
+        return
+
+    # Measure real extraction, not cache hits
+    src.cache.configure(enabled=False)
+
+    if args.command == "extractors":
+        pdfs = _find_pdfs(args.path)
+        if not pdfs:
+            print(f"No PDFs found in {args.path}")
+            return
+        results = benchmark_extractors(pdfs, args.extractors, args.mode)
+        _print_extractor_table(results)
+        if args.json_path:
+            with open(args.json_path, "w", encoding="utf-8") as f:
+                json.dump({"command": "extractors", "mode": args.mode, "results": results}, f, indent=2)
+
+    elif args.command == "pipeline":
+        results = []
+        if args.path:
+            results.append(benchmark_pipeline(args.path, args.mode, args.extractor))
+        else:
+            for size in args.sizes:
+                with tempfile.TemporaryDirectory() as tmp:
+                    generate_corpus(tmp, size, args.pages, args.vendors, seed=args.seed)
+                    results.append(benchmark_pipeline(tmp, args.mode, args.extractor))
+        _print_pipeline_table(results)
+        if args.json_path:
+            report = {
+                "command": "pipeline",
+                "revision": _revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "mode": args.mode,
+                "extractor": args.extractor,
+                "corpus": args.path or {"sizes": args.sizes, "pages": args.pages,
+                                        "vendors": args.vendors or CORPUS_VENDORS, "seed": args.seed},
+                "results": results,
+            }
+            with open(args.json_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+
+DEFAULT_MAX_MB = 1024
+
+_active = None
+
+
+def default_cache_dir() -> str:
+    """Per-user cache folder (%LOCALAPPDATA% on Windows, ~/.cache elsewhere)."""
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") \
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "SDSExtractor", "cache")
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 of the file content."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ExtractionCache:
+    """
+    On-disk cache for extracted PDF text and parsed SDS dicts.
+
+    Entries are keyed by the PDF's content hash plus the extractor version and options,
+    so renamed or copied files hit the cache and changed files miss it. Each entry is a
+    gzipped JSON file holding the normalized text of the pages extracted so far and the
+    parsed dict per parser mode.
+    Reading an entry refreshes its mtime; prune() evicts the least recently used entries
+    until the cache fits into max_bytes.
+
+    :param cache_dir: folder for the cache files (created if missing)
+    :param max_bytes: size limit enforced by prune()
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._hashes = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _content_hash(self, pdf_path: str) -> str:
+        st = os.stat(pdf_path)
+        stat_key = (os.path.abspath(pdf_path), st.st_size, st.st_mtime_ns)
+        digest = self._hashes.get(stat_key)
+        if digest is None:
+            digest = file_hash(pdf_path)
+            self._hashes[stat_key] = digest
+        return digest
+
+    def _entry_path(self, pdf_path: str, options: dict) -> str:
+        material = json.dumps([self._content_hash(pdf_path), options], sort_keys=True)
+        key = hashlib.sha256(material.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], key + ".json.gz")
+
+    def _load(self, entry_path: str) -> dict | None:
+        try:
+            with gzip.open(entry_path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(entry_path)
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, entry_path: str, entry: dict):
+        folder = os.path.dirname(entry_path)
+        try:
+            os.makedirs(folder, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            # The cache is best-effort; a failed write only costs a later re-extraction
+            print(f"[WARN] Could not write cache entry {entry_path}: {e}")
+
+    def get_pages(self, pdf_path: str, options: dict) -> dict | None:
+        """{"page_count": n, "pages": {"<index>": text}} for the pages extracted so far, or None."""
+        entry = self._load(self._entry_path(pdf_path, options))
+        if not entry or "pages" not in entry:
+            return None
+        return {"page_count": entry["page_count"], "pages": entry["pages"]}
+
+    def put_pages(self, pdf_path: str, options: dict, page_count: int, pages: dict):
+        entry_path = self._entry_path(pdf_path, options)
+        entry = self._load(entry_path) or {}
+        entry["page_count"] = page_count
+        merged = entry.setdefault("pages", {})
+        merged.update({str(index): text for index, text in pages.items()})
+        self._store(entry_path, entry)
+
+    def get_parsed(self, pdf_path: str, options: dict, mode: str) -> dict | None:
+        entry = self._load(self._entry_path(pdf_path, options))
+        return entry.get("parsed", {}).get(mode) if entry else None
+
+    def put_parsed(self, pdf_path: str, options: dict, mode: str, parsed: dict):
+        entry_path = self._entry_path(pdf_path, options)
+        entry = self._load(entry_path) or {}
+        entry.setdefault("parsed", {})[mode] = parsed
+        self._store(entry_path, entry)
+
+    def prune(self) -> int:
+        """Delete least recently used entries until the cache fits into max_bytes. Returns the number removed."""
+        files = []
+        total = 0
+        for dirpath, _, filenames in os.walk(self.cache_dir):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+
+        removed = 0
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+
+def configure(cache_dir: str | None = None, enabled: bool = True, max_mb: int = DEFAULT_MAX_MB):
+    """
+    Set the cache used by src.pdf in this process. Also used as process pool initializer.
+
+    :param cache_dir: cache folder, defaults to default_cache_dir()
+    :param enabled: if False, disable caching
+    :param max_mb: size limit in megabytes
+    """
+    global _active
+    if not enabled:
+        _active = None
+        return
+    _active = ExtractionCache(cache_dir or default_cache_dir(), max_bytes=max_mb * 1024 * 1024)
+
+
+def get_active() -> ExtractionCache | None:
+    return _active
@@ -1,28 +1,42 @@
+from collections import Counter, deque
+from concurrent.futures import BrokenExecutor, CancelledError
 from pathlib import Path
 import os
 import re
 
+import src.cache
 import src.pdf
 import src.excel
-
-
-def _extract_h_set(sds):
+import src.memory
+import src.profiling
+import src.sinks
+from src.discovery import iter_listed_folders, iter_pdf_folders
+from src.extractors import DEFAULT_EXTRACTOR
+from src.hazards import encode_h
+from src.isolation import DocumentTimeout, WorkerCrashed
+from src.manifest import Manifest, default_manifest_path
+from src.quarantine import Quarantine, default_quarantine_path
+from src.workers import create_executor
+
+# Added to the Besonderheiten column of rows whose PDFs are gone (--mark-missing)
+MISSING_NOTE = "SDB nicht mehr vorhanden"
+
+
+def _extract_h_mask(sds) -> int:
+    """H-set of a parse result as a src.hazards bitset, 0 for none."""
     if not isinstance(sds, dict):
-        return set()
+        return 0
 
     values = sds.get("h_statements", [])
 
-    if isinstance(values, (list, set, tuple)) and not values:
-        return set()
-
     if isinstance(values, (list, set, tuple)):
-        return {str(x).strip() for x in values if x is not None and str(x).strip()}
+        return encode_h(str(x).strip() for x in values if x is not None and str(x).strip())
 
     if isinstance(values, str):
         parts = [p.strip() for p in re.split(r"[;,]", values)]
-        return {p for p in parts if p}
+        return encode_h(p for p in parts if p)
 
-    return set()
+    return 0
 
 
 def _set_handels_name(sds, name: str):
@@ -32,6 +46,8 @@ def _set_handels_name(sds, name: str):
 
 def _build_handelsname_with_first_dir(root: Path, child_dir: Path, leaf_name: str) -> str:
     rel_parts = child_dir.relative_to(root).parts
+    if not rel_parts:
+        return leaf_name  # PDFs directly in the root folder
     firstname = rel_parts[0] if rel_parts else leaf_name
     sub = rel_parts[-2] if len(rel_parts) >= 2 else ""
 
@@ -73,11 +89,154 @@ def _should_write_sds(sds: dict, file_path: Path) -> bool:
     return False
 
 
+def select_parse_mode(use_fallback: bool, use_3mf: bool, use_basf: bool, use_lechler: bool, use_auto: bool = False) -> str:
+    if use_3mf:
+        return "3M"
+    if use_basf:
+        return "BASF"
+    if use_lechler:
+        return "Lechler"
+    if use_fallback:
+        return "Fallback"
+    if use_auto:
+        return src.pdf.AUTO_MODE
+    return "Default"
+
+
+def _report_detections(detections: dict, seconds: float) -> None:
+    """Summary of the parsers picked in auto mode. detections maps parser mode to file count."""
+    files = sum(detections.values())
+    if not files:
+        return
+    picked = ", ".join(f"{mode}: {count}" for mode, count in sorted(detections.items()))
+    print(f"[AUTO] {files} files classified in {seconds * 1000:.1f} ms "
+          f"({seconds * 1000 / files:.2f} ms/file) -> {picked}")
+
+
+def _report_duplicates(writer) -> None:
+    for handelsname, row in writer.duplicates_skipped:
+        print(f"[SKIP] '{handelsname}' is already in row {row}")
+    for handelsname, row in writer.duplicates_updated:
+        print(f"[INFO] Updated duplicate '{handelsname}' in row {row}")
+    if writer.duplicates_skipped or writer.duplicates_updated:
+        print(f"[INFO] Duplicates: {len(writer.duplicates_skipped)} skipped, {len(writer.duplicates_updated)} updated")
+
+
+# Other exceptions of a PDF are quarantined as "error"
+_QUARANTINE_REASONS = {DocumentTimeout: "timeout", src.memory.MemoryLimitExceeded: "memory", WorkerCrashed: "crash"}
+
+
+def _representatives(keys: list) -> list:
+    """
+    Indexes of the PDFs of a folder whose fields _folder_rows() uses, by their H-set
+    bitsets: the first one if all share an H-set, otherwise every one whose H-set no
+    other PDF in the folder has. The others only need their H-set parsed.
+    """
+    if len(set(keys)) == 1:
+        return [0]
+    counts = Counter(keys)
+    return [i for i, key in enumerate(keys) if counts[key] == 1]
+
+
+def _folder_rows(root: Path, child_path: Path, all_entries: list) -> list:
+    """
+    Rows one folder produces: a single row if all its PDFs share an H-set, otherwise a
+    row for every PDF whose H-set no other PDF in the folder has.
+
+    :return: list of (names of the PDFs the row stands for, row values)
+    """
+    child_name = child_path.name
+    counts = Counter(h for _, h, _ in all_entries)
+    rows = []
+
+    if len(counts) == 1:
+        first_sds = all_entries[0][2]
+        handelsname = _build_handelsname_with_first_dir(root, child_path, child_name)
+        _set_handels_name(first_sds, handelsname)
+
+        if _should_write_sds(first_sds, child_path):
+            rows.append(([name for name, _, _ in all_entries], src.excel.convert_data_to_list(first_sds)))
+
+    else:
+        handelsname = _build_handelsname_with_first_dir(root, child_path, child_name)
+        for name, h, sds_obj in all_entries:
+            if counts[h] != 1:
+                continue
+            _set_handels_name(sds_obj, handelsname)
+            if _should_write_sds(sds_obj, child_path):
+                rows.append(([name], src.excel.convert_data_to_list(sds_obj)))
+
+    return rows
+
+
+def _write_folder(root: Path, child_path: Path, all_entries: list, writer):
+    """Group the parsed entries of one folder by H-set and write the selected ones to Excel."""
+    for _, row_data in _folder_rows(root, child_path, all_entries):
+        writer.write_row(row_data)
+
+
+def _upsert_folder(root: Path, child_path: Path, all_entries: list, writer: src.excel.ExcelWriter,
+                   manifest: Manifest, mark_missing: bool, stats: dict):
+    """
+    Write the rows of a new or changed folder over the rows it produced in the last run.
+
+    Old rows are reused in order, but only while they still hold the folder's Handelsname,
+    so rows moved or renamed by hand are left alone. Extra rows are added like in a full
+    run; old rows no longer needed are marked with MISSING_NOTE if mark_missing is set.
+    """
+    folder = str(child_path)
+    old_rows = manifest.folder_rows(folder)
+    rows_by_path = {str(child_path / name): None for name, _, _ in all_entries}
+    new_rows = []
+
+    for names, row_data in _folder_rows(root, child_path, all_entries):
+        target = None
+        while old_rows and target is None:
+            candidate = old_rows.pop(0)
+            if writer.cell_value(candidate, 1) == row_data[0]:
+                target = candidate
+            else:
+                print(f"[WARN] Row {candidate} no longer holds '{row_data[0]}', leaving it unchanged")
+        if target is None:
+            new_rows.append((names, row_data))
+            continue
+        writer.update_row(target, row_data)
+        stats["updated"] += 1
+        for name in names:
+            rows_by_path[str(child_path / name)] = target
+
+    if mark_missing:
+        for row in old_rows:
+            writer.mark_row(row, MISSING_NOTE)
+            stats["marked"] += 1
+
+    # Record the updated rows first, so inserted rows shift them along with all others
+    manifest.record_folder(folder, rows_by_path)
+    for names, row_data in new_rows:
+        # Inserting shifts the recorded rows through the writer's on_insert
+        row = writer.write_row(row_data)
+        for name in names:
+            manifest.set_row(str(child_path / name), row)
+        stats["added"] += 1
+
+
 def run_cli(path: str, excel_path: str, use_fallback: bool, use_3mf: bool, use_basf: bool, use_lechler: bool,
-            insert_row: int | None = None):
+            insert_row: int | None = None, workers: int | None = None, flush_every: int | None = None,
+            cache_dir: str | None = None, use_cache: bool = True, cache_max_mb: int = src.cache.DEFAULT_MAX_MB,
+            extractor: str = DEFAULT_EXTRACTOR, use_auto: bool = False, incremental: bool = False,
+            manifest_path: str | None = None, mark_missing: bool = False, duplicates: str = "skip",
+            output_format: str | None = None, profile: bool = False, profile_path: str | None = None,
+            include: list | None = None, exclude: list | None = None, max_memory_mb: int | None = None,
+            timeout: float | None = None, quarantine_path: str | None = None, dedup: bool = True,
+            folders: list | None = None):
     """
     Main CLI runner. Walks directories, parses SDS PDFs, and writes them into Excel.
 
+    The folder tree is listed once and folders are handed out as they are found, so
+    parsing starts while the walk goes on. PDFs are extracted and parsed in a process
+    pool; grouping and Excel writes stay in this process and happen folder by folder
+    in walk order. The workbook is loaded and saved once per run.
+
     Args:
         path: Root folder with PDFs
         excel_path: Path to Excel file
@@ -85,70 +244,278 @@ def run_cli(path: str, excel_path: str, use_fallback: bool, use_3mf: bool, use_b
         use_3mf: Use 3M parser
         use_basf: Use BASF parser
         insert_row: If given, insert into this row instead of appending
+        workers: Number of parser processes (default: CPU count, 1 parses in-process)
+        flush_every: Save the workbook after every N rows instead of only at the end
+        cache_dir: Folder of the extraction cache (default: per-user cache folder)
+        use_cache: Read and write the extraction cache
+        cache_max_mb: Size limit of the extraction cache, enforced at the end of the run
+        extractor: Text extraction backend, see src.extractors
+        use_auto: Pick the parser per file from its first page (unless a parser flag is set)
+        incremental: Only parse folders with new, changed or removed PDFs since the last
+            incremental run and update their rows in place, see src.manifest
+        manifest_path: Manifest of the incremental runs (default: next to the Excel file)
+        mark_missing: In incremental runs, mark rows whose PDFs are gone
+        duplicates: What to do with rows already in the sheet, see src.excel.DUPLICATE_POLICIES
+        output_format: One of src.sinks.SINK_FORMATS (default: from the file extension).
+            A new Kataster and the other formats are streamed, see src.sinks; an
+            existing Kataster is loaded and extended.
+        profile: Time the stages of the run (scan, extraction, parsing per parser,
+            Excel load/write/save, ...), print a summary and write it as JSON, see src.profiling
+        profile_path: JSON file of the profile (default: <excel_path>.profile.json)
+        include: Globs for the PDFs to process, see src.discovery.iter_pdf_folders
+        exclude: Globs for PDFs and folders to skip, see src.discovery.iter_pdf_folders
+        max_memory_mb: Memory budget in MB of each parser process; PDFs that do not fit
+            are skipped, see src.memory
+        timeout: Wall-clock budget of one PDF in seconds. With a timeout or a memory
+            budget every PDF is parsed in a worker that is killed when it exceeds one,
+            see src.isolation, and the PDF is quarantined.
+        quarantine_path: Quarantine list of PDFs skipped until they change (default:
+            <excel_path>.quarantine.json, used with a timeout or memory budget), see
+            src.quarantine
+        dedup: In folders with several PDFs, parse only the H-statements of each PDF
+            first and fully parse only the PDFs the folder's rows are taken from
+        folders: Only process these folders below path (without their subfolders)
+            instead of walking path, e.g. the folders src.watch saw change
     """
     root = Path(path).resolve()
     if not root.exists() or not root.is_dir():
         raise ValueError(f"Path does not exist or is not a directory: {root}")
 
-    for dirpath, dirnames, _ in os.walk(root):
-        parent_name = Path(dirpath).name
-
-        for child_name in dirnames:
-            child_path = Path(dirpath) / child_name
+    mode = select_parse_mode(use_fallback, use_3mf, use_basf, use_lechler, use_auto)
+    cache_args = (cache_dir, use_cache, cache_max_mb)
+    src.cache.configure(*cache_args)
+    src.profiling.configure(profile)
+
+    output_format = output_format or src.sinks.format_for_path(excel_path)
+    needs_workbook = incremental or insert_row is not None
+    if output_format != "xlsx" and needs_workbook:
+        raise ValueError(f"Incremental runs and --insert-row need an .xlsx Kataster, not {output_format}")
+
+    manifest = None
+    if incremental:
+        manifest = Manifest(manifest_path or default_manifest_path(excel_path))
+        if manifest.files and not os.path.exists(excel_path):
+            print(f"[WARN] {excel_path} does not exist, ignoring the rows recorded in {manifest.path}")
+            manifest.clear()
+
+    if output_format == "xlsx" and (needs_workbook or os.path.exists(excel_path)):
+        writer = src.excel.ExcelWriter(excel_path, insert_row=insert_row, flush_every=flush_every,
+                                       duplicates=duplicates,
+                                       on_insert=manifest.shift_rows if manifest is not None else None)
+    else:
+        writer = src.sinks.open_sink(excel_path, output_format, duplicates=duplicates, flush_every=flush_every)
+
+    isolate = timeout is not None or max_memory_mb is not None
+    quarantine = None
+    if isolate or quarantine_path:
+        quarantine = Quarantine(quarantine_path or default_quarantine_path(excel_path))
+    quarantined = 0
+
+    workers = workers or os.cpu_count() or 1
+    executor = create_executor(workers, cache_args, profile, timeout, max_memory_mb)
+    # Keep a few batches queued per worker so the pool stays busy while the
+    # parent is grouping and writing the oldest folder.
+    max_pending = workers * 4
+
+    stats = {"unchanged": 0, "parsed": 0, "updated": 0, "added": 0, "marked": 0}
+    seen_folders = set()
+
+    pending = deque()
+    pending_files = 0
+    detections = {}
+    detect_seconds = 0.0
+    worker_peak_rss = None
+
+    def submit(fn, entry: Path, parse_mode: str):
+        """Submit a PDF to the pool, replacing the pool first if one of its workers died."""
+        nonlocal executor
+        if executor is None:
+            return None
+        try:
+            return executor.submit(fn, entry.as_posix(), parse_mode, extractor)
+        except BrokenExecutor:
+            print("[WARN] A parser process died, restarting the worker pool")
+            executor.shutdown(wait=False, cancel_futures=True)
+            executor = create_executor(workers, cache_args, profile, timeout, max_memory_mb)
+            return executor.submit(fn, entry.as_posix(), parse_mode, extractor)
+
+    def collect(fn, entry: Path, future, parse_mode: str):
+        """Result of a job submitted with submit(), None if the PDF was skipped."""
+        nonlocal worker_peak_rss, quarantined
+        retried = False
+        while True:
             try:
-                all_entries = []
-                for entry in child_path.iterdir():
-                    if entry.is_file() and entry.suffix.lower() == ".pdf":
-                        if use_3mf:
-                            sds = src.pdf.parse_sds_3m_format(entry.as_posix())
-                        elif use_basf:
-                            sds = src.pdf.parse_sds_basf_format(entry.as_posix())
-                        elif use_lechler:
-                            sds = src.pdf.parse_sds_lechler_format(entry.as_posix())
-                            sds["manufacturer"] = "Lechler Coatings GmbH"
-                        elif use_fallback:
-                            text = src.pdf.extract_text_chain(entry.as_posix())
-                            sds = src.pdf.parse_sds_fallback(text)
-                        else:
-                            text = src.pdf.extract_text_chain(entry.as_posix())
-                            sds = src.pdf.parse_sds(text)
-
-                        _report_none_fields(sds, entry)
-                        h_set = _extract_h_set(sds)
-                        all_entries.append((entry.name, h_set, sds))
-
-                if not all_entries:
+                if future is not None:
+                    with src.profiling.stage("wait"):
+                        result = future.result()
+                else:
+                    result = fn(entry.as_posix(), parse_mode, extractor)
+                break
+            except (BrokenExecutor, CancelledError):
+                # A worker died and took the pool's other jobs with it. Nothing is known
+                # about this PDF, so it is parsed once more in a new pool and not quarantined.
+                if retried:
+                    print(f"[SKIP] {entry}: the worker pool broke again while parsing it")
+                    return None
+                retried = True
+                future = submit(fn, entry, parse_mode)
+            except Exception as e:
+                # Budgets exceeded, or a PDF the parser cannot read; the run goes on without it
+                reason = _QUARANTINE_REASONS.get(type(e), "error")
+                print(f"[SKIP] {entry}: {reason}, {e}")
+                if quarantine is not None and quarantine.add(entry, reason, getattr(e, "seconds", None), str(e)):
+                    quarantined += 1
+                return None
+        src.profiling.add(result.pop("timings", ()))
+        peak_rss = result.pop("peak_rss", None)
+        if executor is not None and peak_rss is not None:
+            worker_peak_rss = max(worker_peak_rss or 0, peak_rss)
+        return result
+
+    def drain_one():
+        nonlocal pending_files, detect_seconds
+        child_path, fn, jobs = pending.popleft()
+        pending_files -= len(jobs)
+        try:
+            results = []
+            for entry, future in jobs:
+                result = collect(fn, entry, future, mode)
+                if result is None:
                     continue
-
-                unique_h_sets = {frozenset(h) for _, h, _ in all_entries}
-
-                if len(unique_h_sets) == 1:
-                    first_sds = all_entries[0][2]
-                    handelsname = _build_handelsname_with_first_dir(root, child_path, child_name)
-                    _set_handels_name(first_sds, handelsname)
-
-                    if _should_write_sds(first_sds, child_path):
-                        sds_excel_list = src.excel.convert_data_to_list(first_sds)
-                        src.excel.open_and_write_excel(
-                            excel_path, sds_excel_list, insert_row=insert_row
-                        )
-
+                if mode == src.pdf.AUTO_MODE:
+                    detections[result["parse_mode"]] = detections.get(result["parse_mode"], 0) + 1
+                    detect_seconds += result["detect_seconds"]
+                    print(f"[AUTO] {entry}: {result['parse_mode']} ({result['detect_seconds'] * 1000:.1f} ms)")
+                results.append((entry, result))
+
+            # Fingerprinted folders: fully parse the PDFs the rows are made of. Repeated
+            # in case one of them is skipped, which changes the grouping.
+            while True:
+                needed = _representatives([_extract_h_mask(result) for _, result in results])
+                partial = [i for i in needed if results[i][1].get("partial")]
+                if not partial:
+                    break
+                parse_modes = {i: results[i][1].get("parse_mode", mode) for i in partial}
+                futures = {i: submit(src.pdf.parse_pdf, results[i][0], parse_modes[i]) for i in partial}
+                skipped = set()
+                for i, future in futures.items():
+                    sds = collect(src.pdf.parse_pdf, results[i][0], future, parse_modes[i])
+                    if sds is None:
+                        skipped.add(i)
+                    else:
+                        results[i] = (results[i][0], sds)
+                results = [r for i, r in enumerate(results) if i not in skipped]
+
+            all_entries = []
+            for entry, result in results:
+                if result.get("partial"):
+                    # Grouped with another PDF, its other fields are never used
+                    all_entries.append((entry.name, _extract_h_mask(result), None))
+                    continue
+                _report_none_fields(result, entry)
+                all_entries.append((entry.name, _extract_h_mask(result), result))
+
+            if not all_entries:
+                return
+            with src.profiling.stage("group", str(child_path)):
+                if manifest is not None:
+                    _upsert_folder(root, child_path, all_entries, writer, manifest, mark_missing, stats)
                 else:
-                    counts = {}
-                    for _, h, _ in all_entries:
-                        key = frozenset(h)
-                        counts[key] = counts.get(key, 0) + 1
-                    sds_list = [s for _, h, s in all_entries if counts[frozenset(h)] == 1]
-
-                    handelsname = _build_handelsname_with_first_dir(root, child_path, child_name)
-                    for sds_obj in sds_list:
-                        _set_handels_name(sds_obj, handelsname)
-                        if _should_write_sds(sds_obj, child_path):
-                            sds_excel_list = src.excel.convert_data_to_list(sds_obj)
-                            src.excel.open_and_write_excel(
-                                excel_path, sds_excel_list, insert_row=insert_row
-                            )
-
-            except PermissionError:
-                print(f"Permission denied: {parent_name}")
-                continue
+                    _write_folder(root, child_path, all_entries, writer)
+
+        except PermissionError:
+            print(f"Permission denied: {child_path.parent.name}")
+
+    try:
+        if folders is None:
+            found = iter_pdf_folders(str(root), include, exclude)
+        else:
+            found = iter_listed_folders(str(root), folders, include, exclude)
+        for folder, pdf_entries in src.profiling.timed_iter("scan", found):
+            child_path = Path(folder)
+            seen_folders.add(folder)
+            if quarantine is not None:
+                kept = []
+                for pdf_entry in pdf_entries:
+                    if quarantine.contains(pdf_entry):
+                        print(f"[SKIP] {pdf_entry.path}: quarantined in {quarantine.path} until it changes")
+                    else:
+                        kept.append(pdf_entry)
+                if not kept:
+                    continue
+                pdf_entries = kept
+            if manifest is not None:
+                with src.profiling.stage("manifest", folder):
+                    unchanged = manifest.folder_unchanged(folder, pdf_entries)
+                if unchanged:
+                    stats["unchanged"] += 1
+                    continue
+
+            stats["parsed"] += 1
+
+            # Only the PDFs a folder's rows are made of need a full parse, see _representatives()
+            fn = src.pdf.fingerprint_pdf if dedup and len(pdf_entries) > 1 else src.pdf.parse_pdf
+            jobs = []
+            for pdf_entry in pdf_entries:
+                entry = Path(pdf_entry.path)
+                jobs.append((entry, submit(fn, entry, mode)))
+            pending.append((child_path, fn, jobs))
+            pending_files += len(jobs)
+
+            while pending and (executor is None or pending_files > max_pending):
+                drain_one()
+
+        while pending:
+            drain_one()
+
+        if manifest is not None:
+            # Folders recorded under this root (or of the given ones) that have no PDFs anymore
+            recorded = manifest.folders_under(str(root)) if folders is None else set(folders) & manifest.folders()
+            for folder in sorted(recorded - seen_folders):
+                if mark_missing:
+                    for row in manifest.folder_rows(folder):
+                        writer.mark_row(row, MISSING_NOTE)
+                        stats["marked"] += 1
+                    manifest.forget_folder(folder)
+
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        with src.profiling.stage("close"):
+            writer.close()
+        # Only after the workbook is saved, so the manifest never points at unsaved rows
+        if manifest is not None:
+            manifest.save()
+        if quarantine is not None:
+            quarantine.save()
+
+    _report_detections(detections, detect_seconds)
+    _report_duplicates(writer)
+    if quarantined:
+        print(f"[INFO] {quarantined} PDFs quarantined in {quarantine.path}")
+    peak_rss = src.memory.peak_rss()
+    memory = f"[INFO] Peak memory: {src.memory.format_mb(peak_rss)} in this process"
+    if executor is not None:
+        memory += f", {src.memory.format_mb(worker_peak_rss)} in the largest worker"
+    print(memory)
+    if manifest is not None:
+        print(f"[INFO] Incremental run: {stats['unchanged']} folders unchanged, {stats['parsed']} parsed; "
+              f"rows: {stats['updated']} updated, {stats['added']} added, {stats['marked']} marked as missing")
+
+    cache = src.cache.get_active()
+    if cache is not None:
+        cache.prune()
+
+    profiler = src.profiling.get_active()
+    if profiler is not None:
+        summary = profiler.summary()
+        summary["workers"] = workers
+        summary["peak_rss_mb"] = {
+            "main": round(peak_rss / 1024 / 1024, 1) if peak_rss is not None else None,
+            "workers": round(worker_peak_rss / 1024 / 1024, 1) if worker_peak_rss is not None else None,
+        }
+        src.profiling.print_summary(summary)
+        profile_path = profile_path or excel_path + ".profile.json"
+        src.profiling.write_summary(summary, profile_path)
+        print(f"[PROFILE] Metrics written to {profile_path}")
+        src.profiling.disable()
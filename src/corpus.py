@@ -0,0 +1,374 @@
+import json
+import os
+import random
+import zlib
+
+from src.hazards import H_TO_GHS
+
+CORPUS_VERSION = 3
+
+# Ground truth of a generated corpus, next to the vendor folders
+CORPUS_INDEX = "corpus.json"
+
+CORPUS_VENDORS = ["Default", "3M", "BASF", "Lechler"]
+
+LINES_PER_PAGE = 60
+
+# Wording of the H-statements of _H_SETS, as printed in section 2
+H_STATEMENT_TEXTS = {
+    "H200": "Instabil, explosiv.",
+    "H201": "Explosiv, Gefahr der Massenexplosion.",
+    "H202": "Explosiv; große Gefahr durch Splitter, Spreng- und Wurfstücke.",
+    "H203": "Explosiv; Gefahr durch Feuer, Luftdruck oder Splitter, Spreng- und Wurfstücke.",
+    "H220": "Extrem entzündbares Gas.",
+    "H221": "Entzündbares Gas.",
+    "H222": "Extrem entzündbares Aerosol.",
+    "H225": "Flüssigkeit und Dampf leicht entzündbar.",
+    "H226": "Flüssigkeit und Dampf entzündbar.",
+    "H228": "Entzündbarer Feststoff.",
+    "H301": "Giftig bei Verschlucken.",
+    "H302": "Gesundheitsschädlich bei Verschlucken.",
+    "H311": "Giftig bei Hautkontakt.",
+    "H312": "Gesundheitsschädlich bei Hautkontakt.",
+    "H314": "Verursacht schwere Verätzungen der Haut und schwere Augenschäden.",
+    "H315": "Verursacht Hautreizungen.",
+    "H317": "Kann allergische Hautreaktionen verursachen.",
+    "H318": "Verursacht schwere Augenschäden.",
+    "H319": "Verursacht schwere Augenreizung.",
+    "H331": "Giftig bei Einatmen.",
+    "H335": "Kann die Atemwege reizen.",
+    "H336": "Kann Schläfrigkeit und Benommenheit verursachen.",
+    "H350": "Kann Krebs erzeugen.",
+    "H360": "Kann die Fruchtbarkeit beeinträchtigen oder das Kind im Mutterleib schädigen.",
+    "H370": "Schädigt die Organe.",
+    "H372": "Schädigt die Organe bei längerer oder wiederholter Exposition.",
+    "H400": "Sehr giftig für Wasserorganismen.",
+    "H410": "Sehr giftig für Wasserorganismen mit langfristiger Wirkung.",
+    "H411": "Giftig für Wasserorganismen, mit langfristiger Wirkung.",
+    "H412": "Schädlich für Wasserorganismen, mit langfristiger Wirkung.",
+}
+
+# Hazard classes printed before the H-code in the classification lines
+H_CLASSES = {
+    "H225": "Flam. Liq. 2",
+    "H226": "Flam. Liq. 3",
+    "H315": "Skin Irrit. 2",
+    "H319": "Eye Irrit. 2",
+    "H335": "STOT SE 3",
+    "H336": "STOT SE 3",
+}
+
+# Common combinations, so the corpus has the H-sets of real paints and cleaners
+_H_SETS = [
+    ["H225", "H319", "H336"],
+    ["H226", "H336"],
+    ["H226", "H315", "H319", "H335"],
+    ["H225", "H315", "H336", "H411"],
+    ["H225", "H302", "H312", "H319"],
+    ["H317", "H412"],
+    ["H302", "H314"],
+    ["H222", "H319"],
+]
+
+_UN_NUMBERS = ["1263", "1993", "1866", "1950", "1170", "1760", "3082"]
+
+_SECTION_TITLES = {
+    1: "Bezeichnung des Stoffs bzw. des Gemischs und des Unternehmens",
+    2: "Mögliche Gefahren",
+    3: "Zusammensetzung/Angaben zu Bestandteilen",
+    4: "Erste-Hilfe-Maßnahmen",
+    5: "Maßnahmen zur Brandbekämpfung",
+    6: "Maßnahmen bei unbeabsichtigter Freisetzung",
+    7: "Handhabung und Lagerung",
+    8: "Begrenzung und Überwachung der Exposition/Persönliche Schutzausrüstungen",
+    9: "Physikalische und chemische Eigenschaften",
+    10: "Stabilität und Reaktivität",
+    11: "Toxikologische Angaben",
+    12: "Umweltbezogene Angaben",
+    13: "Hinweise zur Entsorgung",
+    14: "Angaben zum Transport",
+    15: "Rechtsvorschriften",
+    16: "Sonstige Angaben",
+}
+
+# Body text of sections 3-13, 15 and 16. Free of anything a parser looks for (codes,
+# field labels, dates, 3-4 digit numbers), so the filler never changes the ground truth.
+_FILLER = [
+    "Nach Einatmen: Betroffene Person an die frische Luft bringen und ruhig lagern.",
+    "Nach Hautkontakt: Beschmutzte Kleidung sofort ausziehen, Haut mit Wasser und Seife waschen.",
+    "Nach Augenkontakt: Einige Minuten lang behutsam mit Wasser spülen, Kontaktlinsen entfernen.",
+    "Nach Verschlucken: Mund ausspülen, kein Erbrechen herbeiführen, Arzt hinzuziehen.",
+    "Geeignete Löschmittel: Schaum, Kohlendioxid, Löschpulver, Wassersprühstrahl.",
+    "Aus Sicherheitsgründen ungeeignete Löschmittel: Wasservollstrahl.",
+    "Im Brandfall können gefährliche Zersetzungsprodukte wie Kohlenmonoxid entstehen.",
+    "Für ausreichende Lüftung sorgen, Zündquellen fernhalten, Dämpfe nicht einatmen.",
+    "Mit flüssigkeitsbindendem Material aufnehmen und vorschriftsmäßig entsorgen.",
+    "Nicht in die Kanalisation oder in Gewässer gelangen lassen.",
+    "Behälter dicht geschlossen an einem kühlen, gut belüfteten Ort aufbewahren.",
+    "Vor Hitze und direkter Sonneneinstrahlung schützen, nicht zusammen mit Oxidationsmitteln lagern.",
+    "Schutzhandschuhe aus Nitrilkautschuk und dicht schließende Schutzbrille tragen.",
+    "Bei unzureichender Belüftung Atemschutz mit Kombinationsfilter verwenden.",
+    "Aggregatzustand: flüssig; Farbe: farblos bis gelblich; Geruch: lösemittelartig.",
+    "Das Produkt ist bei bestimmungsgemäßer Lagerung und Handhabung stabil.",
+    "Gefährliche Reaktionen mit starken Säuren und Oxidationsmitteln möglich.",
+    "Akute Toxizität: Aufgrund der verfügbaren Daten sind die Kriterien nicht erfüllt.",
+    "Wiederholte Exposition kann zu spröder oder rissiger Haut führen.",
+    "Das Produkt ist biologisch leicht abbaubar, eine Bioakkumulation ist nicht zu erwarten.",
+    "Abfallschlüssel nach Herkunft und Zusammensetzung mit dem Entsorger abstimmen.",
+    "Ungereinigte Verpackungen wie das Produkt behandeln und entsorgen.",
+    "Die Angaben stützen sich auf den heutigen Stand unserer Kenntnisse.",
+    "Sie stellen jedoch keine Zusicherung von Produkteigenschaften dar.",
+]
+
+_NAME_PREFIXES = ["Aqua", "Ultra", "Multi", "Rapid", "Primo", "Solid", "Flex", "Nova"]
+_NAME_BASES = ["Verdünnung", "Klarlack", "Grundierung", "Härter", "Füller", "Spachtel", "Entfetter", "Decklack"]
+_MANUFACTURERS = ["Muster Chemie GmbH", "Beispiel Lacke AG", "Nordwerk Industrie GmbH", "Südlack KG"]
+
+
+def _pdf_string(line: str) -> bytes:
+    escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return escaped.encode("cp1252", errors="replace")
+
+
+def write_pdf(path: str, pages: list):
+    """
+    Write a minimal PDF with one text line per entry, in Helvetica with WinAnsi
+    encoding so German umlauts survive extraction. Page contents are deflated like
+    in PDFs from real authoring tools.
+
+    :param path: output file
+    :param pages: list of pages, each a list of lines
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, needs the page object numbers
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    kids = []
+    for lines in pages:
+        content = b"BT /F1 9 Tf 40 800 Td 12.5 TL\n"
+        content += b"".join(b"(" + _pdf_string(line) + b") Tj T*\n" for line in lines)
+        content += b"ET"
+        data = zlib.compress(content)
+        objects.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(data) + data + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def random_product(rng: random.Random, vendor: str) -> dict:
+    """
+    Random product for one SDS of vendor, together with the fields the vendor's parser
+    reads from the generated PDF.
+
+    :return: {"vendor", "name", "manufacturer", "h_codes", "ghs", "un", "date", "show_ghs", "toc", "expected"}
+    """
+    h_codes = sorted(set(rng.choice(_H_SETS)))
+    ghs = sorted({g for h in h_codes for g in H_TO_GHS.get(h, [])})
+    date = f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{rng.randint(2015, 2025)}"
+    # Lechler SDS are paints and always list a UN number, the others are sometimes not dangerous goods
+    un = rng.choice(_UN_NUMBERS) if vendor == "Lechler" or rng.random() < 0.8 else None
+    # BASF and Lechler derive missing pictograms from the H-statements, the others do not
+    show_ghs = vendor in ("Default", "3M") or rng.random() < 0.7
+    # Some SDS open with a table of contents, which repeats every section header
+    toc = rng.random() < 0.3
+    number = rng.randint(10, 99)
+
+    if vendor == "3M":
+        name = f"{rng.choice(_NAME_PREFIXES)} {rng.choice(['Heavy Duty Cleaner', 'Remover', 'Glass Cleaner'])}"
+        manufacturer = "3M Deutschland GmbH"
+        un_expected = f"UN{un}" if un else "Not classified"
+    elif vendor == "BASF":
+        name = f"Glasurit {rng.choice(_NAME_BASES)} {number}"
+        manufacturer = "BASF Coatings GmbH"
+        un_expected = f"UN{un}" if un else None
+    elif vendor == "Lechler":
+        name = f"{rng.choice(_NAME_PREFIXES).upper()} {rng.choice(_NAME_BASES).upper()} {number}"
+        manufacturer = "Lechler Coatings GmbH"
+        un_expected = f"UN{un}"
+    else:
+        name = f"{rng.choice(_NAME_PREFIXES)} {rng.choice(_NAME_BASES)} {number}"
+        manufacturer = rng.choice(_MANUFACTURERS)
+        un_expected = f"UN{un}" if un else None
+
+    return {
+        "vendor": vendor,
+        "name": name,
+        "manufacturer": manufacturer,
+        "h_codes": h_codes,
+        "ghs": ghs,
+        "un": un,
+        "date": date,
+        "show_ghs": show_ghs,
+        "toc": toc,
+        "expected": {
+            "handelsname": name,
+            "manufacturer": manufacturer,
+            "h_statements": h_codes,
+            "un_number": un_expected,
+            "pictograms": ghs,
+            "sds_date": date,
+        },
+    }
+
+
+def _header_lines(product: dict) -> list:
+    vendor = product["vendor"]
+    if vendor == "3M":
+        return [f"{product['name']}  ____", f"Überarbeitet am: {product['date']}  Ersetzt: Erstausgabe"]
+    if vendor == "BASF":
+        return ["Sicherheitsdatenblatt gemäß Verordnung (EG) Nr. 1907/2006",
+                f"Datum der letzten Ausgabe: {product['date']}"]
+    if vendor == "Lechler":
+        return [f"Sicherheitsdatenblatt vom {product['date']}", "Lechler SpA"]
+    return ["Sicherheitsdatenblatt gemäß Verordnung (EG) Nr. 1907/2006",
+            f"Überarbeitet am: {product['date']}  Version: 2.0"]
+
+
+def _toc_lines() -> list:
+    return ["Inhaltsverzeichnis"] + [f"ABSCHNITT {n}: {title}" for n, title in _SECTION_TITLES.items()]
+
+
+def _section1_lines(product: dict) -> list:
+    vendor = product["vendor"]
+    lines = ["1.1 Produktidentifikator"]
+    if vendor == "3M":
+        lines += [f"Produktname: {product['name']}", "1.3 Einzelheiten zum Lieferanten, der das Sicherheitsdatenblatt bereitstellt",
+                  f"Anschrift: {product['manufacturer']}, Carl-Schurz-Straße 1, Neuss"]
+    elif vendor == "BASF":
+        lines += [f"Handelsname: {product['name']}", "1.3 Einzelheiten zum Lieferanten, der das Sicherheitsdatenblatt bereitstellt",
+                  f"Firma: {product['manufacturer']}", "Glasuritstraße 1, Münster"]
+    elif vendor == "Lechler":
+        lines += [f"Handelsname: {product['name']}", "1.3 Einzelheiten zum Lieferanten, der das Sicherheitsdatenblatt bereitstellt",
+                  "Hersteller: Lechler SpA, Via Cecilio, Como, Italien"]
+    else:
+        lines += [f"Handelsname: {product['name']}", "1.3 Einzelheiten zum Lieferanten, der das Sicherheitsdatenblatt bereitstellt",
+                  f"Hersteller/Lieferant: {product['manufacturer']}", "Industriestraße 5, Musterstadt"]
+    lines.append("1.4 Notrufnummer: Giftnotruf Berlin")
+    return lines
+
+
+def _section2_lines(product: dict) -> list:
+    lines = ["2.1 Einstufung des Stoffs oder Gemischs"]
+    for h in product["h_codes"]:
+        if h in H_CLASSES:
+            lines.append(f"{H_CLASSES[h]}, {h}")
+    lines.append("2.2 Kennzeichnungselemente")
+    if product["show_ghs"]:
+        lines.append(f"Gefahrenpiktogramme: {', '.join(product['ghs'])}")
+    lines.append("Signalwort: Gefahr" if product["ghs"] else "Signalwort: Achtung")
+    lines.append("Gefahrenhinweise:")
+    lines += [f"{h} {H_STATEMENT_TEXTS[h]}" for h in product["h_codes"]]
+    lines.append("Sicherheitshinweise:")
+    lines += ["P210 Von Hitze, heißen Oberflächen, Funken und offenen Flammen fernhalten.",
+              "P280 Schutzhandschuhe und Augenschutz tragen."]
+    return lines
+
+
+def _section14_lines(product: dict) -> list:
+    if product["un"] is None:
+        if product["vendor"] == "3M":
+            return ["Kein Gefahrgut im Sinne der Transportvorschriften."]
+        return ["Das Produkt unterliegt nicht den Transportvorschriften."]
+    if product["vendor"] == "Lechler":
+        return [f"14.1 UN-Nummer oder ID-Nummer: {product['un']}", "14.2 Ordnungsgemäße Versandbezeichnung: Farbe"]
+    return [f"14.1 UN-Nummer: UN {product['un']}", "14.2 Ordnungsgemäße Versandbezeichnung: Farbe"]
+
+
+def sds_pages(product: dict, pages: int, rng: random.Random) -> list:
+    """
+    Lines of a German SDS with ABSCHNITT 1-16 in the layout of product["vendor"],
+    padded with filler text in the other sections to the given number of pages, and
+    a table of contents after the header if product["toc"] is set.
+
+    :return: list of pages, each a list of lines
+    """
+    body = {1: _section1_lines(product), 2: _section2_lines(product), 14: _section14_lines(product)}
+    filler_sections = [n for n in _SECTION_TITLES if n not in body]
+    for n in filler_sections:
+        body[n] = [rng.choice(_FILLER) for _ in range(2)]
+
+    head = _header_lines(product) + (_toc_lines() if product["toc"] else [])
+
+    def line_count():
+        return len(head) + sum(len(lines) + 1 for lines in body.values())
+
+    # Leave one line per page for the footer
+    target = pages * (LINES_PER_PAGE - 1)
+    i = 0
+    while line_count() < target:
+        body[filler_sections[i % len(filler_sections)]].append(rng.choice(_FILLER))
+        i += 1
+
+    lines = list(head)
+    for n in sorted(body):
+        lines.append(f"ABSCHNITT {n}: {_SECTION_TITLES[n]}")
+        lines += body[n]
+
+    per_page = LINES_PER_PAGE - 1
+    chunks = [lines[i:i + per_page] for i in range(0, len(lines), per_page)]
+    return [chunk + [f"Seite {i} von {len(chunks)}"] for i, chunk in enumerate(chunks, 1)]
+
+
+def generate_corpus(root: str, files: int, pages: int = 8, vendors: list | None = None,
+                    files_per_folder: int = 1, seed: int = 0) -> dict:
+    """
+    Write a synthetic corpus of SDS PDFs laid out like a Kataster folder tree,
+    root/<vendor>/<product folder>/<file>.pdf, and its ground truth to root/corpus.json.
+
+    Vendors take turns, so every vendor layout is in the corpus from four files on.
+    The same arguments always produce the same corpus.
+
+    :param root: output folder, created if needed
+    :param files: number of PDFs
+    :param pages: pages per PDF
+    :param vendors: vendor layouts to use, defaults to CORPUS_VENDORS
+    :param files_per_folder: PDFs per product folder (language or version variants of one product)
+    :param seed: random seed
+    :return: the ground truth as written to corpus.json
+    """
+    rng = random.Random(seed)
+    vendors = vendors or CORPUS_VENDORS
+    index = {"version": CORPUS_VERSION, "seed": seed, "pages": pages, "files": {}}
+
+    product = None
+    for i in range(files):
+        vendor = vendors[(i // files_per_folder) % len(vendors)]
+        if i % files_per_folder == 0:
+            product = random_product(rng, vendor)
+            folder = os.path.join(root, vendor, f"Produkt {i // files_per_folder + 1:05d}")
+            os.makedirs(folder, exist_ok=True)
+
+        rel_path = os.path.join(vendor, os.path.basename(folder), f"sdb_{i % files_per_folder + 1}.pdf")
+        write_pdf(os.path.join(root, rel_path), sds_pages(product, pages, rng))
+        index["files"][rel_path.replace(os.sep, "/")] = {"vendor": vendor, "expected": product["expected"]}
+
+    with open(os.path.join(root, CORPUS_INDEX), "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=1)
+    return index
+
+
+def load_corpus_index(root: str) -> dict | None:
+    """Ground truth of a corpus written by generate_corpus(), or None for other folders."""
+    path = os.path.join(root, CORPUS_INDEX)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        index = json.load(f)
+    return index if index.get("version") == CORPUS_VERSION else None
@@ -0,0 +1,111 @@
+import fnmatch
+import os
+
+
+def _matches(patterns: list, name: str, rel_path: str) -> bool:
+    """True if a glob in patterns matches the entry's name or its path relative to the root, ignoring case."""
+    name = name.lower()
+    rel_path = rel_path.lower()
+    return any(fnmatch.fnmatchcase(name, p) or fnmatch.fnmatchcase(rel_path, p) for p in patterns)
+
+
+def _scan_dir(path: str, rel_path: str, include: list, exclude: list):
+    """
+    List path once: (sorted subfolder entries, sorted PDF entries).
+
+    Uses the type information os.scandir() already returned for each entry, so
+    nothing is stat'd again (on Windows and SMB shares not even the files).
+    """
+    subdirs = []
+    pdfs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            entry_rel = f"{rel_path}/{entry.name}" if rel_path else entry.name
+            if exclude and _matches(exclude, entry.name, entry_rel):
+                continue
+            try:
+                if entry.is_dir():
+                    subdirs.append(entry)
+                elif entry.name.lower().endswith(".pdf") and entry.is_file():
+                    if not include or _matches(include, entry.name, entry_rel):
+                        pdfs.append(entry)
+            except OSError:
+                continue  # broken link or entry removed while listing
+    subdirs.sort(key=lambda e: e.name)
+    pdfs.sort(key=lambda e: e.name)
+    return subdirs, pdfs
+
+
+def _rel_path(root: str, folder: str) -> str:
+    rel_path = os.path.relpath(folder, root)
+    return "" if rel_path == "." else rel_path.replace(os.sep, "/")
+
+
+def iter_pdf_folders(root: str, include: list | None = None, exclude: list | None = None):
+    """
+    Walk root once and yield (folder path, [os.DirEntry of its PDFs]) for every folder
+    with PDFs, root included, while walking.
+
+    Every folder is listed exactly once. The order is the one run_cli always used:
+    root, then all subfolders of a folder (sorted by name) before the subfolders of
+    the first of them. Symlinked folders are listed but not descended into, like
+    os.walk() does. Folders that cannot be read are reported and skipped.
+
+    :param root: folder to search
+    :param include: globs a PDF's name or root-relative path (with '/') must match
+                    one of, e.g. ["*_de.pdf"]; all PDFs if empty
+    :param exclude: globs for PDFs and folders to leave out, matched the same way,
+                    e.g. ["Archiv", "*/alt/*"]; an excluded folder is not searched
+    """
+    include = [p.lower() for p in include or []]
+    exclude = [p.lower() for p in exclude or []]
+
+    try:
+        subdirs, pdfs = _scan_dir(root, "", include, exclude)
+    except PermissionError:
+        print(f"Permission denied: {root}")
+        return
+    if pdfs:
+        yield root, pdfs
+
+    # Folders whose subfolders still have to be listed: (path, relative path, subfolder entries)
+    pending = [(root, "", subdirs)]
+    while pending:
+        path, rel_path, subdirs = pending.pop()
+        children = []
+        for entry in subdirs:
+            entry_rel = f"{rel_path}/{entry.name}" if rel_path else entry.name
+            try:
+                child_subdirs, child_pdfs = _scan_dir(entry.path, entry_rel, include, exclude)
+            except PermissionError:
+                print(f"Permission denied: {entry.path}")
+                continue
+            except OSError:
+                continue  # removed while walking
+            if child_pdfs:
+                yield entry.path, child_pdfs
+            if not entry.is_symlink():
+                children.append((entry.path, entry_rel, child_subdirs))
+        # Depth first: the first child's subfolders come next
+        pending.extend(reversed(children))
+
+
+def iter_listed_folders(root: str, folders: list, include: list | None = None, exclude: list | None = None):
+    """
+    Like iter_pdf_folders(), but for the given folders below root only, without their
+    subfolders, in the given order. Folders without PDFs or that are gone are left out.
+
+    :param folders: folder paths as yielded by iter_pdf_folders(root)
+    """
+    include = [p.lower() for p in include or []]
+    exclude = [p.lower() for p in exclude or []]
+    for folder in folders:
+        try:
+            _, pdfs = _scan_dir(folder, _rel_path(root, folder), include, exclude)
+        except PermissionError:
+            print(f"Permission denied: {folder}")
+            continue
+        except OSError:
+            continue  # removed
+        if pdfs:
+            yield folder, pdfs
@@ -0,0 +1,274 @@
+import re
+
+import src.cache
+import src.memory
+import src.profiling
+from src.extractors import DEFAULT_EXTRACTOR, get_extractor
+
+# Header lines are r"\*?\s*ABSCHNITT\s+(\d+):\s*(.*)"; see find_section_headers()
+_ABSCHNITT_RE = re.compile(r"ABSCHNITT\s+(\d+):\s*(.*)", flags=re.I)
+
+# Subsection numbers like "1.3" or "14.1" at the start of a line; see find_subsection_headers()
+_SUBSECTION_RE = re.compile(r"^[ \t]*\*?[ \t]*(\d{1,2})[ \t]*\.[ \t]*(\d{1,2})\b", flags=re.M)
+
+_SPLIT_WORD_RE = re.compile(r"-\n")
+_NEWLINES_RE = re.compile(r"\n+")
+_SPACES_RE = re.compile(r"[ \t]+")
+
+# Sections up to this number are searched from the first page, later ones from the last page
+_FORWARD_SECTION_LIMIT = 8
+
+# A section's text has words; the entries of a table of contents have at most page numbers
+_BODY_RE = re.compile(r"[^\W\d_]")
+
+
+def normalize_text(raw_text: str) -> str:
+    """Clean extracted PDF text. Applied page by page, so it never sees the whole document."""
+    text = _SPLIT_WORD_RE.sub("", raw_text)  # fix split words
+    text = _NEWLINES_RE.sub("\n", text)  # collapse newlines
+    text = _SPACES_RE.sub(" ", text)  # normalize spaces
+    return text.strip()
+
+
+def find_section_headers(text: str) -> list:
+    """
+    [(number, start, end)] of every 'ABSCHNITT n:' header, with the same spans as
+    re.finditer(r"\*?\s*ABSCHNITT\s+(\d+):\s*(.*)", text, flags=re.I).
+
+    That pattern has no literal prefix, so re tries it at every position of the text.
+    Searching for "ABSCHNITT" and extending the start back over the whitespace and
+    optional '*' in front of it gives the same result several times faster.
+    """
+    headers = []
+    prev_end = 0
+    for m in _ABSCHNITT_RE.finditer(text):
+        start = m.start()
+        while start > prev_end and text[start - 1].isspace():
+            start -= 1
+        if start > prev_end and text[start - 1] == "*":
+            start -= 1
+        headers.append((m.group(1), start, m.end()))
+        prev_end = m.end()
+    return headers
+
+
+def find_subsection_headers(text: str) -> list:
+    """
+    [(number, start, end)] of every subsection number at the start of a line, e.g.
+    ("14.1", start of the line, end of "14.1"). The heading's text is not part of the
+    header, since SDS often put the value on the same line ("14.1 UN-Nummer: 1263").
+    """
+    return [(f"{m.group(1)}.{m.group(2)}", m.start(), m.end()) for m in _SUBSECTION_RE.finditer(text)]
+
+
+class SDSDocument:
+    """
+    Lazily extracted SDS PDF.
+
+    Pages are laid out and normalized only when something asks for them, and the
+    positions of 'ABSCHNITT n:' headers are recorded per page as they are seen.
+    section() searches early sections from the first page and late sections (e.g. 14)
+    from the last page, so the middle of a long document, like the toxicology sections
+    11-13, is never extracted for the standard fields. subsection() indexes the
+    subsection numbers of a section once, on first use. Extracted pages are stored in the
+    extraction cache when the document is closed.
+
+    Only the normalized text of a page is kept; backends release the page's layout
+    right after extracting it. If a memory ceiling is configured (src.memory) and a
+    page leaves the process above it, the PDF is closed to drop the parser's
+    document-level caches and reopened for the next page, and MemoryLimitExceeded is
+    raised if that does not bring the process below the ceiling.
+
+    Usage:
+        with SDSDocument(pdf_path) as doc:
+            section2 = doc.section("2")
+
+    :param pdf_path: path to the PDF
+    :param extractor: name of the text extraction backend, see src.extractors
+    """
+
+    def __init__(self, pdf_path: str | None = None, pages: list | None = None, extractor: str = DEFAULT_EXTRACTOR):
+        self.pdf_path = pdf_path
+        self.extractor = extractor
+        self._extractor_cls = get_extractor(extractor)
+        self._backend = None
+        self._texts = {}
+        self._headers = {}
+        self._sections = {}
+        self._subsections = {}
+        self._page_count = None
+        self._cache = None
+        self._new_pages = False
+
+        if pages is not None:
+            for index, text in enumerate(pages):
+                self._store_page(index, text)
+            self._page_count = len(pages)
+        else:
+            self._cache = src.cache.get_active()
+            if self._cache is not None:
+                cached = self._cache.get_pages(pdf_path, self.cache_options)
+                if cached is not None:
+                    self._page_count = cached["page_count"]
+                    for index, text in cached["pages"].items():
+                        self._store_page(int(index), text)
+
+    @classmethod
+    def from_text(cls, text: str) -> "SDSDocument":
+        """Wrap already extracted and normalized text as a single-page document."""
+        return cls(pages=[text])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    @property
+    def cache_options(self) -> dict:
+        return self._extractor_cls.cache_options()
+
+    def close(self):
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
+        if self._cache is not None and self._new_pages:
+            self._cache.put_pages(self.pdf_path, self.cache_options, self._page_count, self._texts)
+            self._new_pages = False
+
+    def _open(self):
+        if self._backend is None:
+            self._backend = self._extractor_cls(self.pdf_path)
+        return self._backend
+
+    def _store_page(self, index: int, text: str):
+        self._texts[index] = text
+        self._headers[index] = find_section_headers(text)
+
+    @property
+    def page_count(self) -> int:
+        if self._page_count is None:
+            self._page_count = self._open().page_count
+        return self._page_count
+
+    def page(self, index: int) -> str:
+        """Normalized text of one page (0-based), extracted on first access."""
+        if index not in self._texts:
+            with src.profiling.stage("extract", self.pdf_path):
+                raw = self._open().extract_page(index)
+                self._store_page(index, normalize_text(raw))
+                del raw
+                if src.memory.over_limit():
+                    self._backend.close()
+                    self._backend = None
+                    src.memory.check(self.pdf_path)
+            self._new_pages = True
+        return self._texts[index]
+
+    @property
+    def text(self) -> str:
+        """Normalized text of the whole document. Extracts every page."""
+        return "\n".join(t for t in (self.page(i) for i in range(self.page_count)) if t)
+
+    def search(self, pattern, flags=0):
+        """re.search page by page, extracting only up to the first page with a match."""
+        regex = re.compile(pattern, flags) if isinstance(pattern, str) else pattern
+        for index in range(self.page_count):
+            match = regex.search(self.page(index))
+            if match:
+                return match
+        return None
+
+    def _has_body(self, index: int, offset: int) -> bool:
+        """True if the text from offset on page index up to the next section header has words."""
+        while index < self.page_count:
+            text = self.page(index)
+            following = [h[1] for h in self._headers[index] if h[1] >= offset]
+            end = following[0] if following else len(text)
+            if _BODY_RE.search(text, offset, end):
+                return True
+            if following:
+                return False
+            index += 1
+            offset = 0
+        return False
+
+    def _find_header(self, num: str):
+        """
+        (page index, offset after the header line) of section num, or None.
+
+        If the header occurs more than once, the last occurrence is the section, like
+        when the whole text is split at every header. Scanning forward, that is the
+        first occurrence with text of its own: the earlier ones are entries of a table
+        of contents. If none has text, the last one seen is used.
+        """
+        target = int(num)
+        forward = target <= _FORWARD_SECTION_LIMIT
+        order = range(self.page_count) if forward else range(self.page_count - 1, -1, -1)
+        empty = None
+
+        for index in order:
+            self.page(index)
+            headers = self._headers[index]
+            hits = [h for h in headers if h[0] == num]
+            if hits and not forward:
+                return index, hits[-1][2]
+            for hit in hits:
+                if self._has_body(index, hit[2]):
+                    return index, hit[2]
+                empty = index, hit[2]
+            # Sections are ordered, so once a later (forward) or earlier (backward)
+            # section shows up, the one we are looking for does not exist
+            if empty is None and any((int(h[0]) > target) if forward else (int(h[0]) < target) for h in headers):
+                return None
+        return empty
+
+    def section(self, num: str) -> str | None:
+        """
+        Text of section 'ABSCHNITT num:' up to the next section header, or None.
+
+        :param num: section number as string, e.g. "14"
+        """
+        if num in self._sections:
+            return self._sections[num]
+
+        found = self._find_header(num)
+        if found is None:
+            self._sections[num] = None
+            return None
+
+        index, offset = found
+        parts = []
+        while index < self.page_count:
+            text = self.page(index)
+            following = [h for h in self._headers[index] if h[1] >= offset]
+            if following:
+                parts.append(text[offset:following[0][1]])
+                break
+            parts.append(text[offset:])
+            index += 1
+            offset = 0
+
+        section = "\n".join(parts).strip()
+        self._sections[num] = section
+        return section
+
+    def subsection(self, num: str) -> str | None:
+        """
+        Text of subsection num after its number, up to the next subsection or the end
+        of its section, or None. Only the section the subsection belongs to is searched.
+
+        :param num: subsection number as string, e.g. "14.1"
+        """
+        major = num.split(".")[0]
+        if major not in self._subsections:
+            index = {}
+            section = self.section(major)
+            if section is not None:
+                headers = [h for h in find_subsection_headers(section) if h[0].split(".")[0] == major]
+                for i, (sub, _, end) in enumerate(headers):
+                    following = headers[i + 1][1] if i + 1 < len(headers) else len(section)
+                    index.setdefault(sub, section[end:following].strip())
+            self._subsections[major] = index
+        return self._subsections[major].get(num)
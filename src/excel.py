@@ -1,52 +1,345 @@
-from openpyxl import Workbook, load_workbook
 import os
 
+import src.profiling
+from src.hazards import encode_h
 
-def open_and_write_excel(filepath: str, row_data: list, sheet_name="Gefahrstoffkataster", insert_row: int | None = None):
+# openpyxl is imported where a workbook is opened, so CLI startup and CSV/JSON output do not pay for it
+
+# Column titles of the Kataster, one per value of convert_data_to_list()
+HEADER = [
+    "Produktname / Handelsname",
+    "Hersteller",
+    "UN-Nr.",
+    "Gefahren (H-Sätze)",
+    "Piktogramme",
+    "Lagerort",
+    "Menge im Lager",
+    "Besonderheiten",
+    "SDS",
+    "Stand",
+]
+
+# Columns filled from the SDS (1-based); the others (Lagerort, Menge im Lager,
+# Besonderheiten, SDS Path) are maintained by hand and never overwritten by updates
+PARSED_COLUMNS = (1, 2, 3, 4, 5, 10)
+NOTES_COLUMN = 8
+
+# What ExcelWriter does with a row whose duplicate_key() is already in the sheet
+DUPLICATE_POLICIES = ["skip", "update", "append"]
+
+
+def duplicate_key(row_data) -> tuple:
+    """(Handelsname, Hersteller, H-set bitset) of a row, ignoring case and whitespace."""
+    def norm(value):
+        return " ".join(str(value or "").split()).casefold()
+
+    h_set = encode_h(h.strip().upper() for h in str(row_data[3] or "").split(",") if h.strip())
+    return norm(row_data[0]), norm(row_data[1]), h_set
+
+
+class KatasterIndex:
+    """
+    Rows of the Kataster by duplicate_key(), for constant-time duplicate checks.
+
+    Use from_workbook() to build it in one streaming pass in openpyxl's read-only
+    mode, which is much faster than loading the workbook for writing.
+    """
+
+    def __init__(self):
+        self._rows = {}
+
+    @classmethod
+    def from_rows(cls, rows) -> "KatasterIndex":
+        """Index of rows as yielded by iter_rows(min_row=2, values_only=True)."""
+        index = cls()
+        for row, values in enumerate(rows, start=2):
+            if len(values) >= 4 and (values[0] or values[1]):
+                index.add(values, row)
+        return index
+
+    @classmethod
+    def from_workbook(cls, filepath: str, sheet_name="Gefahrstoffkataster") -> "KatasterIndex":
+        if not os.path.exists(filepath):
+            return cls()
+        from openpyxl import load_workbook
+
+        wb = load_workbook(filepath, read_only=True)
+        try:
+            if sheet_name not in wb.sheetnames:
+                return cls()
+            return cls.from_rows(wb[sheet_name].iter_rows(min_row=2, max_col=4, values_only=True))
+        finally:
+            wb.close()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def find(self, row_data) -> int | None:
+        """Row number of the first row with the same duplicate_key(), or None."""
+        return self._rows.get(duplicate_key(row_data))
+
+    def add(self, row_data, row: int):
+        self._rows.setdefault(duplicate_key(row_data), row)
+
+    def discard(self, row_data, row: int):
+        key = duplicate_key(row_data)
+        if self._rows.get(key) == row:
+            del self._rows[key]
+
+    def shift(self, start: int, count: int = 1):
+        """Move rows at or below start down by count, after a block of count rows was inserted at start."""
+        for key, row in self._rows.items():
+            if row >= start:
+                self._rows[key] = row + count
+
+
+class ExcelWriter:
+    """
+    Write many rows into an Excel file with a single load and save.
+    Creates the file (with header row) on the first written row if it does not exist.
+
+    Usage:
+        with ExcelWriter(filepath) as writer:
+            writer.write_row(row_data)
+
+    :param filepath: path to the .xlsx file
+    :param sheet_name: name of the sheet
+    :param insert_row: if given, insert the rows at this row (1-based index), in the
+                       order they are written. If None, append at the end.
+                       Inserted rows are collected and placed as one block on flush(),
+                       so the rows below are shifted once instead of once per row.
+    :param flush_every: if given, save the workbook after every N written rows
+    :param duplicates: one of DUPLICATE_POLICIES for rows already in the sheet (checked
+                       with a KatasterIndex): skip them, update the existing row, or append anyway
+    :param on_insert: called with the row number after a row was inserted at insert_row,
+                      for callers that keep row numbers of their own
+    """
+
+    def __init__(self, filepath: str, sheet_name="Gefahrstoffkataster", insert_row: int | None = None,
+                 flush_every: int | None = None, duplicates: str = "skip", on_insert=None):
+        if duplicates not in DUPLICATE_POLICIES:
+            raise ValueError(f"Unknown duplicate policy '{duplicates}', expected one of: {', '.join(DUPLICATE_POLICIES)}")
+        self.filepath = filepath
+        self.sheet_name = sheet_name
+        self.insert_row = insert_row
+        self.flush_every = flush_every
+        self.duplicates = duplicates
+        self.on_insert = on_insert
+        self.rows_written = 0
+        self.duplicates_skipped = []
+        self.duplicates_updated = []
+
+        self._wb = None
+        self._ws = None
+        self._index = None
+        self._unsaved = 0
+        # Rows waiting to be inserted at _insert_at. Row numbers given out and accepted
+        # by the writer already count them, see _locate(). The index keeps sheet rows and
+        # is shifted once per block; duplicate_key() -> offset of the pending rows is kept here
+        self._pending = []
+        self._pending_keys = {}
+        self._insert_at = max(2, insert_row) if insert_row is not None else None  # row 1 is the header
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Rows written before an error are still valid, so keep them
+        self.close()
+        return False
+
+    def _open(self):
+        from openpyxl import Workbook, load_workbook
+
+        if os.path.exists(self.filepath):
+            with src.profiling.stage("excel.load", self.filepath):
+                wb = load_workbook(self.filepath)
+            if self.sheet_name in wb.sheetnames:
+                ws = wb[self.sheet_name]
+            else:
+                ws = wb.create_sheet(self.sheet_name)
+        else:
+            wb = Workbook()
+            ws = wb.active
+            ws.title = self.sheet_name
+            # Write header row on first creation
+            ws.append(HEADER)
+
+        self._wb = wb
+        self._ws = ws
+
+    def _get_index(self) -> KatasterIndex:
+        if self._index is None:
+            with src.profiling.stage("excel.index", self.filepath):
+                if self._wb is None:
+                    self._index = KatasterIndex.from_workbook(self.filepath, self.sheet_name)
+                else:
+                    self._index = KatasterIndex.from_rows(self._ws.iter_rows(min_row=2, max_col=4, values_only=True))
+        return self._index
+
+    def write_row(self, row_data: list) -> int:
+        """
+        Append or insert a single row, or handle it by the duplicate policy if the
+        sheet already has a row with the same Handelsname, Hersteller and H-set.
+
+        :param row_data: list of values to write
+        :return: the row number written, or of the existing duplicate
+        """
+        with src.profiling.stage("excel.write"):
+            return self._write_row(row_data)
+
+    def _find(self, row_data) -> int | None:
+        """Row number of the first row with the same duplicate_key(), counting pending rows."""
+        row = self._get_index().find(row_data)
+        if row is not None:
+            if self._insert_at is not None and row >= self._insert_at:
+                row += len(self._pending)
+            return row
+        offset = self._pending_keys.get(duplicate_key(row_data))
+        return None if offset is None else self._insert_at + offset
+
+    def _write_row(self, row_data: list) -> int:
+        if self.duplicates != "append":
+            existing = self._find(row_data)
+            if existing is not None:
+                if self.duplicates == "skip":
+                    self.duplicates_skipped.append((row_data[0], existing))
+                else:
+                    self.update_row(existing, row_data)
+                    self.duplicates_updated.append((row_data[0], existing))
+                return existing
+
+        if self._wb is None:
+            self._open()
+        ws = self._ws
+
+        if self._insert_at is not None:
+            row = self._insert_at + len(self._pending)
+            if self._index is not None:
+                self._pending_keys.setdefault(duplicate_key(row_data), len(self._pending))
+            self._pending.append(list(row_data))
+            if self.on_insert is not None:
+                self.on_insert(row)
+        else:
+            ws.append(row_data)
+            row = ws.max_row
+            if self._index is not None:
+                self._index.add(row_data, row)
+        self.rows_written += 1
+        self._changed()
+        return row
+
+    def _locate(self, row: int):
+        """(pending row list, None) if row is waiting to be inserted, else (None, sheet row)."""
+        if self._insert_at is None or row < self._insert_at:
+            return None, row
+        offset = row - self._insert_at
+        if offset < len(self._pending):
+            return self._pending[offset], None
+        return None, row - len(self._pending)
+
+    def cell_value(self, row: int, column: int):
+        if self._wb is None:
+            self._open()
+        pending, sheet_row = self._locate(row)
+        if pending is not None:
+            return pending[column - 1] if column <= len(pending) else None
+        return self._ws.cell(row=sheet_row, column=column).value
+
+    def _set_value(self, row: int, column: int, value):
+        pending, sheet_row = self._locate(row)
+        if pending is not None:
+            pending.extend([None] * (column - len(pending)))
+            pending[column - 1] = value
+        else:
+            self._ws.cell(row=sheet_row, column=column, value=value)
+
+    def update_row(self, row: int, row_data: list):
+        """
+        Overwrite the SDS columns (PARSED_COLUMNS) of an existing row in place.
+
+        :param row: 1-based row number
+        :param row_data: full row as returned by convert_data_to_list
+        """
+        if self._wb is None:
+            self._open()
+        if self._index is not None:
+            old = [self.cell_value(row, c) for c in range(1, 5)]
+            pending, sheet_row = self._locate(row)
+            if pending is not None:
+                offset = row - self._insert_at
+                if self._pending_keys.get(duplicate_key(old)) == offset:
+                    del self._pending_keys[duplicate_key(old)]
+                self._pending_keys.setdefault(duplicate_key(row_data), offset)
+            else:
+                self._index.discard(old, sheet_row)
+                self._index.add(row_data, sheet_row)
+        for col_idx in PARSED_COLUMNS:
+            self._set_value(row, col_idx, row_data[col_idx - 1])
+        self._changed()
+
+    def mark_row(self, row: int, note: str):
+        """Add note to the Besonderheiten column of row, unless it is already there."""
+        current = str(self.cell_value(row, NOTES_COLUMN) or "")
+        if note in current:
+            return
+        self._set_value(row, NOTES_COLUMN, f"{current}; {note}" if current else note)
+        self._changed()
+
+    def _insert_pending(self):
+        """Shift the rows below _insert_at once and write the collected rows in order."""
+        if not self._pending:
+            return
+        ws = self._ws
+        ws.insert_rows(self._insert_at, amount=len(self._pending))
+        for offset, row_data in enumerate(self._pending):
+            for col_idx, value in enumerate(row_data, start=1):
+                ws.cell(row=self._insert_at + offset, column=col_idx, value=value)
+        if self._index is not None:
+            self._index.shift(self._insert_at, len(self._pending))
+            for offset in self._pending_keys.values():
+                self._index.add(self._pending[offset], self._insert_at + offset)
+            self._pending_keys = {}
+        # Later rows go below this block, so the order of all written rows is kept
+        self._insert_at += len(self._pending)
+        self._pending = []
+
+    def _changed(self):
+        self._unsaved += 1
+        if self.flush_every and self._unsaved >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Save all rows written so far."""
+        if self._wb is not None and self._unsaved:
+            with src.profiling.stage("excel.save", self.filepath):
+                self._insert_pending()
+                self._wb.save(self.filepath)
+            self._unsaved = 0
+
+    def close(self):
+        """Save pending rows and release the workbook."""
+        self.flush()
+        self._wb = None
+        self._ws = None
+
+
+def open_and_write_excel(filepath: str, row_data: list, sheet_name="Gefahrstoffkataster", insert_row: int | None = None,
+                         duplicates: str = "skip"):
     """
     Append or insert a row into an Excel file. Creates file if it does not exist.
 
+    Loads and saves the whole workbook, so use ExcelWriter when writing more than one row.
+
     :param filepath: path to the .xlsx file
     :param row_data: list of values to write
     :param sheet_name: name of the sheet
     :param insert_row: if given, insert at this row (1-based index).
                        If None, append at the end.
+    :param duplicates: one of DUPLICATE_POLICIES
     """
-
-    if os.path.exists(filepath):
-        wb = load_workbook(filepath)
-        if sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-        else:
-            ws = wb.create_sheet(sheet_name)
-    else:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = sheet_name
-        # Write header row on first creation
-        ws.append([
-            "Produktname / Handelsname",
-            "Hersteller",
-            "UN-Nr.",
-            "Gefahren (H-Sätze)",
-            "Piktogramme",
-            "Lagerort",
-            "Menge im Lager",
-            "Besonderheiten",
-            "SDS"
-            "Stand"
-        ])
-
-    if insert_row is not None:
-        # Ensure at least 1 (headers are row 1)
-        insert_row = max(2, insert_row)
-        ws.insert_rows(insert_row)
-        for col_idx, value in enumerate(row_data, start=1):
-            ws.cell(row=insert_row, column=col_idx, value=value)
-    else:
-        ws.append(row_data)
-
-    wb.save(filepath)
+    with ExcelWriter(filepath, sheet_name=sheet_name, insert_row=insert_row, duplicates=duplicates) as writer:
+        writer.write_row(row_data)
 
 
 def convert_data_to_list(data: dict) -> list:
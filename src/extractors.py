@@ -0,0 +1,175 @@
+_versions = {}
+
+
+class Extractor:
+    """
+    Base class for text extraction backends used by SDSDocument.
+
+    A backend opens the PDF once and returns the raw text of single pages on request.
+    pdfplumber's layout mode is the reference the parsers were written against; the
+    other backends trade layout fidelity for speed. `python -m src.benchmark` shows how
+    well a backend's output still parses.
+
+    :param pdf_path: path to the PDF
+    """
+
+    name = ""
+    package = ""
+
+    def __init__(self, pdf_path: str):
+        self.pdf_path = pdf_path
+
+    @classmethod
+    def cache_options(cls) -> dict:
+        """Everything that changes the extracted text; part of the extraction cache key."""
+        if cls.package not in _versions:
+            # Imported here: importlib.metadata alone adds noticeably to CLI startup
+            from importlib import metadata
+
+            try:
+                _versions[cls.package] = metadata.version(cls.package)
+            except metadata.PackageNotFoundError:
+                # Frozen builds may not ship the package metadata
+                _versions[cls.package] = "unknown"
+        return {"extractor": cls.name, "version": _versions[cls.package]}
+
+    @property
+    def page_count(self) -> int:
+        raise NotImplementedError
+
+    def extract_page(self, index: int) -> str:
+        """Raw text of one page (0-based)."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PdfplumberLayoutExtractor(Extractor):
+    """pdfplumber with layout=True. Slowest, but keeps the column layout of the page."""
+
+    name = "pdfplumber-layout"
+    package = "pdfplumber"
+    layout = True
+
+    def __init__(self, pdf_path: str):
+        super().__init__(pdf_path)
+        import pdfplumber
+        self._pdf = pdfplumber.open(pdf_path)
+
+    @classmethod
+    def cache_options(cls) -> dict:
+        return {**super().cache_options(), "layout": cls.layout}
+
+    @property
+    def page_count(self) -> int:
+        return len(self._pdf.pages)
+
+    def extract_page(self, index: int) -> str:
+        page = self._pdf.pages[index]
+        try:
+            return page.extract_text(layout=self.layout) or ""
+        finally:
+            # Drop the page's characters and layout, pdfplumber keeps them until the PDF is closed
+            page.close()
+
+    def close(self):
+        self._pdf.close()
+
+
+class PdfplumberTextExtractor(PdfplumberLayoutExtractor):
+    """pdfplumber's plain extract_text(): same character grouping, no padding to page width."""
+
+    name = "pdfplumber"
+    layout = False
+
+
+class PdfminerExtractor(Extractor):
+    """pdfminer.six layout analysis with LAParams tuned for single-column SDS pages."""
+
+    name = "pdfminer"
+    package = "pdfminer.six"
+
+    # boxes_flow=None skips the costly reading-order analysis between text boxes
+    LAPARAMS = {"line_overlap": 0.5, "char_margin": 2.0, "line_margin": 0.5, "word_margin": 0.1, "boxes_flow": None}
+
+    def __init__(self, pdf_path: str):
+        super().__init__(pdf_path)
+        from pdfminer.converter import PDFPageAggregator
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfparser import PDFParser
+
+        self._file = open(pdf_path, "rb")
+        try:
+            document = PDFDocument(PDFParser(self._file))
+            self._pages = list(PDFPage.create_pages(document))
+        except Exception:
+            self._file.close()
+            raise
+        resources = PDFResourceManager()
+        self._device = PDFPageAggregator(resources, laparams=LAParams(**self.LAPARAMS))
+        self._interpreter = PDFPageInterpreter(resources, self._device)
+
+    @classmethod
+    def cache_options(cls) -> dict:
+        return {**super().cache_options(), "laparams": cls.LAPARAMS}
+
+    @property
+    def page_count(self) -> int:
+        return len(self._pages)
+
+    def extract_page(self, index: int) -> str:
+        from pdfminer.layout import LTTextBox
+
+        self._interpreter.process_page(self._pages[index])
+        layout = self._device.get_result()
+        return "".join(obj.get_text() for obj in layout if isinstance(obj, LTTextBox))
+
+    def close(self):
+        self._file.close()
+
+
+class PdfiumExtractor(Extractor):
+    """pypdfium2 (PDFium) text extraction. Fastest; reading order follows the content stream."""
+
+    name = "pypdfium2"
+    package = "pypdfium2"
+
+    def __init__(self, pdf_path: str):
+        super().__init__(pdf_path)
+        import pypdfium2
+        self._pdf = pypdfium2.PdfDocument(pdf_path)
+
+    @property
+    def page_count(self) -> int:
+        return len(self._pdf)
+
+    def extract_page(self, index: int) -> str:
+        page = self._pdf[index]
+        textpage = page.get_textpage()
+        try:
+            return textpage.get_text_range().replace("\r\n", "\n")
+        finally:
+            textpage.close()
+            page.close()
+
+    def close(self):
+        self._pdf.close()
+
+
+EXTRACTORS = {
+    cls.name: cls
+    for cls in (PdfplumberLayoutExtractor, PdfplumberTextExtractor, PdfminerExtractor, PdfiumExtractor)
+}
+
+DEFAULT_EXTRACTOR = PdfplumberLayoutExtractor.name
+
+
+def get_extractor(name: str) -> type[Extractor]:
+    try:
+        return EXTRACTORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown extractor '{name}', expected one of: {', '.join(EXTRACTORS)}")
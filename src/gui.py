@@ -1,131 +1,219 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 import base64
+import os
+import queue
 from io import BytesIO
 from PIL import Image, ImageTk
 from typing import cast
 from tkinter import PhotoImage as TkPhotoImage
 
+import src.cache
 import src.pdf
-from src.excel import open_and_write_excel
+from src.extractors import DEFAULT_EXTRACTOR, EXTRACTORS
+from src.excel import ExcelWriter, convert_data_to_list
+from src.hazards import encode_ghs, encode_h
 import src.image
 
 
-class RowWidget:
-    def __init__(self, parent, row_index, all_rows, app_ref):
-        self.parent = parent
-        self.row_index = row_index
-        self.all_rows = all_rows
-        self.app_ref = app_ref  # <-- reference to App, to access parse mode
-
-        self.data = {
-            "handelsname": "",
-            "manufacturer": "",
-            "h_statements": [],
-            "un_number": "",
-            "pictograms": [],
-            "sds_date": "",
-        }
-
-        self.frame = tk.Frame(parent, padx=6, pady=4, borderwidth=1, relief="groove")
-        tk.Label(self.frame, text=f"Zeile {row_index + 1}:").grid(row=0, column=0, padx=(2, 8), sticky="w")
-
-        tk.Label(self.frame, text="Handelsname:").grid(row=0, column=1, sticky="e")
-        self.handelsname_var = tk.StringVar()
-        self.handelsname_entry = tk.Entry(self.frame, textvariable=self.handelsname_var, width=40, state="disabled")
-        self.handelsname_entry.grid(row=0, column=2, padx=6, sticky="we")
-
-        self.load_btn = tk.Button(self.frame, text="PDF(s) laden", command=self.load_pdfs)
-        self.load_btn.grid(row=0, column=3, padx=4, sticky="w")
-
-        self.frame.grid_columnconfigure(2, weight=1)
-
-    def grid(self, **kwargs):
-        self.frame.grid(**kwargs)
-
-    def _parse_pdf(self, pdf_path: str) -> dict:
-        """Parse according to selected GUI dropdown mode."""
-        mode = self.app_ref.parse_mode_var.get()
-        if mode == "3M":
-            return src.pdf.parse_sds_3m_format(pdf_path)
-        elif mode == "BASF":
-            return src.pdf.parse_sds_basf_format(pdf_path)
-        elif mode == "Lechler":
-            sds = src.pdf.parse_sds_lechler_format(pdf_path)
-            sds["manufacturer"] = "Lechler Coatings GmbH"
-            return sds
-        elif mode == "Fallback":
-            text = src.pdf.extract_text_chain(pdf_path)
-            return src.pdf.parse_sds_fallback(text)
-        else:  # Default
-            text = src.pdf.extract_text_chain(pdf_path)
-            return src.pdf.parse_sds(text)
-
-    def load_pdfs(self):
-        file_paths = filedialog.askopenfilenames(
-            title="Sicherheitsdatenblatt PDF(s) auswählen",
-            filetypes=[("PDF files", "*.pdf")],
-        )
-        if not file_paths:
+def _empty_data() -> dict:
+    return {
+        "handelsname": "",
+        "manufacturer": "",
+        "h_statements": [],
+        "un_number": "",
+        "pictograms": [],
+        "sds_date": "",
+    }
+
+
+def _row_data(parsed: dict) -> dict:
+    """Row record of one parsed PDF."""
+    return {
+        "handelsname": parsed.get("handelsname") or "",
+        "manufacturer": parsed.get("manufacturer") or "",
+        "h_statements": sorted(parsed.get("h_statements", [])),
+        "un_number": parsed.get("un_number") or "",
+        "pictograms": sorted(parsed.get("pictograms", [])),
+        "sds_date": parsed.get("sds_date") or "",
+    }
+
+
+class RowList(tk.Frame):
+    """
+    The rows to be written, shown in a ttk.Treeview.
+
+    The rows live in `records`, a plain list of {"data": SDS dict, "loaded", "loading"};
+    the Treeview only draws the rows in view, so creating, scrolling and clearing
+    thousands of rows stays fast. Handelsname is edited in place with a single Entry
+    placed over the cell (double click, Enter or F2).
+    """
+
+    COLUMNS = [
+        ("zeile", "Zeile", 50),
+        ("handelsname", "Handelsname", 240),
+        ("manufacturer", "Hersteller", 150),
+        ("un_number", "UN-Nr.", 70),
+        ("h_statements", "H-Sätze", 150),
+        ("pictograms", "Piktogramme", 110),
+        ("sds_date", "Stand", 80),
+    ]
+
+    def __init__(self, parent, height=12, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.records = []
+
+        self.tree = ttk.Treeview(self, columns=[c for c, _, _ in self.COLUMNS], show="headings",
+                                 height=height, selectmode="browse")
+        for column, title, width in self.COLUMNS:
+            self.tree.heading(column, text=title)
+            self.tree.column(column, width=width, stretch=column == "handelsname", anchor="w")
+        self._scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_scroll)
+
+        self.tree.pack(side="left", fill="both", expand=True)
+        self._scrollbar.pack(side="right", fill="y")
+
+        self._editor = None
+        self._editing = None
+        self.tree.bind("<Double-1>", self._on_double_click)
+        self.tree.bind("<Return>", lambda e: self.begin_edit(self.selected_index()))
+        self.tree.bind("<F2>", lambda e: self.begin_edit(self.selected_index()))
+
+    def _values(self, index: int) -> tuple:
+        record = self.records[index]
+        data = record["data"]
+        name = data["handelsname"] or ("wird geladen …" if record["loading"] else "")
+        return (index + 1, name, data["manufacturer"], data["un_number"] or "",
+                ", ".join(data["h_statements"]), ", ".join(data["pictograms"]), data["sds_date"] or "")
+
+    def add(self, data: dict | None = None, loaded: bool = False) -> int:
+        """Append a row and return its index."""
+        index = len(self.records)
+        self.records.append({"data": data or _empty_data(), "loaded": loaded, "loading": False})
+        self.tree.insert("", "end", iid=str(index), values=self._values(index))
+        return index
+
+    def refresh(self, index: int):
+        self.tree.item(str(index), values=self._values(index))
+
+    def select(self, index: int):
+        self.tree.selection_set(str(index))
+        self.tree.focus(str(index))
+        self.tree.see(str(index))
+
+    def selected_index(self) -> int | None:
+        selection = self.tree.selection()
+        return int(selection[0]) if selection else None
+
+    def clear(self):
+        self.end_edit()
+        self.tree.delete(*self.tree.get_children())
+        self.records.clear()
+
+    def _on_scroll(self, first, last):
+        self._scrollbar.set(first, last)
+        if self._editor is not None:
+            self._place_editor()
+
+    def _place_editor(self):
+        """Keep the editor over its cell while the rows scroll; hide it while the cell is out of view."""
+        bbox = self.tree.bbox(str(self._editing), "handelsname")
+        if bbox:
+            x, y, width, height = bbox
+            self._editor.place(x=x, y=y, width=width, height=height)
+        else:
+            self._editor.place_forget()
+
+    def _on_double_click(self, event):
+        if self.tree.identify_region(event.x, event.y) != "cell":
+            return
+        if self.tree.identify_column(event.x) != "#2":  # Handelsname
             return
+        row = self.tree.identify_row(event.y)
+        if row:
+            self.begin_edit(int(row))
 
-        parsed_list = []
-        for pdf_path in file_paths:
-            try:
-                parsed = self._parse_pdf(pdf_path)
-                parsed_list.append(parsed)
-            except Exception as e:
-                messagebox.showerror("Fehler beim Lesen", f"Fehler beim Verarbeiten von:\n{pdf_path}\n\n{e}")
-
-        # Gruppieren nach H-Sätzen + Piktogrammen
-        unique_groups = {}
-        for parsed in parsed_list:
-            key = (tuple(sorted(parsed.get("h_statements", []))),
-                   tuple(sorted(parsed.get("pictograms", []))))
-            if key not in unique_groups:
-                unique_groups[key] = parsed
-
-        rows_to_create = []
-        for parsed in unique_groups.values():
-            data = {
-                "handelsname": parsed.get("handelsname") or "",
-                "manufacturer": parsed.get("manufacturer") or "",
-                "h_statements": sorted(parsed.get("h_statements", [])),
-                "un_number": sorted(parsed.get("un_number", [])),
-                "pictograms": sorted(parsed.get("pictograms", [])),
-                "sds_date": parsed.get("sds_date") or "",
-            }
-            rows_to_create.append(data)
-
-        # Erste Zeile befüllen
-        first = rows_to_create.pop(0)
-        self.data.update(first)
-        self.handelsname_var.set(self.data["handelsname"])
-        self.handelsname_entry.config(state="normal")
-        self.handelsname_entry.focus_set()
-
-        # Weitere Zeilen hinzufügen
-        for data in rows_to_create:
-            new_row = RowWidget(self.parent, len(self.all_rows), self.all_rows, self.app_ref)
-            new_row.data.update(data)
-            new_row.handelsname_var.set(data["handelsname"])
-            new_row.handelsname_entry.config(state="normal")
-            new_row.grid(row=len(self.all_rows), column=0, sticky="we", pady=3)
-            self.all_rows.append(new_row)
+    def begin_edit(self, index: int | None):
+        """Edit the Handelsname of a loaded row in an Entry over its cell."""
+        if index is None or not self.records[index]["loaded"]:
+            return
+        self.end_edit()
+        self.tree.see(str(index))
+        self.tree.update_idletasks()
+
+        self._editing = index
+        self._editor = tk.Entry(self.tree)
+        self._editor.insert(0, self.records[index]["data"]["handelsname"])
+        self._editor.select_range(0, "end")
+        self._place_editor()
+        self._editor.focus_set()
+        self._editor.bind("<Return>", lambda e: self.end_edit())
+        self._editor.bind("<FocusOut>", lambda e: self.end_edit())
+        self._editor.bind("<Escape>", lambda e: self.end_edit(commit=False))
+
+    def end_edit(self, commit: bool = True):
+        if self._editor is None:
+            return
+        editor, index = self._editor, self._editing
+        self._editor = None
+        self._editing = None
+        if commit:
+            self.records[index]["data"]["handelsname"] = editor.get().strip()
+            self.refresh(index)
+        editor.destroy()
+        self.tree.focus_set()
+
+
+class _LoadBatch:
+    """PDFs of one "PDF(s) laden" click, parsed in the background for one row of a RowList."""
+
+    def __init__(self, index: int, file_paths: list, mode: str, executor, futures: list):
+        self.index = index
+        self.file_paths = file_paths
+        self.mode = mode
+        self.executor = executor
+        self.futures = futures
+        self.errors = []  # (PDF path, exception), reported together when the batch is done
+        self.done = {}  # index -> finished future, until it is added to the rows
+        self.next_index = 0
+        # (H-Sätze, Piktogramme) groups seen so far; the first fills the row, the others add rows
+        self.group_keys = set()
 
 
 class App(tk.Tk):
-    def __init__(self, path=None, excel_path=None, insert_row=None):
+    # How often the results of the parser processes are picked up, in ms
+    POLL_INTERVAL = 100
+
+    def __init__(self, path=None, excel_path=None, insert_row=None, extractor=DEFAULT_EXTRACTOR, duplicates="skip",
+                 workers=None, cache_args=(None, True, src.cache.DEFAULT_MAX_MB)):
         super().__init__()
         self.title("SDS → Excel")
         self.geometry("820x460")
 
         self.insert_row = insert_row
+        self.duplicates = duplicates
+
+        # PDFs are parsed in worker processes so the window stays responsive. Finished
+        # futures are put into _results by the pool's thread and picked up on the Tk
+        # thread by _poll_results(), which hands them to the rows in selection order.
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_args = cache_args
+        self._executor = None
+        self._results = queue.Queue()
+        self._batches = []
+        self._poll_id = None
+        self._progress_total = 0
+        self._progress_done = 0
         self.excel_path_var = tk.StringVar(value=excel_path or "")
 
         # parse mode dropdown
-        self.parse_mode_var = tk.StringVar(value="Default")  # Default, Fallback, 3M, BASF, Lechler
+        self.parse_mode_var = tk.StringVar(value="Default")  # Default, Fallback, 3M, BASF, Lechler, Auto
+        # text extraction backend dropdown
+        self.extractor_var = tk.StringVar(value=extractor)
 
         try:
             self.icon = tk.PhotoImage(data=src.image.icon_base64)
@@ -146,27 +234,39 @@ class App(tk.Tk):
 
         # dropdown for parse mode
         tk.Label(top, text="Parser:").pack(side="left", padx=(10, 4))
-        modes = ["Default", "Fallback", "3M", "BASF", "Lechler"]
-        self.mode_dropdown = ttk.Combobox(top, textvariable=self.parse_mode_var, values=modes, state="readonly", width=10)
+        self.mode_dropdown = ttk.Combobox(top, textvariable=self.parse_mode_var, values=src.pdf.PARSE_MODES, state="readonly", width=10)
         self.mode_dropdown.pack(side="left")
 
+        # dropdown for text extraction backend
+        tk.Label(top, text="Extraktor:").pack(side="left", padx=(10, 4))
+        self.extractor_dropdown = ttk.Combobox(top, textvariable=self.extractor_var, values=list(EXTRACTORS), state="readonly", width=16)
+        self.extractor_dropdown.pack(side="left")
+
         mid = tk.Frame(self, padx=10, pady=4)
         mid.pack(fill="both", expand=True)
 
         ctrl_bar = tk.Frame(mid)
         ctrl_bar.pack(fill="x", pady=(0, 6))
         tk.Button(ctrl_bar, text="Zeile hinzufügen", command=self.add_row).pack(side="left")
+        tk.Button(ctrl_bar, text="PDF(s) laden", command=self.load_pdfs).pack(side="left", padx=6)
+        tk.Label(ctrl_bar, text="Doppelklick auf den Handelsnamen zum Bearbeiten").pack(side="left", padx=6)
 
-        self.rows_container = ScrollableFrame(mid)
-        self.rows_container.pack(fill="both", expand=True)
-
-        self.rows = []
+        self.rows = RowList(mid)
+        self.rows.pack(fill="both", expand=True)
 
         bottom = tk.Frame(self, padx=10, pady=10)
         bottom.pack(fill="x")
+        self.progress = ttk.Progressbar(bottom, mode="determinate", length=220)
+        self.progress.pack(side="left")
+        self.progress_label = tk.Label(bottom, text="")
+        self.progress_label.pack(side="left", padx=6)
+        self.cancel_btn = tk.Button(bottom, text="Abbrechen", command=self.cancel_loading, state="disabled")
+        self.cancel_btn.pack(side="left")
         self.submit_btn = tk.Button(bottom, text="Zu Excel hinzufügen", command=self.submit_to_excel)
         self.submit_btn.pack(side="right")
 
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
     def choose_excel(self):
         path = filedialog.askopenfilename(
             title="Excel-Datei auswählen",
@@ -176,23 +276,176 @@ class App(tk.Tk):
             self.excel_path_var.set(path)
 
     def add_row(self):
-        row = RowWidget(self.rows_container.content, len(self.rows), self.rows, self)
-        row.grid(row=len(self.rows), column=0, sticky="we", pady=3)
-        self.rows_container.content.grid_columnconfigure(0, weight=1)
-        self.rows.append(row)
+        self.rows.select(self.rows.add())
+
+    def load_pdfs(self):
+        """Load PDFs into the selected row, or into a new row if none is selected."""
+        index = self.rows.selected_index()
+        if index is not None and self.rows.records[index]["loading"]:
+            messagebox.showwarning("Wird geladen", "Für diese Zeile werden noch PDF(s) geladen.")
+            return
+
+        file_paths = filedialog.askopenfilenames(
+            title="Sicherheitsdatenblatt PDF(s) auswählen",
+            filetypes=[("PDF files", "*.pdf")],
+        )
+        if not file_paths:
+            return
+
+        if index is None:
+            index = self.rows.add()
+            self.rows.select(index)
+        self.rows.records[index]["loading"] = True
+        self.rows.refresh(index)
+        self.parse_in_background(index, list(file_paths))
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=src.cache.configure,
+                                                 initargs=self.cache_args)
+        return self._executor
+
+    def parse_in_background(self, index: int, file_paths: list):
+        """Parse file_paths in the worker processes and fill row index as the results arrive."""
+        mode = self.parse_mode_var.get()
+        extractor = self.extractor_var.get()
+        executor = self._get_executor()
+        futures = [executor.submit(src.pdf.parse_pdf, pdf_path, mode, extractor) for pdf_path in file_paths]
+        batch = _LoadBatch(index, file_paths, mode, executor, futures)
+        self._batches.append(batch)
+        for index, future in enumerate(futures):
+            future.add_done_callback(lambda f, b=batch, i=index: self._results.put((b, i, f)))
+
+        self._progress_total += len(file_paths)
+        self._update_progress()
+        self.cancel_btn.config(state="normal")
+        self.submit_btn.config(state="disabled")
+        if self._poll_id is None:
+            self._poll_id = self.after(self.POLL_INTERVAL, self._poll_results)
+
+    def _poll_results(self):
+        self._poll_id = None
+        while True:
+            try:
+                batch, index, future = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if batch not in self._batches:
+                continue  # cancelled
+            batch.done[index] = future
+            self._progress_done += 1
+
+        for batch in list(self._batches):
+            self._deliver(batch)
+
+        self._update_progress()
+        if self._batches:
+            self._poll_id = self.after(self.POLL_INTERVAL, self._poll_results)
+        else:
+            self._finish_loading()
+
+    def _deliver(self, batch: _LoadBatch):
+        """Add the finished results of batch to the rows, in selection order, up to the first missing one."""
+        while batch.next_index in batch.done and batch in self._batches:
+            future = batch.done.pop(batch.next_index)
+            pdf_path = batch.file_paths[batch.next_index]
+            batch.next_index += 1
+            try:
+                parsed = future.result()
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool) and batch.executor is self._executor:
+                    # A worker died (e.g. out of memory) and the pool fails all its PDFs;
+                    # start a new pool for the next ones
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+                batch.errors.append((pdf_path, e))
+                continue
+            if batch.mode == src.pdf.AUTO_MODE:
+                print(f"[AUTO] {pdf_path}: {parsed['parse_mode']} ({parsed['detect_seconds'] * 1000:.1f} ms)")
+            self._add_parsed(batch, parsed)
+
+        if batch.next_index == len(batch.futures) and batch in self._batches:
+            self._batches.remove(batch)
+            self._finish_row(batch)
+            self._report_errors(batch)
+
+    def _report_errors(self, batch: _LoadBatch, limit: int = 10):
+        """One dialog for all PDFs of batch that could not be read."""
+        if not batch.errors:
+            return
+        lines = [f"{pdf_path}: {e or type(e).__name__}" for pdf_path, e in batch.errors[:limit]]
+        if len(batch.errors) > limit:
+            lines.append(f"… und {len(batch.errors) - limit} weitere")
+        messagebox.showerror("Fehler beim Lesen",
+                             f"{len(batch.errors)} PDF(s) konnten nicht verarbeitet werden:\n\n" + "\n".join(lines))
+
+    def _add_parsed(self, batch: _LoadBatch, parsed: dict):
+        """
+        Add one parsed PDF of batch. PDFs are grouped by H-Sätze and Piktogramme: the
+        first group fills the row the PDFs were loaded for, every further group adds a row.
+        """
+        key = (encode_h(parsed.get("h_statements", [])), encode_ghs(parsed.get("pictograms", [])))
+        if key in batch.group_keys:
+            return
+        first = not batch.group_keys
+        batch.group_keys.add(key)
+
+        if first:
+            record = self.rows.records[batch.index]
+            record["data"] = _row_data(parsed)
+            record["loaded"] = True
+            self.rows.refresh(batch.index)
+        else:
+            self.rows.add(_row_data(parsed), loaded=True)
+
+    def _finish_row(self, batch: _LoadBatch):
+        self.rows.records[batch.index]["loading"] = False
+        self.rows.refresh(batch.index)
+
+    def _update_progress(self):
+        self.progress.config(maximum=max(self._progress_total, 1), value=self._progress_done)
+        self.progress_label.config(
+            text=f"{self._progress_done} / {self._progress_total} PDF(s)" if self._progress_total else ""
+        )
+
+    def _finish_loading(self):
+        self._progress_total = 0
+        self._progress_done = 0
+        self._update_progress()
+        self.cancel_btn.config(state="disabled")
+        self.submit_btn.config(state="normal")
+
+    def cancel_loading(self):
+        """Drop all PDFs still being loaded; rows keep what was already filled in."""
+        for batch in self._batches:
+            for future in batch.futures:
+                future.cancel()  # PDFs a worker already started on finish, but are ignored
+            self._finish_row(batch)
+        self._batches.clear()
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        self._finish_loading()
+
+    def on_close(self):
+        self.cancel_loading()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
 
     def submit_to_excel(self):
         excel_path = self.excel_path_var.get().strip()
         if not excel_path:
             messagebox.showwarning("Fehlende Excel-Datei", "Bitte wählen Sie oben eine Excel-Datei aus.")
             return
-        if not self.rows:
+        if not self.rows.records:
             messagebox.showwarning("Keine Zeilen", "Bitte fügen Sie mindestens eine Zeile hinzu.")
             return
 
+        self.rows.end_edit()
         to_write = []
-        for r in self.rows:
-            row_data = r.get_row_for_excel()
+        for record in self.rows.records:
+            row_data = convert_data_to_list(record["data"])
             if not row_data[0]:
                 messagebox.showwarning(
                     "Fehlender Handelsname",
@@ -203,32 +456,20 @@ class App(tk.Tk):
 
         try:
             Path(excel_path).parent.mkdir(parents=True, exist_ok=True)
-            for row_data in to_write:
-                open_and_write_excel(excel_path, row_data, insert_row=self.insert_row)
-
-            messagebox.showinfo("Erfolg", f"{len(to_write)} Zeile(n) wurden in die Excel-Datei geschrieben.")
-            for row in self.rows:
-                row.frame.destroy()
+            with ExcelWriter(excel_path, insert_row=self.insert_row, duplicates=self.duplicates) as writer:
+                for row_data in to_write:
+                    writer.write_row(row_data)
+
+            message = f"{writer.rows_written} Zeile(n) wurden in die Excel-Datei geschrieben."
+            if writer.duplicates_updated:
+                message += f"\n{len(writer.duplicates_updated)} bereits vorhandene Zeile(n) aktualisiert."
+            if writer.duplicates_skipped:
+                skipped = ", ".join(f"{name} (Zeile {row})" for name, row in writer.duplicates_skipped[:10])
+                if len(writer.duplicates_skipped) > 10:
+                    skipped += f" und {len(writer.duplicates_skipped) - 10} weitere"
+                message += f"\n{len(writer.duplicates_skipped)} Duplikat(e) übersprungen: {skipped}"
+            messagebox.showinfo("Erfolg", message)
             self.rows.clear()
 
         except Exception as e:
             messagebox.showerror("Fehler beim Schreiben", f"Konnte nicht in Excel schreiben:\n{e}")
-
-
-class ScrollableFrame(tk.Frame):
-    def __init__(self, parent, height=260, *args, **kwargs):
-        super().__init__(parent, *args, **kwargs)
-        canvas = tk.Canvas(self, height=height)
-        scrollbar = tk.Scrollbar(self, orient="vertical", command=canvas.yview)
-        self.content = tk.Frame(canvas)
-
-        self.content.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-
-        canvas.create_window((0, 0), window=self.content, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
\ No newline at end of file
@@ -0,0 +1,132 @@
+"""
+H-statements and GHS pictograms as integer bitsets.
+
+Every CLP hazard statement (Regulation (EC) No 1272/2008, Annex III, including the
+EUH statements) has a fixed bit, and every pictogram of Annex V a bit of its own. A
+set of codes is the OR of its bits, so comparing, hashing, grouping and subset tests
+of H-sets are single integer operations, and pictograms are derived from an H-set by
+OR-ing precomputed masks:
+
+    mask = encode_h(["H225", "H350"])
+    mask & CMR_MASK                      # any carcinogen, mutagen or reprotoxicant
+    decode_ghs(ghs_mask(mask))           # ["GHS02", "GHS08"]
+
+Suffixed codes like H350i or H360FD are stored under their three-digit code, which
+is what the parsers extract.
+"""
+
+GHS_CODES = ("GHS01", "GHS02", "GHS03", "GHS04", "GHS05", "GHS06", "GHS07", "GHS08", "GHS09")
+
+# Pictograms of the classifications that carry each statement (Annex I); statements of
+# categories without a pictogram map to ()
+_H_TABLE = [
+    # Physical hazards
+    ("H200", ("GHS01",)), ("H201", ("GHS01",)), ("H202", ("GHS01",)), ("H203", ("GHS01",)),
+    ("H204", ("GHS01",)), ("H205", ()), ("H206", ("GHS02",)), ("H207", ("GHS02",)), ("H208", ()),
+    ("H209", ("GHS01",)), ("H210", ("GHS01",)), ("H211", ("GHS01",)),
+    ("H220", ("GHS02",)), ("H221", ("GHS02",)), ("H222", ("GHS02",)), ("H223", ("GHS02",)),
+    ("H224", ("GHS02",)), ("H225", ("GHS02",)), ("H226", ("GHS02",)), ("H228", ("GHS02",)),
+    ("H229", ()), ("H230", ()), ("H231", ()), ("H232", ("GHS02",)),
+    ("H240", ("GHS01",)), ("H241", ("GHS01", "GHS02")), ("H242", ("GHS02",)),
+    ("H250", ("GHS02",)), ("H251", ("GHS02",)), ("H252", ("GHS02",)),
+    ("H260", ("GHS02",)), ("H261", ("GHS02",)),
+    ("H270", ("GHS03",)), ("H271", ("GHS03",)), ("H272", ("GHS03",)),
+    ("H280", ("GHS04",)), ("H281", ("GHS04",)), ("H290", ("GHS05",)),
+    # Health hazards
+    ("H300", ("GHS06",)), ("H301", ("GHS06",)), ("H302", ("GHS07",)), ("H304", ("GHS08",)),
+    ("H310", ("GHS06",)), ("H311", ("GHS06",)), ("H312", ("GHS07",)),
+    ("H314", ("GHS05",)), ("H315", ("GHS07",)), ("H317", ("GHS07",)), ("H318", ("GHS05",)),
+    ("H319", ("GHS07",)), ("H330", ("GHS06",)), ("H331", ("GHS06",)), ("H332", ("GHS07",)),
+    ("H334", ("GHS08",)), ("H335", ("GHS07",)), ("H336", ("GHS07",)),
+    ("H340", ("GHS08",)), ("H341", ("GHS08",)), ("H350", ("GHS08",)), ("H351", ("GHS08",)),
+    ("H360", ("GHS08",)), ("H361", ("GHS08",)), ("H362", ()),
+    ("H370", ("GHS08",)), ("H371", ("GHS08",)), ("H372", ("GHS08",)), ("H373", ("GHS08",)),
+    # Environmental hazards
+    ("H400", ("GHS09",)), ("H410", ("GHS09",)), ("H411", ("GHS09",)), ("H412", ()), ("H413", ()),
+    ("H420", ("GHS07",)),
+    # Supplemental EU statements, none has a pictogram
+    ("EUH001", ()), ("EUH006", ()), ("EUH014", ()), ("EUH018", ()), ("EUH019", ()), ("EUH029", ()),
+    ("EUH031", ()), ("EUH032", ()), ("EUH044", ()), ("EUH066", ()), ("EUH070", ()), ("EUH071", ()),
+    ("EUH201", ()), ("EUH201A", ()), ("EUH202", ()), ("EUH203", ()), ("EUH204", ()), ("EUH205", ()),
+    ("EUH206", ()), ("EUH207", ()), ("EUH208", ()), ("EUH209", ()), ("EUH209A", ()), ("EUH210", ()),
+    ("EUH211", ()), ("EUH212", ()), ("EUH380", ()), ("EUH381", ()), ("EUH401", ()),
+    ("EUH430", ()), ("EUH431", ()), ("EUH440", ()), ("EUH441", ()), ("EUH450", ()), ("EUH451", ()),
+]
+
+# Bit i of an H-set stands for H_CODES[i]
+H_CODES = tuple(code for code, _ in _H_TABLE)
+H_BITS = {code: 1 << i for i, code in enumerate(H_CODES)}
+GHS_BITS = {code: 1 << i for i, code in enumerate(GHS_CODES)}
+
+# Pictograms per statement, as lists of GHS codes
+H_TO_GHS = {code: list(pictograms) for code, pictograms in _H_TABLE}
+
+# Pictogram mask of each statement's bit
+_GHS_MASKS = {H_BITS[code]: sum(GHS_BITS[p] for p in pictograms) for code, pictograms in _H_TABLE}
+
+# Codes not in the table (misprints, statements newer than the table) get the next
+# free bits in this process, so encoded sets stay exact; their bits are only
+# comparable within one process
+_extra_codes = []
+
+
+def _bit(code: str) -> int:
+    bit = H_BITS.get(code)
+    if bit is None:
+        bit = 1 << (len(H_CODES) + len(_extra_codes))
+        _extra_codes.append(code)
+        H_BITS[code] = bit
+    return bit
+
+
+def encode_h(codes) -> int:
+    """Bitset of H-statement codes, e.g. ["H225", "H319"]. Codes are taken as they are."""
+    mask = 0
+    for code in codes:
+        mask |= H_BITS.get(code) or _bit(code)
+    return mask
+
+
+def decode_h(mask: int) -> list:
+    """Codes of an H bitset: table codes in table order (sorted), then other codes."""
+    codes = []
+    index = 0
+    while mask:
+        if mask & 1:
+            codes.append(H_CODES[index] if index < len(H_CODES) else _extra_codes[index - len(H_CODES)])
+        mask >>= 1
+        index += 1
+    return codes
+
+
+def encode_ghs(codes) -> int:
+    """Bitset of GHS pictogram codes; unknown codes are ignored."""
+    mask = 0
+    for code in codes:
+        mask |= GHS_BITS.get(code, 0)
+    return mask
+
+
+def decode_ghs(mask: int) -> list:
+    """Sorted GHS codes of a pictogram bitset."""
+    return [code for code, bit in GHS_BITS.items() if mask & bit]
+
+
+def ghs_mask(h_mask: int) -> int:
+    """Pictograms required by the statements of an H bitset."""
+    mask = 0
+    while h_mask:
+        low = h_mask & -h_mask
+        mask |= _GHS_MASKS.get(low, 0)
+        h_mask ^= low
+    return mask
+
+
+def is_subset(mask: int, of: int) -> bool:
+    return mask & ~of == 0
+
+
+CARCINOGEN_MASK = encode_h(["H350", "H351"])
+MUTAGEN_MASK = encode_h(["H340", "H341"])
+REPROTOXIC_MASK = encode_h(["H360", "H361", "H362"])
+CMR_MASK = CARCINOGEN_MASK | MUTAGEN_MASK | REPROTOXIC_MASK
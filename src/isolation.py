@@ -0,0 +1,219 @@
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+
+import src.memory
+
+# Seconds between checks of the running documents' time and memory
+POLL_INTERVAL = 0.1
+
+
+class DocumentTimeout(Exception):
+    """The worker processing a document was killed after the wall-clock budget."""
+
+
+class WorkerCrashed(Exception):
+    """The worker processing a document exited without a result (crash, killed by the OS)."""
+
+
+def _worker_main(conn, initializer, initargs):
+    """Run jobs received on conn one at a time until None is received."""
+    if initializer is not None:
+        initializer(*initargs)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        fn, args = job
+        try:
+            result = ("ok", fn(*args))
+        except Exception as e:
+            result = ("error", e)
+        try:
+            conn.send(result)
+        except Exception as e:
+            # Results or exceptions that cannot be pickled
+            conn.send(("error", RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class _Worker:
+    def __init__(self, context, initializer, initargs):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, initializer, initargs), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.future = None
+        self.started = None
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class IsolatedPool:
+    """
+    Process pool that runs one job per worker and can kill a worker in the middle of
+    a job, which ProcessPoolExecutor cannot.
+
+    A job running longer than timeout seconds, or whose worker grows beyond
+    max_memory_mb, is killed and its future fails with DocumentTimeout or
+    src.memory.MemoryLimitExceeded; a worker that dies fails its job with
+    WorkerCrashed. The worker is replaced and the other jobs go on. The exceptions
+    of failed jobs carry the job's run time in "seconds". Used like
+    ProcessPoolExecutor: submit() returns a concurrent.futures.Future.
+
+    :param max_workers: number of worker processes
+    :param timeout: wall-clock budget of one job in seconds, None for none
+    :param max_memory_mb: memory budget of a worker in MB, None for none. An idle
+                          worker above it is replaced, memory freed by Python is not
+                          always returned to the OS.
+    :param initializer: called with initargs in every new worker
+    """
+
+    def __init__(self, max_workers: int, timeout: float | None = None, max_memory_mb: int | None = None,
+                 initializer=None, initargs=()):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_memory = max_memory_mb * 1024 * 1024 if max_memory_mb else None
+        self._initializer = initializer
+        self._initargs = initargs
+        self._context = multiprocessing.get_context()
+        self._jobs = deque()
+        self._idle = []
+        self._busy = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._wakeup_reader, self._wakeup_writer = self._context.Pipe(duplex=False)
+        self._thread = threading.Thread(target=self._manage, daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot submit after shutdown")
+            self._jobs.append((future, fn, args))
+        self._wakeup_writer.send(None)
+        return future
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        """Stop the workers after the running jobs; queued jobs are cancelled if cancel_futures is set."""
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                while self._jobs:
+                    self._jobs.popleft()[0].cancel()
+        self._wakeup_writer.send(None)
+        if wait:
+            self._thread.join()
+
+    def _fail(self, worker: _Worker, exception: Exception):
+        exception.seconds = time.monotonic() - worker.started
+        worker.future.set_exception(exception)
+        worker.future = None
+
+    def _start_jobs(self):
+        while True:
+            with self._lock:
+                if not self._jobs:
+                    return
+                if not self._idle and len(self._busy) >= self.max_workers:
+                    return
+                future, fn, args = self._jobs.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            worker = self._idle.pop() if self._idle else _Worker(self._context, self._initializer, self._initargs)
+            worker.future = future
+            worker.started = time.monotonic()
+            try:
+                worker.conn.send((fn, args))
+            except Exception as e:
+                # e.g. arguments that cannot be pickled; the worker is still usable
+                worker.future = None
+                future.set_exception(e)
+                self._idle.append(worker)
+                continue
+            self._busy.append(worker)
+
+    def _receive(self, worker: _Worker):
+        try:
+            status, value = worker.conn.recv()
+        except (EOFError, OSError):
+            worker.process.join()
+            self._fail(worker, WorkerCrashed(f"worker exited with code {worker.process.exitcode}"))
+            worker.conn.close()
+            self._busy.remove(worker)
+            return
+        except Exception as e:
+            # An exception of the job that cannot be rebuilt here
+            status, value = "error", RuntimeError(f"unreadable result: {type(e).__name__}: {e}")
+        if status == "ok":
+            worker.future.set_result(value)
+            worker.future = None
+        else:
+            self._fail(worker, value)
+        self._busy.remove(worker)
+        rss = src.memory.process_rss(worker.process.pid) if self.max_memory else None
+        if rss is not None and rss > self.max_memory:
+            worker.stop()
+        else:
+            self._idle.append(worker)
+
+    def _check_budgets(self):
+        now = time.monotonic()
+        for worker in list(self._busy):
+            exception = None
+            if self.timeout is not None and now - worker.started > self.timeout:
+                exception = DocumentTimeout(f"no result after {self.timeout:g} s")
+            elif self.max_memory is not None:
+                rss = src.memory.process_rss(worker.process.pid)
+                if rss is not None and rss > self.max_memory:
+                    exception = src.memory.MemoryLimitExceeded(
+                        f"worker used {src.memory.format_mb(rss)}, over the budget of "
+                        f"{src.memory.format_mb(self.max_memory)}")
+            if exception is not None:
+                worker.kill()
+                self._busy.remove(worker)
+                self._fail(worker, exception)
+
+    def _manage(self):
+        try:
+            while True:
+                self._start_jobs()
+                with self._lock:
+                    done = self._shutdown and not self._jobs
+                if done and not self._busy:
+                    break
+                ready = wait([self._wakeup_reader] + [w.conn for w in self._busy],
+                             POLL_INTERVAL if self._busy else None)
+                for conn in ready:
+                    if conn is self._wakeup_reader:
+                        while self._wakeup_reader.poll():
+                            self._wakeup_reader.recv()
+                    else:
+                        self._receive(next(w for w in self._busy if w.conn is conn))
+                self._check_budgets()
+        finally:
+            for worker in self._idle:
+                worker.stop()
+            for worker in self._busy:
+                worker.kill()
+                self._fail(worker, WorkerCrashed("pool shut down"))
@@ -0,0 +1,167 @@
+import json
+import os
+import tempfile
+
+from src.cache import file_hash
+
+MANIFEST_VERSION = 1
+
+
+def default_manifest_path(excel_path: str) -> str:
+    """Sidecar file next to the workbook, e.g. kataster.xlsx.manifest.json."""
+    return excel_path + ".manifest.json"
+
+
+class Manifest:
+    """
+    Record of the PDFs an incremental run has written to a workbook.
+
+    For every processed PDF the manifest stores size, mtime, content hash and the
+    workbook row it produced (None if its folder produced no row for it). The CLI
+    groups PDFs per folder, so a folder is the unit that is re-parsed: it is skipped
+    as long as the same PDFs with the same content are in it.
+
+    :param path: manifest file, loaded if it exists
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.files = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    self.files = data["files"]
+                else:
+                    print(f"[WARN] Ignoring manifest {path} with unknown version {data.get('version')}")
+            except (OSError, ValueError, KeyError) as e:
+                print(f"[WARN] Could not read manifest {path}, processing everything: {e}")
+
+        self._folders = {}
+        for file_path in self.files:
+            self._folders.setdefault(os.path.dirname(file_path), set()).add(file_path)
+
+        # Rows inserted one below the other (ExcelWriter's insert_row block) are counted
+        # in _shifted instead of moving every record; the stored rows of the paths in
+        # _moving are relative to it. _next_insert is the row the next insert is expected at.
+        self._moving = set()
+        self._shifted = 0
+        self._next_insert = None
+
+    def _stat_matches(self, file_path: str, st: os.stat_result) -> bool:
+        record = self.files.get(file_path)
+        if record is None:
+            return False
+        if record["size"] == st.st_size and record["mtime_ns"] == st.st_mtime_ns:
+            return True
+        # Touched but not changed (copied back, re-synced share): same content is no change
+        if record["size"] == st.st_size and file_hash(file_path) == record["sha256"]:
+            record["mtime_ns"] = st.st_mtime_ns
+            return True
+        return False
+
+    def folder_unchanged(self, folder: str, pdf_paths: list) -> bool:
+        """
+        True if folder holds exactly the recorded PDFs, all unchanged.
+
+        :param pdf_paths: paths or os.DirEntry objects; entries reuse the stat result
+                          cached by os.scandir() where the platform provides one
+        """
+        entries = {(p.path if isinstance(p, os.DirEntry) else str(p)): p for p in pdf_paths}
+        if set(entries) != self._folders.get(folder, set()):
+            return False
+        return all(
+            self._stat_matches(path, p.stat() if isinstance(p, os.DirEntry) else os.stat(p))
+            for path, p in entries.items()
+        )
+
+    def _row(self, file_path: str) -> int | None:
+        row = self.files[file_path]["row"]
+        return row + self._shifted if file_path in self._moving else row
+
+    def _store_row(self, file_path: str, row: int | None):
+        if row is not None and self._next_insert is not None and row >= self._next_insert:
+            self.files[file_path]["row"] = row - self._shifted
+            self._moving.add(file_path)
+        else:
+            self.files[file_path]["row"] = row
+            self._moving.discard(file_path)
+
+    def _settle(self):
+        """Add the counted inserts to the stored rows."""
+        for file_path in self._moving:
+            self.files[file_path]["row"] += self._shifted
+        self._moving = set()
+        self._shifted = 0
+        self._next_insert = None
+
+    def folder_rows(self, folder: str) -> list:
+        """Workbook rows recorded for the PDFs of folder, ascending."""
+        rows = {self._row(p) for p in self._folders.get(folder, ())}
+        return sorted(r for r in rows if r is not None)
+
+    def record_folder(self, folder: str, rows_by_path: dict):
+        """
+        Replace the records of folder.
+
+        :param folder: folder path as used in the keys
+        :param rows_by_path: {pdf path: workbook row or None} of every PDF now in folder
+        """
+        previous = {p: self.files[p] for p in self._folders.get(folder, ())}
+        self.forget_folder(folder)
+        for pdf_path, row in rows_by_path.items():
+            st = os.stat(pdf_path)
+            key = str(pdf_path)
+            old = previous.get(key)
+            if old is not None and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+                digest = old["sha256"]
+            else:
+                digest = file_hash(pdf_path)
+            self.files[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest, "row": None}
+            self._store_row(key, row)
+            self._folders.setdefault(folder, set()).add(key)
+
+    def set_row(self, pdf_path: str, row: int | None):
+        self._store_row(str(pdf_path), row)
+
+    def clear(self):
+        self.files = {}
+        self._folders = {}
+        self._moving = set()
+        self._settle()
+
+    def forget_folder(self, folder: str):
+        for file_path in self._folders.pop(folder, ()):
+            self.files.pop(file_path, None)
+            self._moving.discard(file_path)
+
+    def folders(self) -> set:
+        return set(self._folders)
+
+    def folders_under(self, root: str) -> set:
+        """Recorded folders inside root (root included)."""
+        prefix = root.rstrip(os.sep) + os.sep
+        return {f for f in self._folders if f == root or f.startswith(prefix)}
+
+    def shift_rows(self, start: int, count: int = 1):
+        """
+        Move recorded rows at or below start down by count, after rows were inserted at start.
+
+        Only the first of a series of inserts, each right below the previous one, walks
+        the records; the rows it moves keep moving with the later ones.
+        """
+        if start != self._next_insert:
+            self._settle()
+            self._moving = {p for p, record in self.files.items() if record["row"] is not None and record["row"] >= start}
+        self._shifted += count
+        self._next_insert = start + count
+
+    def save(self):
+        """Write the manifest atomically."""
+        self._settle()
+        folder = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "files": self.files}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
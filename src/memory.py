@@ -0,0 +1,122 @@
+import gc
+import os
+import sys
+
+# Memory ceiling of this process in bytes, None while there is none
+_limit = None
+
+
+class MemoryLimitExceeded(MemoryError):
+    """Raised while extracting a PDF pushed this process over the configured ceiling."""
+
+
+def _windows_counters(pid: int | None = None):
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    kernel32 = ctypes.windll.kernel32
+    if pid is None:
+        process = kernel32.GetCurrentProcess()
+    else:
+        # PROCESS_QUERY_LIMITED_INFORMATION | PROCESS_VM_READ
+        process = kernel32.OpenProcess(0x1000 | 0x0010, False, pid)
+        if not process:
+            return None
+    try:
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return None
+    finally:
+        if pid is not None:
+            kernel32.CloseHandle(process)
+    return counters
+
+
+def peak_rss() -> int | None:
+    """Highest resident set size of this process so far in bytes, None if unknown."""
+    if sys.platform == "win32":
+        counters = _windows_counters()
+        return counters.PeakWorkingSetSize if counters else None
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def current_rss() -> int | None:
+    """Resident set size of this process in bytes, None if unknown."""
+    if sys.platform == "win32":
+        counters = _windows_counters()
+        return counters.WorkingSetSize if counters else None
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # No /proc (macOS): the peak is an upper bound of the current size
+        return peak_rss()
+
+
+def process_rss(pid: int) -> int | None:
+    """Resident set size of another process in bytes, None if unknown (or on macOS)."""
+    if sys.platform == "win32":
+        counters = _windows_counters(pid)
+        return counters.WorkingSetSize if counters else None
+    try:
+        with open(f"/proc/{pid}/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def configure(limit_mb: int | None):
+    """Set the memory ceiling of this process, e.g. as part of a worker initializer."""
+    global _limit
+    _limit = limit_mb * 1024 * 1024 if limit_mb else None
+
+
+def limit_mb() -> int | None:
+    return _limit // (1024 * 1024) if _limit is not None else None
+
+
+def over_limit() -> bool:
+    """True if a ceiling is configured and this process is above it."""
+    if _limit is None:
+        return False
+    rss = current_rss()
+    return rss is not None and rss > _limit
+
+
+def check(pdf_path: str):
+    """
+    Raise MemoryLimitExceeded if this process is above the ceiling even after a full
+    garbage collection. Callers release what they can before calling this.
+    """
+    if not over_limit():
+        return
+    gc.collect()
+    if over_limit():
+        raise MemoryLimitExceeded(
+            f"{pdf_path}: {current_rss() / 1024 / 1024:.0f} MB in use, over the limit of {limit_mb()} MB"
+        )
+
+
+def format_mb(size: int | None) -> str:
+    return f"{size / 1024 / 1024:.0f} MB" if size is not None else "unknown"
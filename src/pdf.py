@@ -1,48 +1,197 @@
 import re
-import pdfplumber
+import time
 from datetime import datetime
 
-H_TO_GHS = {
-    "H200": ["GHS01"], "H201": ["GHS01"], "H202": ["GHS01"], "H203": ["GHS01"],
-    "H220": ["GHS02"], "H221": ["GHS02"], "H222": ["GHS02"], "H225": ["GHS02"], "H226": ["GHS02"],
-    "H228": ["GHS02"],
-    "H301": ["GHS06"], "H311": ["GHS06"], "H331": ["GHS06"],
-    "H302": ["GHS07"], "H312": ["GHS07"], "H315": ["GHS07"], "H319": ["GHS07"], "H335": ["GHS07"], "H336": ["GHS07"],
-    "H317": ["GHS07", "GHS08"],
-    "H314": ["GHS05"], "H318": ["GHS05"],
-    "H350": ["GHS08"], "H360": ["GHS08"], "H370": ["GHS08"], "H372": ["GHS08"],
-    "H400": ["GHS09"], "H410": ["GHS09"], "H411": ["GHS09"], "H412": ["GHS09"]
+import src.cache
+import src.memory
+import src.profiling
+from src.document import SDSDocument
+from src.extractors import DEFAULT_EXTRACTOR, PdfplumberTextExtractor, get_extractor
+from src.hazards import decode_ghs, encode_h, ghs_mask
+from src.isolation import DocumentTimeout
+from src.scanner import FieldPattern, Scanner
+
+
+AUTO_MODE = "Auto"
+PARSE_MODES = ["Default", "Fallback", "3M", "BASF", "Lechler", AUTO_MODE]
+
+# Bump whenever a parser changes its output, so cached parse results are not reused
+PARSER_VERSION = 5
+
+DATE_PATTERN = r"(?:Überarbeitet am|Druckdatum|Bearbeitungsdatum|Erstelldatum|Stand|Revisionsdatum)\s*:?\s*([\d]{1,2}[.\-/][\d]{1,2}[.\-/][\d]{4})"
+
+# Field patterns per parser mode and scope, compiled once into one Scanner per scope.
+# "document" is searched page by page, stopping at the first page with a match, "text" is the whole
+# document text and numbers are ABSCHNITT sections. Patterns sharing a field name are
+# fallbacks in priority order.
+PROFILES = {
+    "Default": {
+        "document": [FieldPattern("sds_date", DATE_PATTERN, re.I)],
+        "1": [
+            FieldPattern("handelsname", r"(?:Handelsname|Artikelname):\s*(.*)", re.I),
+            FieldPattern("manufacturer", r"Hersteller/Lieferant:\s*([^\n\r]+)", re.I),
+        ],
+        "2": [
+            FieldPattern("h_statements", r"\bH\d{3}"),
+            FieldPattern("pictograms", r"\bGHS\d{2}"),
+        ],
+        "14": [FieldPattern("un_number", r"(\bUN\s*\d{1,4})", re.I)],
+    },
+    "Fallback": {
+        "document": [FieldPattern("sds_date", DATE_PATTERN, re.I)],
+        "1": [
+            FieldPattern("handelsname", r"(?:Handelsname|Artikelname):\s*(.*)", re.I),
+            FieldPattern("manufacturer", r"Lieferant:\s*(.{0,300}?)\n", re.I),
+        ],
+        "2": [
+            FieldPattern("h_statements", r"\bH(\d{3})\b", re.I),
+            FieldPattern("h_statements", r"H(\d{3})\s+[A-ZÜÖÄ]", re.I),
+            FieldPattern("h_statements", r"Flam\.\s*Liq\.\s*\d+[,\s]+H(\d{3})", re.I),
+            FieldPattern("h_statements", r"STOT\s*SE\s*\d+[,\s]+H(\d{3})", re.I),
+            FieldPattern("pictograms", r"\bGHS\d{2}\b"),
+        ],
+        "14": [FieldPattern("un_number", r"\bUN\s*\d{1,4}\b", re.I)],
+    },
+    "3M": {
+        "document": [
+            FieldPattern("sds_date", r"Überarbeitet am:\s*([\d]{1,2}[./][\d]{1,2}[./][\d]{4})", re.I),
+            # Product name from the document title (before the underscores)
+            FieldPattern("handelsname", r"^([^\n_]+(?:Heavy Duty Cleaner|Remover|Cleaner)[^\n_]*)", re.M),
+        ],
+        "1": [FieldPattern("manufacturer", r"Anschrift:\s*([^,\n]+)", re.I)],
+        "2": [
+            FieldPattern("h_statements", r"\bH\d{3}\b"),
+            FieldPattern("pictograms", r"\bGHS\d{2}\b"),
+        ],
+        "14": [
+            FieldPattern("not_dangerous", r"Kein Gefahrgut|Not dangerous for transport", re.I),
+            FieldPattern("un_number", r"\bUN\s*(\d{1,4})\b", re.I),
+        ],
+    },
+    "BASF": {
+        "document": [
+            FieldPattern(
+                "sds_date",
+                r"(?:Datum der letzten Ausgabe|Überarbeitet am)\s*:?\s*([\d]{1,2}[./-][\d]{1,2}[./-][\d]{4})",
+                re.I,
+            ),
+        ],
+        "1": [
+            FieldPattern("handelsname", r"Handelsname\s*:?\s*(.+)", re.I),
+            FieldPattern("manufacturer", r"Firma:\s*([^\n\r]+)", re.I),
+        ],
+        "2": [
+            FieldPattern("h_statements", r"\bH\d{3}\b"),
+            FieldPattern("pictograms", r"\bGHS\d{2}\b"),
+        ],
+        "14": [FieldPattern("un_number", r"\bUN\s*(\d{1,4})\b", re.I)],
+    },
+    "Lechler": {
+        "text": [
+            FieldPattern("sds_date", r"Sicherheitsdatenblatt vom\s*([\d]{1,2}[./\-][\d]{1,2}[./\-][\d]{4})", re.I),
+            FieldPattern("sds_date", r"Version\s+\d+.{0,300}?([\d]{1,2}[./\-][\d]{1,2}[./\-][\d]{4})", re.I),
+            FieldPattern("sds_date", r"Überarbeitet am\s*:?\s*([\d]{1,2}[./\-][\d]{1,2}[./\-][\d]{4})", re.I),
+            FieldPattern("sds_date", r"Druckdatum\s*:?\s*([\d]{1,2}[./\-][\d]{1,2}[./\-][\d]{4})", re.I),
+            FieldPattern("sds_date", r"\b([\d]{1,2}/[\d]{1,2}/[\d]{4})\b", re.I),
+            FieldPattern("handelsname", r"Handelsname:\s*([^\n\r]+)", re.I | re.M),
+            FieldPattern("handelsname", r"Produktidentifikator[^:]*:\s*[^:]*Handelsname:\s*([^\n\r]+)", re.I | re.M),
+            FieldPattern("handelsname", r"Kennzeichnung der Mischung:\s*Handelsname:\s*([^\n\r]+)", re.I | re.M),
+            FieldPattern("handelsname", r"^([A-Z][A-Z0-9\s\.\-_]{10,50})$", re.I | re.M),
+            # The supplier block up to its phone number or the next subsection, at most 10
+            # further lines of up to 300 characters. Each line can be matched only one way, so
+            # a block without an end is given up quickly; "[^\n\r]+(?:\s+[^\n\r]+)*?" could split
+            # at every space both ways and took exponential time
+            FieldPattern(
+                "manufacturer",
+                r"Lieferant:\s*((?:[^\n\r]{1,300}[\r\n]\s*(?=\S)){0,10}?[^\n\r]{1,300})"
+                r"(?=\s*(?:Telefon|First Email|AUSTRIA|BELGIUM|\d+\.\d+))",
+                re.I,
+            ),
+            FieldPattern("manufacturer", r"Hersteller:\s*([^\n\r]+)", re.I),
+            FieldPattern("manufacturer", r"Firma:\s*([^\n\r]+)", re.I),
+            FieldPattern("manufacturer", r"(Lechler\s+SpA[^\n\r]*)", re.I),
+            FieldPattern("manufacturer", r"Anschrift:\s*([^\n\r]+)", re.I),
+            FieldPattern("einstufung", r"Einstufung.*?(?=ABSCHNITT|\Z)", re.I | re.S),
+            FieldPattern("pictograms", r"\bGHS(\d{2})\b"),
+            FieldPattern("un_number", r"\bUN[-\s]*[:\-]?\s*([0-9]{3,4})\b", re.I),
+            FieldPattern("un_nummer", r"UN[-\s]?Nummer(?: oder ID-Nummer)?[^\d\n]{0,60}([0-9]{3,4})", re.I),
+            FieldPattern("un_subsection", r"^[ \t]*14\s*\.?\s*1\b", re.M),
+            FieldPattern("un_section", r"ABSCHNITT\s*14\b", re.I),
+        ],
+        # Section 2, or the whole text if there is no section 2. The H-code after a label is
+        # looked for in the next 1000 characters only: unbounded, every label without one
+        # after it would search to the end of the text, quadratic in the number of labels
+        "2": [
+            FieldPattern("h_statements", r"\bH(\d{3})\b", re.I | re.S),
+            FieldPattern("h_statements", r"Gefahrenhinweise.{0,1000}?H(\d{3})", re.I | re.S),
+            FieldPattern("h_statements", r"Flam\.\s*Liq\.\s*\d+.{0,1000}?H(\d{3})", re.I | re.S),
+            FieldPattern("h_statements", r"STOT\s*SE\s*\d+.{0,1000}?H(\d{3})", re.I | re.S),
+            FieldPattern("h_statements", r"Eye\s*Irrit\.\s*\d+.{0,1000}?H(\d{3})", re.I | re.S),
+            FieldPattern("h_statements", r"Skin\s*Irrit\.\s*\d+.{0,1000}?H(\d{3})", re.I | re.S),
+        ],
+    },
 }
 
-def extract_text_chain(pdf_path: str) -> str:
-    """Extract and normalize text from SDS PDF."""
-    text_parts = []
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text_parts.append(page.extract_text(layout=True) or "")
-    raw_text = "\n".join(text_parts)
-
-    # Clean text
-    text = re.sub(r"-\n", "", raw_text)  # fix split words
-    text = re.sub(r"\n+", "\n", text)  # collapse newlines
-    text = re.sub(r"[ \t]+", " ", text)  # normalize spaces
-    return text.strip()
-
-
-def split_sections(text: str) -> dict:
-    """Split SDS into sections by 'ABSCHNITT x:' headers."""
-    sections = {}
-    matches = list(re.finditer(r"\*?\s*ABSCHNITT\s+(\d+):\s*(.*)", text, flags=re.I))
-    for i, match in enumerate(matches):
-        sec_num = match.group(1)
-        start = match.end()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
-        sections[sec_num] = text[start:end].strip()
-    return sections
-
-
-def parse_sds(text: str) -> dict:
-    """Extract key SDS info by EU norm fields."""
+# First-page fingerprints for AUTO_MODE in priority order, most specific first.
+# The default parser reads "Hersteller/Lieferant:", a bare "Lieferant:" needs the fallback.
+VENDOR_FINGERPRINTS = [
+    ("Lechler", re.compile(r"Sicherheitsdatenblatt vom|Lechler\s+(?:SpA|Coatings)", re.I)),
+    ("3M", re.compile(r"Anschrift:", re.I)),
+    ("BASF", re.compile(r"Firma:", re.I)),
+    ("Default", re.compile(r"Hersteller/Lieferant:", re.I)),
+    ("Fallback", re.compile(r"Lieferant:", re.I)),
+]
+
+_SCANNERS = {
+    mode: {scope: Scanner(patterns) for scope, patterns in profile.items()}
+    for mode, profile in PROFILES.items()
+}
+
+# Parsers whose H-statements come from section 2 alone, with the match group holding
+# the code ("H225") or only its digits ("225"). Lechler also reads the whole text.
+_SECTION2_H_GROUPS = {"Default": 0, "3M": 0, "BASF": 0, "Fallback": 1}
+
+_H_CODE_RE = re.compile(r"\bH(\d{3})\b")
+_NOT_A_NAME_RE = re.compile(r"(ABSCHNITT|Section|Version|Seite|Page)", re.I)
+_WHITESPACE_RE = re.compile(r"\s+")
+_NEXT_LINE_NUMBER_RE = re.compile(r"[\r\n]+\s*([0-9]{3,4})")
+_NUMBER_RE = re.compile(r"\b([0-9]{3,4})\b")
+
+
+def extract_text_chain(pdf_path: str, extractor: str = DEFAULT_EXTRACTOR) -> str:
+    """Extract and normalize text from SDS PDF, using the extraction cache if configured."""
+    with SDSDocument(pdf_path, extractor=extractor) as doc:
+        return doc.text
+
+
+def _h_statements(found, mode: str) -> list:
+    """Sorted H-codes of the "h_statements" matches of a section 2 scan of mode's parser."""
+    if _SECTION2_H_GROUPS[mode]:
+        return sorted({f"H{m.group(1)}" for m in found.all("h_statements")})
+    return sorted({m.group(0) for m in found.all("h_statements")})
+
+
+def section2_h_statements(doc: SDSDocument, mode: str) -> list:
+    """
+    The H-statements mode's parser finds, extracting only the pages up to section 2.
+
+    :param mode: one of _SECTION2_H_GROUPS
+    """
+    section2 = doc.section("2")
+    if section2 is None:
+        return []
+    return _h_statements(_SCANNERS[mode]["2"].scan(section2), mode)
+
+
+def _as_document(text) -> SDSDocument:
+    """Accept either already extracted text or a lazily extracted SDSDocument."""
+    return text if isinstance(text, SDSDocument) else SDSDocument.from_text(text)
+
+
+def parse_sds(text: str | SDSDocument) -> dict:
+    """Extract key SDS info by EU norm fields. Pages of an SDSDocument are extracted on demand."""
+    doc = _as_document(text)
+    scanners = _SCANNERS["Default"]
     data = {
         "handelsname": None,
         "manufacturer": None,
@@ -53,57 +202,43 @@ def parse_sds(text: str) -> dict:
     }
 
     # Datum aus dem gesamten Dokument suchen (vor Abschnitt 1)
-    date_match = re.search(
-        r"(?:Überarbeitet am|Druckdatum|Bearbeitungsdatum|Erstelldatum|Stand|Revisionsdatum)\s*:?\s*([\d]{1,2}[.\-/][\d]{1,2}[.\-/][\d]{4})",
-        text,
-        flags=re.I
-    )
+    date_match = scanners["document"].scan_pages(doc).first("sds_date")
     if date_match:
         data["sds_date"] = date_match.group(1).strip()
 
-    # Abschnitte extrahieren
-    sections = split_sections(text)
-
     # Abschnitt 1
-    if "1" in sections:
+    section1 = doc.section("1")
+    if section1 is not None:
+        found = scanners["1"].scan(section1)
+
         # Abschnitt 1.1 – Handelsname (accepts "Handelsname" or "Artikelname")
-        handels_match = re.search(r"(?:Handelsname|Artikelname):\s*(.*)", sections["1"], flags=re.I)
+        handels_match = found.first("handelsname")
         data["handelsname"] = handels_match.group(1).strip() if handels_match else None
 
         # Abschnitt 1.3 – Hersteller
-        manuf_match = re.search(r"Hersteller/Lieferant:\s*([^\n\r]+)", sections["1"], flags=re.I)
+        manuf_match = found.first("manufacturer")
         data["manufacturer"] = manuf_match.group(1).strip() if manuf_match else None
 
     # Abschnitt 2.1/2.2 – H-Sätze + Piktogramme
-    if "2" in sections:
-        h_matches = re.findall(r"\bH\d{3}", sections["2"])
-        data["h_statements"] = sorted(set(h_matches))
-
-        ghs_matches = re.findall(r"\bGHS\d{2}", sections["2"])
-        data["pictograms"] = sorted(set(ghs_matches))
+    section2 = doc.section("2")
+    if section2 is not None:
+        found = scanners["2"].scan(section2)
+        data["h_statements"] = _h_statements(found, "Default")
+        data["pictograms"] = sorted({m.group(0) for m in found.all("pictograms")})
 
     # Abschnitt 14 – UN-Nummern
-    if "14" in sections:
-        un_match = re.search(r"(\bUN\s*\d{1,4})", sections["14"], flags=re.I)
+    section14 = doc.section("14")
+    if section14 is not None:
+        un_match = scanners["14"].scan(section14).first("un_number")
         data["un_number"] = un_match.group(1).strip().replace(" ", "") if un_match else None
 
     return data
 
 
-def split_sections_fallback(text: str) -> dict:
-    """Split SDS into sections by 'ABSCHNITT x:' headers."""
-    sections = {}
-    matches = list(re.finditer(r"\*?\s*ABSCHNITT\s+(\d+):", text, flags=re.I))
-    for i, match in enumerate(matches):
-        sec_num = match.group(1)
-        start = match.end()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
-        sections[sec_num] = text[start:end].strip()
-    return sections
-
-
-def parse_sds_fallback(text: str) -> dict:
-    """Extract key SDS info by EU norm fields."""
+def parse_sds_fallback(text: str | SDSDocument) -> dict:
+    """Extract key SDS info by EU norm fields. Pages of an SDSDocument are extracted on demand."""
+    doc = _as_document(text)
+    scanners = _SCANNERS["Fallback"]
     data = {
         "handelsname": None,
         "manufacturer": None,
@@ -114,62 +249,49 @@ def parse_sds_fallback(text: str) -> dict:
     }
 
     # Datum global suchen (vor Abschnitt 1 möglich)
-    date_match = re.search(
-        r"(?:Überarbeitet am|Druckdatum|Bearbeitungsdatum|Erstelldatum|Stand|Revisionsdatum)\s*:?\s*([\d]{1,2}[.\-/][\d]{1,2}[.\-/][\d]{4})",
-        text,
-        flags=re.I
-    )
+    date_match = scanners["document"].scan_pages(doc).first("sds_date")
     if date_match:
         data["sds_date"] = date_match.group(1).strip()
 
-    sections = split_sections(text)
-
     # Abschnitt 1
-    if "1" in sections:
+    section1 = doc.section("1")
+    if section1 is not None:
+        found = scanners["1"].scan(section1)
+
         # Handelsname / Artikelname
-        handels_match = re.search(r"(?:Handelsname|Artikelname):\s*(.*)", sections["1"], flags=re.I)
+        handels_match = found.first("handelsname")
         if handels_match:
             data["handelsname"] = handels_match.group(1).strip()
 
         # Hersteller / Lieferant: alles nach "Lieferant:"
-        manuf_match = re.search(r"Lieferant:\s*(.*?)\n", sections["1"], flags=re.I)
+        manuf_match = found.first("manufacturer")
         if manuf_match:
             data["manufacturer"] = manuf_match.group(1).strip()
 
     # Abschnitt 2 – H-Sätze + Piktogramme
-    if "2" in sections:
-        section2_text = sections["2"]
-
-        h_patterns = [
-            r"\bH(\d{3})\b",
-            r"H(\d{3})\s+[A-ZÜÖÄ]",
-            r"Flam\.\s*Liq\.\s*\d+[,\s]+H(\d{3})",
-            r"STOT\s*SE\s*\d+[,\s]+H(\d{3})",
-        ]
-
-        h_statements = set()
-        for pattern in h_patterns:
-            matches = re.findall(pattern, section2_text, flags=re.I)
-            for match in matches:
-                h_statements.add(f"H{match}")
-
-        data["h_statements"] = sorted(list(h_statements))
-
-        ghs_matches = re.findall(r"\bGHS\d{2}\b", sections["2"])
-        data["pictograms"] = sorted(set(ghs_matches))
+    section2 = doc.section("2")
+    if section2 is not None:
+        found = scanners["2"].scan(section2)
+        data["h_statements"] = _h_statements(found, "Fallback")
+        data["pictograms"] = sorted({m.group(0) for m in found.all("pictograms")})
 
     # Abschnitt 14 – UN-Nummer
-    if "14" in sections:
-        un_match = re.search(r"\bUN\s*\d{1,4}\b", sections["14"], flags=re.I)
+    section14 = doc.section("14")
+    if section14 is not None:
+        un_match = scanners["14"].scan(section14).first("un_number")
         if un_match:
             data["un_number"] = un_match.group(0).replace(" ", "")
 
     return data
 
 
-def parse_sds_3m_format(pdf_path: str) -> dict:
+def parse_sds_3m_format(pdf_path: str | SDSDocument) -> dict:
     """Parse 3M/Meguiar's style SDS documents with different structure."""
-    text = extract_text_chain(pdf_path)
+    if not isinstance(pdf_path, SDSDocument):
+        with SDSDocument(pdf_path) as doc:
+            return parse_sds_3m_format(doc)
+    doc = pdf_path
+    scanners = _SCANNERS["3M"]
 
     data = {
         "handelsname": None,
@@ -180,77 +302,53 @@ def parse_sds_3m_format(pdf_path: str) -> dict:
         "sds_date": None
     }
 
-    # Extract date from header - look for "Überarbeitet am" pattern
-    date_match = re.search(
-        r"Überarbeitet am:\s*([\d]{1,2}[./][\d]{1,2}[./][\d]{4})",
-        text,
-        flags=re.I
-    )
+    # Date from the header ("Überarbeitet am") and product name from the document title
+    found = scanners["document"].scan_pages(doc)
+    date_match = found.first("sds_date")
     if date_match:
         data["sds_date"] = date_match.group(1).strip()
 
-    # Extract product name from document title (before the underscores)
-    product_match = re.search(
-        r"^([^\n_]+(?:Heavy Duty Cleaner|Remover|Cleaner)[^\n_]*)",
-        text,
-        flags=re.MULTILINE
-    )
+    product_match = found.first("handelsname")
     if product_match:
-        data["handelsname"] = re.sub(r'\s+', ' ', product_match.group(1).strip())
-
-    # Split into sections
-    sections = {}
-    matches = list(re.finditer(r"ABSCHNITT\s+(\d+):\s*([^\n]*)", text, flags=re.I))
-
-    for i, match in enumerate(matches):
-        sec_num = match.group(1)
-        start = match.end()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
-        sections[sec_num] = text[start:end].strip()
+        data["handelsname"] = _WHITESPACE_RE.sub(" ", product_match.group(1).strip())
 
     # Section 1 - Product identification
-    if "1" in sections:
-        section1 = sections["1"]
-
+    section1 = doc.section("1")
+    if section1 is not None:
         # Look for manufacturer/supplier info - 3M format uses "Anschrift:"
-        manuf_match = re.search(
-            r"Anschrift:\s*([^,\n]+)",
-            section1,
-            flags=re.I
-        )
+        manuf_match = scanners["1"].scan(section1).first("manufacturer")
         if manuf_match:
             data["manufacturer"] = manuf_match.group(1).strip()
 
     # Section 2 - Hazards
-    if "2" in sections:
-        section2 = sections["2"]
-
-        # Look for H-statements in various formats
-        h_matches = re.findall(r"\bH\d{3}\b", section2)
-        data["h_statements"] = sorted(set(h_matches))
-
-        # Look for GHS pictograms
-        ghs_matches = re.findall(r"\bGHS\d{2}\b", section2)
-        data["pictograms"] = sorted(set(ghs_matches))
+    section2 = doc.section("2")
+    if section2 is not None:
+        found = scanners["2"].scan(section2)
+        data["h_statements"] = _h_statements(found, "3M")
+        data["pictograms"] = sorted({m.group(0) for m in found.all("pictograms")})
 
     # Section 14 - Transport information
-    if "14" in sections:
-        section14 = sections["14"]
+    section14 = doc.section("14")
+    if section14 is not None:
+        found = scanners["14"].scan(section14)
 
         # Check if it explicitly states "Kein Gefahrgut" or similar
-        if re.search(r"Kein Gefahrgut|Not dangerous for transport", section14, flags=re.I):
+        if found.first("not_dangerous"):
             data["un_number"] = "Not classified"
         else:
-            # Look for UN number
-            un_match = re.search(r"\bUN\s*(\d{1,4})\b", section14, flags=re.I)
+            un_match = found.first("un_number")
             if un_match:
                 data["un_number"] = f"UN{un_match.group(1)}"
 
     return data
 
-def parse_sds_basf_format(pdf_path: str) -> dict:
+def parse_sds_basf_format(pdf_path: str | SDSDocument) -> dict:
     """Parse BASF-style SDS (with EU 2020/878 format)."""
-    text = extract_text_chain(pdf_path)
+    if not isinstance(pdf_path, SDSDocument):
+        with SDSDocument(pdf_path) as doc:
+            return parse_sds_basf_format(doc)
+    doc = pdf_path
+    scanners = _SCANNERS["BASF"]
 
     data = {
         "handelsname": None,
@@ -262,84 +360,67 @@ def parse_sds_basf_format(pdf_path: str) -> dict:
     }
 
     # Extract revision date
-    date_match = re.search(
-        r"(?:Datum der letzten Ausgabe|Überarbeitet am)\s*:?\s*([\d]{1,2}[./-][\d]{1,2}[./-][\d]{4})",
-        text,
-        flags=re.I
-    )
+    date_match = scanners["document"].scan_pages(doc).first("sds_date")
     if date_match:
         data["sds_date"] = date_match.group(1).strip()
 
-    # Split sections
-    sections = split_sections(text)
-
     # Abschnitt 1 – Product and company identification
-    if "1" in sections:
-        section1 = sections["1"]
+    section1 = doc.section("1")
+    if section1 is not None:
+        found = scanners["1"].scan(section1)
 
-        handels_match = re.search(r"Handelsname\s*:?\s*(.+)", section1, flags=re.I)
+        handels_match = found.first("handelsname")
         if handels_match:
-            data["handelsname"] = re.sub(r"\s+", " ", handels_match.group(1).strip())
+            data["handelsname"] = _WHITESPACE_RE.sub(" ", handels_match.group(1).strip())
 
-        manuf_match = re.search(r"Firma:\s*([^\n\r]+)", section1, flags=re.I)
+        manuf_match = found.first("manufacturer")
         if manuf_match:
             data["manufacturer"] = manuf_match.group(1).strip()
 
     # Abschnitt 2 – Hazards
-    if "2" in sections:
-        section2 = sections["2"]
-
-        # H-statements
-        h_matches = re.findall(r"\bH\d{3}\b", section2)
-        data["h_statements"] = sorted(set(h_matches))
+    section2 = doc.section("2")
+    if section2 is not None:
+        found = scanners["2"].scan(section2)
+        data["h_statements"] = _h_statements(found, "BASF")
 
         # Try to find explicit pictograms first
-        ghs_matches = re.findall(r"\bGHS\d{2}\b", section2)
+        ghs_matches = found.all("pictograms")
         if ghs_matches:
-            data["pictograms"] = sorted(set(ghs_matches))
+            data["pictograms"] = sorted({m.group(0) for m in ghs_matches})
         else:
             # Derive pictograms from H-statements
-            pictos = []
-            for h in data["h_statements"]:
-                pictos.extend(H_TO_GHS.get(h, []))
-            data["pictograms"] = sorted(set(pictos))
+            data["pictograms"] = decode_ghs(ghs_mask(encode_h(data["h_statements"])))
 
     # Abschnitt 14 – Transport
-    if "14" in sections:
-        section14 = sections["14"]
-        un_match = re.search(r"\bUN\s*(\d{1,4})\b", section14, flags=re.I)
+    section14 = doc.section("14")
+    if section14 is not None:
+        un_match = scanners["14"].scan(section14).first("un_number")
         if un_match:
             data["un_number"] = f"UN{un_match.group(1)}"
 
     return data
 
-def parse_sds_lechler_format(pdf_path: str) -> dict:
+def parse_sds_lechler_format(pdf_path: str | SDSDocument) -> dict:
+    if not isinstance(pdf_path, SDSDocument):
+        with SDSDocument(pdf_path) as doc:
+            return parse_sds_lechler_format(doc)
+    doc = pdf_path
+    scanners = _SCANNERS["Lechler"]
+
     try:
-        text = extract_text_chain(pdf_path)
+        text = doc.text
+    except (src.memory.MemoryLimitExceeded, DocumentTimeout):
+        # Budgets hold for the fallback too; the PDF is skipped and quarantined
+        raise
     except Exception as e:
-        print(f"Error extracting text from {pdf_path}: {e}")
+        print(f"Error extracting text from {doc.pdf_path}: {e}")
         try:
-            import pdfplumber
-            text_parts = []
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text() or ""
-                    text_parts.append(page_text)
-            text = "\n".join(text_parts)
-            text = re.sub(r"-\n", "", text)
-            text = re.sub(r"\n+", "\n", text)
-            text = re.sub(r"[ \t]+", " ", text)
-            text = text.strip()
+            with SDSDocument(doc.pdf_path, extractor=PdfplumberTextExtractor.name) as plain_doc:
+                text = plain_doc.text
+            doc = plain_doc
         except Exception as e2:
             print(f"Fallback extraction also failed: {e2}")
-            return {
-                "handelsname": None,
-                "manufacturer": None,
-                "h_statements": [],
-                "un_number": None,
-                "pictograms": [],
-                "sds_date": None
-            }
+            raise
 
     data = {
         "handelsname": None,
@@ -350,125 +431,209 @@ def parse_sds_lechler_format(pdf_path: str) -> dict:
         "sds_date": None
     }
 
-    date_patterns = [
-        r"Sicherheitsdatenblatt vom\s*([\d]{1,2}[./\-][\d]{1,2}[./\-][\d]{4})",
-        r"Version\s+\d+.*?([\d]{1,2}[./\-][\d]{1,2}[./\-][\d]{4})",
-        r"Überarbeitet am\s*:?\s*([\d]{1,2}[./\-][\d]{1,2}[./\-][\d]{4})",
-        r"Druckdatum\s*:?\s*([\d]{1,2}[./\-][\d]{1,2}[./\-][\d]{4})",
-        r"\b([\d]{1,2}/[\d]{1,2}/[\d]{4})\b"
-    ]
-
-    for pattern in date_patterns:
-        date_match = re.search(pattern, text, flags=re.I)
-        if date_match:
-            raw_date = date_match.group(1).strip()
-            try:
-                if "/" in raw_date:
-                    parsed = datetime.strptime(raw_date, "%d/%m/%Y")
-                elif "." in raw_date:
-                    parsed = datetime.strptime(raw_date, "%d.%m.%Y")
-                elif "-" in raw_date:
-                    parsed = datetime.strptime(raw_date, "%d-%m-%Y")
-                else:
-                    parsed = None
-                if parsed:
-                    data["sds_date"] = parsed.strftime("%d.%m.%Y")
-                else:
-                    data["sds_date"] = raw_date
-            except Exception:
-                data["sds_date"] = raw_date
-            break
+    found = scanners["text"].scan(text)
 
-    handels_patterns = [
-        r"Handelsname:\s*([^\n\r]+)",
-        r"Produktidentifikator[^:]*:\s*[^:]*Handelsname:\s*([^\n\r]+)",
-        r"Kennzeichnung der Mischung:\s*Handelsname:\s*([^\n\r]+)",
-        r"^([A-Z][A-Z0-9\s\.\-_]{10,50})$"
-    ]
+    date_match = found.first("sds_date")
+    if date_match:
+        raw_date = date_match.group(1).strip()
+        try:
+            if "/" in raw_date:
+                parsed = datetime.strptime(raw_date, "%d/%m/%Y")
+            elif "." in raw_date:
+                parsed = datetime.strptime(raw_date, "%d.%m.%Y")
+            elif "-" in raw_date:
+                parsed = datetime.strptime(raw_date, "%d-%m-%Y")
+            else:
+                parsed = None
+            if parsed:
+                data["sds_date"] = parsed.strftime("%d.%m.%Y")
+            else:
+                data["sds_date"] = raw_date
+        except Exception:
+            data["sds_date"] = raw_date
 
-    for pattern in handels_patterns:
-        handels_match = re.search(pattern, text, flags=re.I | re.MULTILINE)
-        if handels_match:
-            candidate = handels_match.group(1).strip()
-            if not re.match(r"(ABSCHNITT|Section|Version|Seite|Page)", candidate, re.I):
-                data["handelsname"] = candidate
-                break
-
-    manufacturer_patterns = [
-        r"Lieferant:\s*([^\n\r]+(?:\s+[^\n\r]+)*?)(?=\s*(?:Telefon|First Email|AUSTRIA|BELGIUM|\d+\.\d+))",
-        r"Hersteller:\s*([^\n\r]+)",
-        r"Firma:\s*([^\n\r]+)",
-        r"(Lechler\s+SpA[^\n\r]*)",
-        r"Anschrift:\s*([^\n\r]+)"
-    ]
-
-    for pattern in manufacturer_patterns:
-        manuf_match = re.search(pattern, text, flags=re.I)
-        if manuf_match:
-            manufacturer_text = manuf_match.group(1).strip()
-            manufacturer_text = re.sub(r'\s+', ' ', manufacturer_text)
-            data["manufacturer"] = manufacturer_text
+    for handels_match in found.candidates("handelsname"):
+        candidate = handels_match.group(1).strip()
+        if not _NOT_A_NAME_RE.match(candidate):
+            data["handelsname"] = candidate
             break
 
-    sections = split_sections(text)
+    manuf_match = found.first("manufacturer")
+    if manuf_match:
+        data["manufacturer"] = _WHITESPACE_RE.sub(" ", manuf_match.group(1).strip())
 
     h_statements = set()
-    section2_text = sections["2"] if "2" in sections else text
-
-    h_patterns = [
-        r"\bH(\d{3})\b",
-        r"Gefahrenhinweise.*?H(\d{3})",
-        r"Flam\.\s*Liq\.\s*\d+.*?H(\d{3})",
-        r"STOT\s*SE\s*\d+.*?H(\d{3})",
-        r"Eye\s*Irrit\.\s*\d+.*?H(\d{3})",
-        r"Skin\s*Irrit\.\s*\d+.*?H(\d{3})"
-    ]
-
-    for pattern in h_patterns:
-        matches = re.findall(pattern, section2_text, flags=re.I | re.DOTALL)
-        for h in matches:
-            h_statements.add(f"H{h}")
+    section2_text = doc.section("2")
+    if section2_text is None:
+        section2_text = text
+
+    for h_match in scanners["2"].scan(section2_text).all("h_statements"):
+        h_statements.add(f"H{h_match.group(1)}")
 
-    einstufung_text = re.search(r"Einstufung.*?(?=ABSCHNITT|\Z)", text, flags=re.I | re.DOTALL)
-    if einstufung_text:
-        h_matches = re.findall(r"\bH(\d{3})\b", einstufung_text.group(0))
-        for h in h_matches:
+    einstufung_match = found.first("einstufung")
+    if einstufung_match:
+        for h in _H_CODE_RE.findall(einstufung_match.group(0)):
             h_statements.add(f"H{h}")
 
     data["h_statements"] = sorted(list(h_statements))
 
-    ghs_matches = re.findall(r"\bGHS(\d{2})\b", text)
+    ghs_matches = found.all("pictograms")
     if ghs_matches:
-        data["pictograms"] = sorted([f"GHS{g}" for g in set(ghs_matches)])
+        data["pictograms"] = sorted({f"GHS{m.group(1)}" for m in ghs_matches})
     else:
-        pictos = []
-        for h in data["h_statements"]:
-            pictos.extend(H_TO_GHS.get(h, []))
-        data["pictograms"] = sorted(set(pictos))
+        data["pictograms"] = decode_ghs(ghs_mask(encode_h(data["h_statements"])))
 
     def find_un_global(text):
-        m = re.search(r'\bUN[-\s]*[:\-]?\s*([0-9]{3,4})\b', text, flags=re.I)
-        if m:
-            return "UN" + m.group(1).zfill(4)
-        m = re.search(r'UN[-\s]?Nummer(?: oder ID-Nummer)?[^\d\n]{0,60}([0-9]{3,4})', text, flags=re.I)
-        if m:
-            return "UN" + m.group(1).zfill(4)
-        for m in re.finditer(r'(?m)^[ \t]*14\s*\.?\s*1\b', text):
-            start = m.start()
-            snippet = text[start:start+400]
-            mnum2 = re.search(r'[\r\n]+\s*([0-9]{3,4})', snippet)
+        for field in ("un_number", "un_nummer"):
+            m = found.first(field)
+            if m:
+                return "UN" + m.group(1).zfill(4)
+        # 14.1 from the document's subsection index, else every line that looks like it
+        subsection = doc.subsection("14.1")
+        if subsection is not None:
+            snippets = [subsection[:400]]
+        else:
+            snippets = [text[m.start():m.start() + 400] for m in found.all("un_subsection")]
+        for snippet in snippets:
+            mnum2 = _NEXT_LINE_NUMBER_RE.search(snippet)
             if mnum2:
                 return "UN" + mnum2.group(1).zfill(4)
-            mnum = re.search(r'\b([0-9]{3,4})\b', snippet)
+            mnum = _NUMBER_RE.search(snippet)
             if mnum and mnum.group(1) not in ("14","141","1415","2415"):
                 return "UN" + mnum.group(1).zfill(4)
-        m = re.search(r'ABSCHNITT\s*14\b', text, flags=re.I)
+        m = found.first("un_section")
         if m:
             snippet = text[m.start(): m.start()+2000]
-            mnum = re.search(r'\b([0-9]{3,4})\b', snippet)
+            mnum = _NUMBER_RE.search(snippet)
             if mnum:
                 return "UN" + mnum.group(1).zfill(4)
         return None
     data["un_number"] = find_un_global(text)
 
-    return data
\ No newline at end of file
+    return data
+
+
+def detect_vendor(doc: SDSDocument) -> str:
+    """
+    Parser mode for doc, picked by the first VENDOR_FINGERPRINTS entry found on its
+    first page. Every parser reads the first page anyway, so this extracts nothing extra.
+
+    :param doc: the document to classify
+    :return: one of PARSE_MODES except AUTO_MODE, "Default" if no fingerprint matches
+    """
+    first_page = doc.page(0) if doc.page_count else ""
+    with src.profiling.stage("detect", doc.pdf_path):
+        for mode, regex in VENDOR_FINGERPRINTS:
+            if regex.search(first_page):
+                return mode
+    return "Default"
+
+
+def parse_document(doc: SDSDocument, mode: str = "Default") -> dict:
+    """
+    Parse an SDSDocument with the parser selected by mode.
+
+    :param doc: the document to parse
+    :param mode: one of PARSE_MODES, AUTO_MODE uses detect_vendor()
+    :return: dict of SDS fields
+    """
+    if mode == AUTO_MODE:
+        mode = detect_vendor(doc)
+
+    # Pages extracted on demand while parsing are timed as "extract"
+    with src.profiling.stage(f"parse:{mode}", doc.pdf_path):
+        if mode == "3M":
+            return parse_sds_3m_format(doc)
+        elif mode == "BASF":
+            return parse_sds_basf_format(doc)
+        elif mode == "Lechler":
+            sds = parse_sds_lechler_format(doc)
+            sds["manufacturer"] = "Lechler Coatings GmbH"
+            return sds
+        elif mode == "Fallback":
+            return parse_sds_fallback(doc)
+        else:  # Default
+            return parse_sds(doc)
+
+
+def parse_pdf(pdf_path: str, mode: str = "Default", extractor: str = DEFAULT_EXTRACTOR) -> dict:
+    """
+    Parse a single SDS PDF with the parser selected by mode.
+
+    Module-level so it can be sent to worker processes. Results are served from and
+    stored in the extraction cache if one is configured. With AUTO_MODE the parser is
+    picked by detect_vendor(), and the result also holds the detected "parse_mode" and
+    the classification time, including extraction of the first page, in "detect_seconds".
+    While src.profiling is enabled, the result holds the timing events of this process
+    since the last call in "timings", so worker processes send them back with it.
+    "peak_rss" is the peak memory of the parsing process so far in bytes (None if unknown).
+    Raises src.memory.MemoryLimitExceeded if the PDF does not fit the configured ceiling.
+
+    :param pdf_path: path to the PDF
+    :param mode: one of PARSE_MODES
+    :param extractor: name of the text extraction backend, see src.extractors
+    :return: dict of SDS fields
+    """
+    # Self time of this stage: cache lookups and opening the PDF
+    with src.profiling.stage("parse_pdf", pdf_path):
+        sds = _parse_pdf(pdf_path, mode, extractor)
+    return _with_process_stats(sds)
+
+
+def fingerprint_pdf(pdf_path: str, mode: str = "Default", extractor: str = DEFAULT_EXTRACTOR) -> dict:
+    """
+    H-statements of a PDF as parse_pdf() would return them, for grouping the PDFs of a
+    folder before parsing them.
+
+    Parsers that take the H-statements from section 2 alone only extract the pages up
+    to the end of section 2 and return {"h_statements", "partial": True}, plus the
+    detection keys in AUTO_MODE. Where the full result is cached, or the parser needs
+    the whole document anyway (Lechler), the full result of parse_pdf() is returned.
+    Extracted pages go to the extraction cache like in parse_pdf(), so the full parse
+    of a PDF that turns out to be needed does not extract them again.
+    """
+    with src.profiling.stage("parse_pdf", pdf_path):
+        result = _parse_pdf(pdf_path, mode, extractor, fingerprint=True)
+    return _with_process_stats(result)
+
+
+def _with_process_stats(result: dict) -> dict:
+    result = {**result, "peak_rss": src.memory.peak_rss()}
+    if src.profiling.enabled():
+        result["timings"] = src.profiling.drain()
+    return result
+
+
+def _parse_pdf(pdf_path: str, mode: str, extractor: str, fingerprint: bool = False) -> dict:
+    cache = src.cache.get_active()
+    cache_options = get_extractor(extractor).cache_options()
+
+    def cached(parse_mode):
+        if cache is None:
+            return None
+        return cache.get_parsed(pdf_path, cache_options, f"{parse_mode}:v{PARSER_VERSION}")
+
+    detection = {}
+    if mode != AUTO_MODE:
+        sds = cached(mode)
+        if sds is not None:
+            return sds
+
+    with SDSDocument(pdf_path, extractor=extractor) as doc:
+        if mode == AUTO_MODE:
+            start = time.perf_counter()
+            mode = detect_vendor(doc)
+            detection = {"parse_mode": mode, "detect_seconds": time.perf_counter() - start}
+            # Auto shares the cached results of the explicitly selected modes
+            sds = cached(mode)
+            if sds is not None:
+                return {**sds, **detection}
+        if fingerprint and mode in _SECTION2_H_GROUPS:
+            with src.profiling.stage("fingerprint", pdf_path):
+                return {"h_statements": section2_h_statements(doc, mode), "partial": True, **detection}
+        sds = parse_document(doc, mode)
+
+    # An empty result is not cached, so a PDF without any text (e.g. scanned) is read again
+    if cache is not None and any(sds.values()):
+        cache.put_parsed(pdf_path, cache_options, f"{mode}:v{PARSER_VERSION}", sds)
+    return {**sds, **detection}
@@ -0,0 +1,201 @@
+import json
+import math
+import time
+
+# Active Profiler of this process, None while profiling is off
+_profiler = None
+
+
+class _NullStage:
+    """Shared no-op context manager returned by stage() while profiling is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "key", "start", "children")
+
+    def __init__(self, profiler: "Profiler", name: str, key):
+        self.profiler = profiler
+        self.name = name
+        self.key = key
+
+    def __enter__(self):
+        self.children = 0.0
+        self.profiler._stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        stack = self.profiler._stack
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        # Self time: nested stages are recorded on their own
+        self.profiler.events.append((self.name, elapsed - self.children, self.key))
+        return False
+
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+class Profiler:
+    """
+    Timing events of one run: (stage, seconds, key) with key the file or folder the
+    time was spent on, or None.
+
+    Stages nest; each event holds the stage's self time, without the time of the
+    stages opened inside it, so the stage totals add up to the profiled time.
+    """
+
+    def __init__(self):
+        self.events = []
+        self._stack = []
+        self._start = time.perf_counter()
+
+    def drain(self) -> list:
+        """Events recorded since the last drain(), removed from this profiler."""
+        events, self.events = self.events, []
+        return events
+
+    def add(self, events):
+        """Add events drained from another profiler, e.g. of a worker process."""
+        self.events.extend(tuple(e) for e in events)
+
+    def summary(self, slowest: int = 10) -> dict:
+        """
+        :param slowest: number of files in "slowest_files"
+        :return: {"wall_seconds", "stages": {stage: {"count", "total", "p50", "p95", "max"}},
+                  "slowest_files": [{"path", "seconds", "stages": {stage: seconds}}]}
+        """
+        by_stage = {}
+        by_key = {}
+        for name, seconds, key in self.events:
+            by_stage.setdefault(name, []).append(seconds)
+            if key is not None:
+                stages = by_key.setdefault(key, {})
+                stages[name] = stages.get(name, 0.0) + seconds
+
+        stages = {}
+        for name, values in sorted(by_stage.items(), key=lambda item: -sum(item[1])):
+            values.sort()
+            stages[name] = {
+                "count": len(values),
+                "total": round(sum(values), 6),
+                "p50": round(_percentile(values, 50), 6),
+                "p95": round(_percentile(values, 95), 6),
+                "max": round(values[-1], 6),
+            }
+
+        # Folders are keys of the scan and group stages, files of everything else
+        files = sorted(by_key.items(), key=lambda item: -sum(item[1].values()))
+        return {
+            "wall_seconds": round(time.perf_counter() - self._start, 6),
+            "stages": stages,
+            "slowest_files": [
+                {"path": str(key), "seconds": round(sum(s.values()), 6),
+                 "stages": {name: round(v, 6) for name, v in s.items()}}
+                for key, s in files[:slowest]
+            ],
+        }
+
+
+def enable() -> Profiler:
+    """Start recording in this process; returns the new active Profiler."""
+    global _profiler
+    _profiler = Profiler()
+    return _profiler
+
+
+def disable():
+    global _profiler
+    _profiler = None
+
+
+def configure(enabled: bool):
+    """Enable or disable profiling, e.g. as initializer of worker processes."""
+    if enabled:
+        enable()
+    else:
+        disable()
+
+
+def enabled() -> bool:
+    return _profiler is not None
+
+
+def get_active() -> Profiler | None:
+    return _profiler
+
+
+def stage(name: str, key=None):
+    """
+    Context manager timing one stage of the work on key (a file or folder path).
+
+    While profiling is off this returns a shared no-op object, so instrumented hot
+    paths pay one function call per use.
+    """
+    if _profiler is None:
+        return _NULL_STAGE
+    return _Stage(_profiler, name, key)
+
+
+def timed_iter(name: str, iterable, key=None):
+    """iterable, with the time spent in each next() recorded as stage name."""
+    if _profiler is None:
+        return iterable
+    return _timed_iter(name, iterable, key)
+
+
+def _timed_iter(name: str, iterable, key):
+    iterator = iter(iterable)
+    while True:
+        with stage(name, key):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def drain() -> list:
+    """Events recorded in this process since the last drain(), [] while profiling is off."""
+    return _profiler.drain() if _profiler is not None else []
+
+
+def add(events):
+    if _profiler is not None:
+        _profiler.add(events)
+
+
+def print_summary(summary: dict, slowest: int = 10):
+    """Print a summary() as [PROFILE] lines: a table of the stages and the slowest files."""
+    print(f"[PROFILE] Wall time {summary['wall_seconds']:.2f} s; stage times are summed over all processes")
+    print(f"[PROFILE] {'stage':<20} {'count':>7} {'total s':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for name, s in summary["stages"].items():
+        print(f"[PROFILE] {name:<20} {s['count']:>7} {s['total']:>9.3f} "
+              f"{s['p50'] * 1000:>9.2f} {s['p95'] * 1000:>9.2f} {s['max'] * 1000:>9.2f}")
+    if summary["slowest_files"]:
+        print("[PROFILE] Slowest files and folders:")
+        for entry in summary["slowest_files"][:slowest]:
+            parts = ", ".join(f"{name} {seconds:.3f} s" for name, seconds in
+                              sorted(entry["stages"].items(), key=lambda item: -item[1]))
+            print(f"[PROFILE] {entry['seconds']:>8.3f} s  {entry['path']} ({parts})")
+
+
+def write_summary(summary: dict, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,92 @@
+import json
+import os
+import tempfile
+import time
+
+QUARANTINE_VERSION = 1
+
+
+def default_quarantine_path(excel_path: str) -> str:
+    """Sidecar file next to the workbook, e.g. kataster.xlsx.quarantine.json."""
+    return excel_path + ".quarantine.json"
+
+
+class Quarantine:
+    """
+    PDFs that timed out, ran out of memory, crashed their worker or failed to parse,
+    with size and mtime at the time, so later runs skip them until they change.
+
+    Delete the file (or the PDF's entry) to retry a PDF without changing it.
+
+    :param path: quarantine file, loaded if it exists
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.files = {}
+        self._changed = False
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == QUARANTINE_VERSION:
+                    self.files = data["files"]
+                else:
+                    print(f"[WARN] Ignoring quarantine list {path} with unknown version {data.get('version')}")
+            except (OSError, ValueError, KeyError) as e:
+                print(f"[WARN] Could not read quarantine list {path}, retrying all PDFs: {e}")
+
+    def contains(self, pdf_path) -> bool:
+        """
+        True if pdf_path is quarantined and unchanged; a changed PDF is released.
+
+        :param pdf_path: path or os.DirEntry, whose cached stat result is reused
+        """
+        key = pdf_path.path if isinstance(pdf_path, os.DirEntry) else str(pdf_path)
+        record = self.files.get(key)
+        if record is None:
+            return False
+        try:
+            st = pdf_path.stat() if isinstance(pdf_path, os.DirEntry) else os.stat(pdf_path)
+        except OSError:
+            return False
+        if record["size"] == st.st_size and record["mtime_ns"] == st.st_mtime_ns:
+            return True
+        del self.files[key]
+        self._changed = True
+        return False
+
+    def add(self, pdf_path, reason: str, seconds: float | None, detail: str = "") -> bool:
+        """
+        Quarantine pdf_path.
+
+        :param reason: "timeout", "memory", "crash" or "error"
+        :param seconds: time the PDF was processed before it was given up
+        :param detail: message of the error
+        :return: False if the PDF is gone and was not quarantined
+        """
+        try:
+            st = os.stat(pdf_path)
+        except OSError:
+            return False
+        self.files[str(pdf_path)] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "reason": reason,
+            "seconds": round(seconds, 3) if seconds is not None else None,
+            "detail": detail,
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self._changed = True
+        return True
+
+    def save(self):
+        """Write the quarantine list atomically, if it changed."""
+        if not self._changed:
+            return
+        folder = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": QUARANTINE_VERSION, "files": self.files}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
+        self._changed = False
@@ -0,0 +1,98 @@
+import re
+
+
+class FieldPattern:
+    """
+    One regex for one SDS field.
+
+    Several patterns may share a field name; they are tried in declaration order, like a
+    list of fallback patterns.
+    """
+
+    __slots__ = ("field", "pattern", "flags", "regex")
+
+    def __init__(self, field: str, pattern: str, flags: int = 0):
+        self.field = field
+        self.pattern = pattern
+        self.flags = flags
+        self.regex = re.compile(pattern, flags)
+
+
+class ScanResult:
+    """
+    Matches of a Scanner's fields in one text or SDSDocument.
+
+    Patterns run on first access and each at most once, so a fallback pattern is only
+    evaluated when every pattern declared before it for the same field found nothing.
+    """
+
+    def __init__(self, scanner: "Scanner", source):
+        self._scanner = scanner
+        self._source = source
+        self._first = {}
+        self._all = {}
+
+    def _search(self, index: int):
+        if index not in self._first:
+            regex = self._scanner.patterns[index].regex
+            if isinstance(self._source, str):
+                self._first[index] = regex.search(self._source)
+            else:
+                # SDSDocument: page by page, extracting only up to the first page with a match
+                self._first[index] = self._source.search(regex)
+        return self._first[index]
+
+    def _findall(self, index: int) -> list:
+        if index not in self._all:
+            regex = self._scanner.patterns[index].regex
+            if isinstance(self._source, str):
+                self._all[index] = list(regex.finditer(self._source))
+            else:
+                doc = self._source
+                self._all[index] = [m for i in range(doc.page_count) for m in regex.finditer(doc.page(i))]
+        return self._all[index]
+
+    def candidates(self, field: str):
+        """Yields the first match of each pattern of field that matches, in declaration order."""
+        for index in self._scanner.field_indexes(field):
+            match = self._search(index)
+            if match is not None:
+                yield match
+
+    def first(self, field: str):
+        """Match of the first declared pattern of field that matches, or None."""
+        return next(self.candidates(field), None)
+
+    def all(self, field: str) -> list:
+        """All matches of the patterns of field, pattern by pattern in text order."""
+        return [m for index in self._scanner.field_indexes(field) for m in self._findall(index)]
+
+
+class Scanner:
+    """
+    Field patterns of one parser profile scope, compiled once at import.
+
+    CPython's re has no multi-pattern automaton: one alternation of all patterns tries
+    every branch at every position and loses the fast literal-prefix search each single
+    pattern gets, which measured several times slower than separate searches. So each
+    pattern keeps its own compiled regex and the scan is lazy, running only the
+    patterns a parser asks for.
+
+    :param patterns: list of FieldPattern
+    """
+
+    def __init__(self, patterns: list):
+        self.patterns = patterns
+        self._indexes = {}
+        for i, p in enumerate(patterns):
+            self._indexes.setdefault(p.field, []).append(i)
+
+    def field_indexes(self, field: str) -> list:
+        return self._indexes.get(field, [])
+
+    def scan(self, text: str) -> ScanResult:
+        return ScanResult(self, text)
+
+    def scan_pages(self, doc) -> ScanResult:
+        """Scan an SDSDocument page by page; pages after the first match are not extracted."""
+        return ScanResult(self, doc)
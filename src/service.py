@@ -0,0 +1,334 @@
+import email.parser
+import email.policy
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import src.cache
+import src.pdf
+from src.discovery import iter_pdf_folders
+from src.extractors import DEFAULT_EXTRACTOR, get_extractor
+from src.workers import create_executor, init_worker, parse_one
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Window of the recent throughput in /stats
+THROUGHPUT_WINDOW = 60.0
+
+
+def _warm_up(extractor: str):
+    """Import the extraction backend in a worker, so the first real request does not pay for it."""
+    backend = get_extractor(extractor)
+    if backend.package:
+        __import__(backend.package.split(".")[0])
+
+
+class _Stats:
+    """Counters of the service, updated from the request threads."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.started = time.time()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.parse_seconds = 0.0
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+    def submit(self, count: int = 1):
+        with self._lock:
+            self.submitted += count
+
+    def done(self, seconds: float | None):
+        now = time.monotonic()
+        with self._lock:
+            if seconds is None:
+                self.failed += 1
+            else:
+                self.completed += 1
+                self.parse_seconds += seconds
+            self._recent.append(now)
+            while self._recent and self._recent[0] < now - THROUGHPUT_WINDOW:
+                self._recent.popleft()
+
+    def as_dict(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and self._recent[0] < now - THROUGHPUT_WINDOW:
+                self._recent.popleft()
+            in_flight = self.submitted - self.completed - self.failed
+            uptime = time.time() - self.started
+            return {
+                "uptime_seconds": round(uptime, 1),
+                "workers": self.workers,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "in_progress": min(in_flight, self.workers),
+                "queue_depth": max(in_flight - self.workers, 0),
+                "docs_per_second": round(len(self._recent) / min(THROUGHPUT_WINDOW, uptime or 1), 3),
+                "mean_parse_seconds": round(self.parse_seconds / self.completed, 4) if self.completed else None,
+            }
+
+
+class _Document:
+    """One PDF of a request: a path sent by the client or an upload stored in a temporary file."""
+
+    def __init__(self, source: str, path: str, temporary: bool = False):
+        self.source = source
+        self.path = path
+        self.temporary = temporary
+
+    def remove(self):
+        if self.temporary:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+class BadRequest(Exception):
+    pass
+
+
+class SDSService:
+    """
+    Local HTTP service parsing SDS PDFs in a pool of warm worker processes.
+
+    The workers are started and have imported the parsers and the extraction backend
+    before the first request, so a request only pays for extraction and parsing.
+
+    Endpoints:
+        POST /parse   one PDF, answered with its fields as a JSON object
+        POST /batch   several PDFs, answered with one JSON line per PDF as soon as it
+                      is parsed (chunked), {"index", "source", "result"} or {"index", "source", "error"}
+        GET  /stats   throughput, queue depth and counters
+        GET  /health  {"status": "ok"}
+
+    PDFs are sent as the request body (Content-Type: application/pdf), as files of a
+    multipart/form-data upload, or as JSON {"path": ...} / {"paths": [...]} of files or
+    folders on this machine. "mode" in the query string selects the parser (default:
+    the service's mode), see src.pdf.PARSE_MODES.
+
+    :param mode: default parser mode
+    :param extractor: text extraction backend of all requests
+    :param workers: number of worker processes (default: CPU count)
+    :param cache_args: (cache_dir, use_cache, cache_max_mb) of the extraction cache
+    :param timeout: wall-clock budget of one PDF in seconds, see src.isolation
+    :param max_memory_mb: memory budget of a worker in MB, see src.isolation
+    """
+
+    def __init__(self, mode: str = "Default", extractor: str = DEFAULT_EXTRACTOR, workers: int | None = None,
+                 cache_args: tuple = (None, True, src.cache.DEFAULT_MAX_MB), timeout: float | None = None,
+                 max_memory_mb: int | None = None):
+        self.mode = mode
+        self.extractor = extractor
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = create_executor(self.workers, cache_args, timeout=timeout, max_memory_mb=max_memory_mb)
+        if self.executor is None:
+            # One worker is still a separate process, so parsing never blocks the server
+            self.executor = ProcessPoolExecutor(max_workers=1, initializer=init_worker, initargs=(cache_args, False))
+        self.stats = _Stats(self.workers)
+        self._upload_dir = tempfile.mkdtemp(prefix="sdsextractor-")
+
+    def warm_up(self):
+        """Start every worker and load the parsers in it."""
+        for future in [self.executor.submit(_warm_up, self.extractor) for _ in range(self.workers)]:
+            future.result()
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+        try:
+            os.rmdir(self._upload_dir)
+        except OSError:
+            pass
+
+    def submit(self, document: _Document, mode: str):
+        self.stats.submit()
+        return self.executor.submit(parse_one, document.path, mode, self.extractor)
+
+    def result(self, future) -> tuple:
+        """(fields, None) or (None, error message) of a submitted document."""
+        try:
+            sds = future.result()
+        except Exception as e:
+            self.stats.done(None)
+            return None, f"{type(e).__name__}: {e}"
+        self.stats.done(sds["seconds"])
+        return sds, None
+
+    def _store_upload(self, name: str, data: bytes) -> _Document:
+        fd, path = tempfile.mkstemp(dir=self._upload_dir, suffix=".pdf")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return _Document(name, path, temporary=True)
+
+    def read_documents(self, content_type: str, body: bytes) -> list:
+        """The _Documents of a request body."""
+        media_type = content_type.split(";")[0].strip().lower()
+        if media_type == "application/pdf":
+            return [self._store_upload("upload.pdf", body)]
+
+        if media_type == "multipart/form-data":
+            message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+                b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body
+            )
+            return [
+                self._store_upload(part.get_filename() or f"upload{i}.pdf", part.get_payload(decode=True))
+                for i, part in enumerate(message.iter_parts())
+                if part.get_filename() is not None
+            ]
+
+        if media_type == "application/json":
+            try:
+                data = json.loads(body)
+            except ValueError as e:
+                raise BadRequest(f"Invalid JSON: {e}")
+            if not isinstance(data, dict):
+                raise BadRequest('Expected a JSON object {"path": ...} or {"paths": [...]}')
+            paths = data.get("paths") or ([data["path"]] if data.get("path") else [])
+            if not isinstance(paths, list) or not all(isinstance(path, str) for path in paths):
+                raise BadRequest('"path" must be a string and "paths" a list of strings')
+            documents = []
+            for path in paths:
+                if os.path.isdir(path):
+                    for _, entries in iter_pdf_folders(os.path.abspath(path)):
+                        documents.extend(_Document(e.path, e.path) for e in entries)
+                elif os.path.isfile(path):
+                    documents.append(_Document(path, path))
+                else:
+                    raise BadRequest(f"Not a file or folder: {path}")
+            return documents
+
+        raise BadRequest(f"Unsupported Content-Type '{media_type}', "
+                         f"expected application/pdf, multipart/form-data or application/json")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "SDSExtractor"
+
+    @property
+    def service(self) -> SDSService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, data: dict):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/stats":
+            self._send_json(200, self.service.stats.as_dict())
+        elif path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path not in ("/parse", "/batch"):
+            self._send_json(404, {"error": f"Unknown endpoint {url.path}"})
+            return
+        mode = parse_qs(url.query).get("mode", [self.service.mode])[0]
+        if mode not in src.pdf.PARSE_MODES:
+            self._send_json(400, {"error": f"Unknown mode '{mode}', expected one of: {', '.join(src.pdf.PARSE_MODES)}"})
+            return
+
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._streaming = False
+        try:
+            documents = self.service.read_documents(self.headers.get("Content-Type", ""), body)
+        except BadRequest as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        try:
+            if url.path == "/parse":
+                self._parse_one(documents, mode)
+            else:
+                self._parse_batch(documents, mode)
+        except Exception as e:
+            # Answered only if nothing was sent yet, a started /batch stream is cut off
+            if not self._streaming:
+                self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            else:
+                self.close_connection = True
+        finally:
+            for document in documents:
+                document.remove()
+
+    def _parse_one(self, documents: list, mode: str):
+        if len(documents) != 1:
+            self._send_json(400, {"error": f"/parse takes one PDF, got {len(documents)}; use /batch"})
+            return
+        sds, error = self.service.result(self.service.submit(documents[0], mode))
+        if error is not None:
+            self._send_json(422, {"source": documents[0].source, "error": error})
+        else:
+            self._send_json(200, {"source": documents[0].source, "result": sds})
+
+    def _parse_batch(self, documents: list, mode: str):
+        futures = {self.service.submit(document, mode): i for i, document in enumerate(documents)}
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._streaming = True
+        for future in as_completed(futures):
+            index = futures[future]
+            sds, error = self.service.result(future)
+            line = {"index": index, "source": documents[index].source}
+            if error is not None:
+                line["error"] = error
+            else:
+                line["result"] = sds
+            self._send_chunk(json.dumps(line, ensure_ascii=False).encode("utf-8") + b"\n")
+        self._send_chunk(b"")
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, **kwargs):
+    """
+    Run an SDSService until interrupted (Ctrl+C).
+
+    :param host: address to listen on; the default only accepts local connections,
+                 and clients can read any PDF path this user can
+    :param kwargs: see SDSService
+    """
+    service = SDSService(**kwargs)
+    try:
+        service.warm_up()
+        server = ThreadingHTTPServer((host, port), _Handler)
+        server.daemon_threads = True
+        server.service = service
+        print(f"[INFO] Serving on http://{host}:{server.server_address[1]} with {service.workers} warm workers "
+              f"({service.mode}, {service.extractor}), press Ctrl+C to stop")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("[INFO] Stopped")
+        finally:
+            server.server_close()
+    finally:
+        service.close()
@@ -0,0 +1,218 @@
+import csv
+import json
+import os
+
+import src.profiling
+from src.excel import HEADER, duplicate_key
+
+# Keys of the JSON Lines objects and Parquet columns, in HEADER order
+COLUMN_KEYS = [
+    "handelsname",
+    "hersteller",
+    "un_nr",
+    "h_saetze",
+    "piktogramme",
+    "lagerort",
+    "menge_im_lager",
+    "besonderheiten",
+    "sds",
+    "stand",
+]
+
+
+class RowSink:
+    """
+    Base class for streaming outputs of the rows produced by convert_data_to_list().
+
+    Sinks only ever append and never read back what they wrote, so memory does not
+    grow with the number of rows; only the keys of written rows are kept if
+    duplicates are skipped. They are used like ExcelWriter:
+
+        with open_sink("kataster.csv") as sink:
+            sink.write_row(row_data)
+
+    :param path: output file, overwritten if it exists
+    :param duplicates: "append" writes every row, any other policy skips rows whose
+                       duplicate_key() was written before (rows cannot be updated)
+    :param flush_every: if given, flush the file after every N rows
+    """
+
+    def __init__(self, path: str, duplicates: str = "skip", flush_every: int | None = None):
+        self.path = path
+        self.flush_every = flush_every
+        self.rows_written = 0
+        self.duplicates_skipped = []
+        self.duplicates_updated = []
+        self._rows_by_key = {} if duplicates != "append" else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def write_row(self, row_data: list) -> int:
+        """
+        Write a single row.
+
+        :param row_data: list of values as returned by convert_data_to_list
+        :return: the row number in the output, or of the earlier duplicate
+        """
+        if self._rows_by_key is not None:
+            key = duplicate_key(row_data)
+            if key in self._rows_by_key:
+                self.duplicates_skipped.append((row_data[0], self._rows_by_key[key]))
+                return self._rows_by_key[key]
+        with src.profiling.stage("sink.write"):
+            row = self._write(list(row_data))
+        if self._rows_by_key is not None:
+            self._rows_by_key[key] = row
+        self.rows_written += 1
+        if self.flush_every and self.rows_written % self.flush_every == 0:
+            self.flush()
+        return row
+
+    def _write(self, row_data: list) -> int:
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class XlsxStreamSink(RowSink):
+    """New Kataster written with an openpyxl write-only workbook, saved on close()."""
+
+    def __init__(self, path: str, sheet_name="Gefahrstoffkataster", **kwargs):
+        from openpyxl import Workbook
+
+        super().__init__(path, **kwargs)
+        self._wb = Workbook(write_only=True)
+        self._ws = self._wb.create_sheet(sheet_name)
+        self._ws.append(HEADER)
+
+    def _write(self, row_data: list) -> int:
+        self._ws.append(row_data)
+        return self.rows_written + 2  # below the header
+
+    def close(self):
+        # A write-only workbook can be saved only once
+        if self._wb is not None:
+            self._wb.save(self.path)
+            self._wb = None
+
+
+class CsvSink(RowSink):
+    """CSV with the HEADER titles, UTF-8 with BOM so Excel detects the encoding."""
+
+    def __init__(self, path: str, delimiter: str = ";", **kwargs):
+        super().__init__(path, **kwargs)
+        self._file = open(path, "w", newline="", encoding="utf-8-sig")
+        self._writer = csv.writer(self._file, delimiter=delimiter)
+        self._writer.writerow(HEADER)
+
+    def _write(self, row_data: list) -> int:
+        self._writer.writerow(["" if v is None else v for v in row_data])
+        return self.rows_written + 2
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class JsonLinesSink(RowSink):
+    """One JSON object per row with COLUMN_KEYS as keys."""
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(path, **kwargs)
+        self._file = open(path, "w", encoding="utf-8")
+
+    def _write(self, row_data: list) -> int:
+        self._file.write(json.dumps(dict(zip(COLUMN_KEYS, row_data)), ensure_ascii=False) + "\n")
+        return self.rows_written + 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSink(RowSink):
+    """
+    Parquet file with one string column per COLUMN_KEYS entry, written in row groups
+    of batch_size rows. Needs the optional pyarrow package.
+    """
+
+    def __init__(self, path: str, batch_size: int = 1024, **kwargs):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet output needs the pyarrow package (pip install pyarrow)")
+        super().__init__(path, **kwargs)
+        self._pa = pyarrow
+        self._schema = pyarrow.schema([(key, pyarrow.string()) for key in COLUMN_KEYS])
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+        self._batch_size = batch_size
+        self._batch = []
+
+    def _write(self, row_data: list) -> int:
+        self._batch.append(row_data)
+        if len(self._batch) >= self._batch_size:
+            self.flush()
+        return self.rows_written + 1
+
+    def flush(self):
+        if self._batch:
+            columns = {
+                key: [None if row[i] is None else str(row[i]) for row in self._batch]
+                for i, key in enumerate(COLUMN_KEYS)
+            }
+            self._writer.write_table(self._pa.Table.from_pydict(columns, schema=self._schema))
+            self._batch = []
+
+    def close(self):
+        if self._writer is not None:
+            self.flush()
+            self._writer.close()
+            self._writer = None
+
+
+SINK_FORMATS = {
+    "xlsx": XlsxStreamSink,
+    "csv": CsvSink,
+    "jsonl": JsonLinesSink,
+    "parquet": ParquetSink,
+}
+
+
+def format_for_path(path: str) -> str:
+    """Output format from the file extension (.csv, .jsonl/.ndjson, .parquet), xlsx otherwise."""
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if suffix in (".csv", ".parquet"):
+        return suffix[1:]
+    return "xlsx"
+
+
+def open_sink(path: str, output_format: str | None = None, **kwargs) -> RowSink:
+    """
+    Streaming sink for path.
+
+    :param path: output file
+    :param output_format: one of SINK_FORMATS, defaults to format_for_path(path)
+    :param kwargs: passed to the sink, see RowSink
+    """
+    output_format = output_format or format_for_path(path)
+    try:
+        sink_cls = SINK_FORMATS[output_format]
+    except KeyError:
+        raise ValueError(f"Unknown output format '{output_format}', expected one of: {', '.join(SINK_FORMATS)}")
+    return sink_cls(path, **kwargs)
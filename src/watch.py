@@ -0,0 +1,127 @@
+import os
+import time
+from pathlib import Path
+
+from src.cli import run_cli
+from src.discovery import iter_pdf_folders
+
+DEFAULT_INTERVAL = 5.0
+
+# Folders whose PDFs still look incomplete are processed anyway after this many seconds
+MAX_DEFER_SECONDS = 300
+
+# A complete PDF ends with "%%EOF", possibly followed by a few bytes of whitespace
+_EOF_MARKER = b"%%EOF"
+_EOF_SEARCH_BYTES = 1024
+
+
+def _snapshot(root: str, include: list | None, exclude: list | None) -> dict:
+    """{folder: {pdf path: (size, mtime_ns)}} of every folder with PDFs below root."""
+    snapshot = {}
+    for folder, entries in iter_pdf_folders(root, include, exclude):
+        files = {}
+        for entry in entries:
+            try:
+                st = entry.stat()
+            except OSError:
+                continue  # removed while listing
+            files[entry.path] = (st.st_size, st.st_mtime_ns)
+        snapshot[folder] = files
+    return snapshot
+
+
+def _looks_complete(pdf_path: str) -> bool:
+    """
+    False while a PDF is still being copied: it cannot be opened, or its end is not
+    written yet. Windows copies set the final size first, so size and mtime alone
+    can look settled too early.
+    """
+    try:
+        with open(pdf_path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - _EOF_SEARCH_BYTES))
+            return _EOF_MARKER in f.read()
+    except OSError:
+        return False
+
+
+def watch(path: str, excel_path: str, use_fallback: bool, use_3mf: bool, use_basf: bool, use_lechler: bool,
+          interval: float = DEFAULT_INTERVAL, settle: float | None = None, workers: int | None = None,
+          include: list | None = None, exclude: list | None = None, **kwargs):
+    """
+    Keep the Kataster up to date with the PDFs below path until interrupted (Ctrl+C).
+
+    Starts with an incremental run_cli() over the whole tree, then polls the tree every
+    interval seconds. A folder whose PDFs were added, changed or removed is processed
+    once it has not changed for settle seconds and all its PDFs look completely
+    written; all folders ready at the same time are processed by one incremental
+    run_cli() call, so the workbook is loaded and saved once per batch. Polling lists
+    the tree with os.scandir(), which works on network shares where change
+    notifications do not, and sleeps in between, so an idle watch uses almost no CPU.
+
+    :param path: root folder with PDFs
+    :param excel_path: Kataster (.xlsx) kept up to date
+    :param interval: seconds between polls
+    :param settle: seconds a folder has to stay unchanged (default: interval)
+    :param workers: parser processes, at most one per PDF of a batch
+    :param include: see src.discovery.iter_pdf_folders
+    :param exclude: see src.discovery.iter_pdf_folders
+    :param kwargs: further arguments of run_cli(); incremental is always on
+    """
+    root = str(Path(path).resolve())
+    settle = interval if settle is None else settle
+    workers = workers or os.cpu_count() or 1
+    kwargs.update(include=include, exclude=exclude, incremental=True)
+
+    def process(folders, file_count):
+        run_cli(root, excel_path, use_fallback, use_3mf, use_basf, use_lechler,
+                workers=max(1, min(workers, file_count)), folders=folders, **kwargs)
+
+    # Taken before the initial run, so PDFs changing during it are processed again
+    previous = _snapshot(root, include, exclude)
+    print(f"[WATCH] Initial run over {root}")
+    process(None, sum(len(files) for files in previous.values()))
+    print(f"[WATCH] Watching {root} every {interval:g} s, press Ctrl+C to stop")
+
+    # folder: (monotonic time of the first change, of the last change)
+    changed = {}
+    try:
+        while True:
+            time.sleep(interval)
+            current = _snapshot(root, include, exclude)
+            now = time.monotonic()
+            for folder in current.keys() | previous.keys():
+                if current.get(folder) != previous.get(folder):
+                    first = changed.get(folder, (now, now))[0]
+                    changed[folder] = (first, now)
+            previous = current
+
+            ready = []
+            for folder, (first, last) in changed.items():
+                if now - last < settle:
+                    continue
+                files = current.get(folder, {})
+                if now - first < MAX_DEFER_SECONDS and not all(_looks_complete(p) for p in files):
+                    continue
+                ready.append(folder)
+            if not ready:
+                continue
+
+            for folder in ready:
+                del changed[folder]
+            ready.sort()
+            file_count = sum(len(current.get(folder, ())) for folder in ready)
+            print(f"[WATCH] Processing {len(ready)} changed folders ({file_count} PDFs)")
+            start = time.perf_counter()
+            try:
+                process(ready, file_count)
+            except Exception as e:
+                # e.g. the Kataster is open in Excel; nothing was recorded, so retry later
+                print(f"[WARN] Batch failed, retrying in {settle:g} s: {e}")
+                for folder in ready:
+                    changed.setdefault(folder, (now, now))
+                continue
+            print(f"[WATCH] Batch done in {time.perf_counter() - start:.1f} s")
+    except KeyboardInterrupt:
+        print("[WATCH] Stopped")
@@ -0,0 +1,44 @@
+import time
+
+import src.cache
+import src.memory
+import src.pdf
+import src.profiling
+from src.isolation import IsolatedPool
+
+
+def init_worker(cache_args: tuple, profile: bool, max_memory_mb: int | None = None):
+    """Configure the extraction cache, profiling and memory ceiling of a new parser process."""
+    src.cache.configure(*cache_args)
+    src.profiling.configure(profile)
+    src.memory.configure(max_memory_mb)
+
+
+def create_executor(workers: int, cache_args: tuple, profile: bool = False, timeout: float | None = None,
+                    max_memory_mb: int | None = None):
+    """
+    Pool of parser processes: an IsolatedPool if a budget is given, a ProcessPoolExecutor
+    for several workers, None to parse in this process.
+
+    :param cache_args: (cache_dir, use_cache, cache_max_mb) of the extraction cache
+    :param timeout: wall-clock budget of one PDF in seconds, see src.isolation
+    :param max_memory_mb: memory budget of a worker in MB, see src.isolation
+    """
+    if timeout is not None or max_memory_mb is not None:
+        return IsolatedPool(workers, timeout, max_memory_mb, initializer=init_worker,
+                            initargs=(cache_args, profile, max_memory_mb))
+    if workers > 1:
+        # Imported here, concurrent.futures.process alone takes longer to import than the rest of the CLI
+        from concurrent.futures import ProcessPoolExecutor
+
+        return ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(cache_args, profile))
+    return None
+
+
+def parse_one(pdf_path: str, mode: str, extractor: str) -> dict:
+    """parse_pdf() with the time it took in "seconds"; module-level for worker processes."""
+    start = time.perf_counter()
+    sds = src.pdf.parse_pdf(pdf_path, mode, extractor)
+    sds.pop("peak_rss", None)
+    sds["seconds"] = time.perf_counter() - start
+    return sds